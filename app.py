@@ -1,12 +1,21 @@
+import calendar
 import sys
+from bisect import bisect_left
+from concurrent.futures import Future
+from datetime import date
+from queue import Empty, Queue
 from sqlite3 import IntegrityError
 from time import sleep
-from tkinter import Toplevel, ttk
+from tkinter import StringVar, Toplevel, filedialog, ttk
 from tkinter.messagebox import showerror, showinfo
 
 from ttkthemes import ThemedTk
 
 from ativo_factory import AtivoFactory
+from data.assincrono import RepositorioAssincrono
+from data.datas import converter_data
+from data.eventos import LoteGravado
+from data.importador import ImportadorCSV, ResultadoImportacao
 
 
 class PyInvest:
@@ -16,7 +25,7 @@ class PyInvest:
         self.master = ThemedTk(theme='black')
         self.master.title('PyInvest')
         self.master.configure(background='#000000')
-        GeneralFunctions.set_size_window(self.master, 1016, 490)
+        GeneralFunctions.set_size_window(self.master, 1016, 580)
 
         # VARIABLES
         sticky: str = ('n', 'e', 's', 'w')
@@ -88,9 +97,25 @@ class ButtonMenu(ttk.Frame):
                                  )
         button_sell.grid(row=2, column=0, padx=10, pady=10, sticky=sticky)
 
+        button_import = ttk.Button(self,
+                                   text='IMPORTAR',
+                                   takefocus=0,
+                                   command=lambda: TopLevelImport(master),
+                                   )
+        button_import.grid(row=3, column=0, padx=10, pady=10, sticky=sticky)
+
+        button_calendar = ttk.Button(self,
+                                     text='VENCIMENTOS',
+                                     takefocus=0,
+                                     command=lambda: TopLevelCalendar(master),
+                                     )
+        button_calendar.grid(row=4, column=0, padx=10, pady=10, sticky=sticky)
+
         self.rowconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
         self.rowconfigure(2, weight=1)
+        self.rowconfigure(3, weight=1)
+        self.rowconfigure(4, weight=1)
 
 
 class FrameReport(ttk.Frame):
@@ -98,8 +123,12 @@ class FrameReport(ttk.Frame):
         ttk.Frame.__init__(self, master)
 
         # VARIABLES
-        self.rep_rf = AtivoFactory().conectar_bd_rf()
-        self.rep_rv = AtivoFactory().conectar_bd_rv()
+        factory = AtivoFactory()
+        self.rep_rf = factory.conectar_bd_rf()
+        self.rep_rv = factory.conectar_bd_rv()
+        self.totals: dict = {}
+        self.events: Queue = Queue()
+        self.load_totals()
 
         # STYLES
         s = ttk.Style()
@@ -120,54 +149,49 @@ class FrameReport(ttk.Frame):
         sticky: tuple = ('n', 'e', 's', 'w',)
 
         # LABELS FOR REPORTS
-        text_action: str = 'Total investido em Ações: '\
-            f'R$ {self.report_actions()}'
-        label_actions = ttk.Label(
+        self.label_actions = ttk.Label(
                             self,
-                            text=text_action,
                             style='L.TLabel',
                             )
-        label_actions.grid(row=0, column=0, padx=5, pady=5, sticky=sticky)
+        self.label_actions.grid(row=0, column=0, padx=5, pady=5, sticky=sticky)
 
-        text_fii: str = f'Total investido em FIIs: R$ {self.report_fiis()}'
-        label_fii = ttk.Label(self,
-                              text=text_fii,
-                              style='L.TLabel',
-                              )
-        label_fii.grid(row=1, column=0, padx=5, pady=5, sticky=sticky)
-
-        text_dt: str = f'Total investido no Tesouro Direto: R$ {self.report_direct_treasure()}'
-        label_direct_treasure = ttk.Label(self,
-                                          text=text_dt,
-                                          style='L.TLabel',
-                                          )
-        label_direct_treasure.grid(row=2,
-                                   column=0,
-                                   padx=5,
-                                   pady=5,
-                                   sticky=sticky,
+        self.label_fii = ttk.Label(self,
+                                   style='L.TLabel',
                                    )
+        self.label_fii.grid(row=1, column=0, padx=5, pady=5, sticky=sticky)
+
+        self.label_direct_treasure = ttk.Label(self,
+                                               style='L.TLabel',
+                                               )
+        self.label_direct_treasure.grid(row=2,
+                                        column=0,
+                                        padx=5,
+                                        pady=5,
+                                        sticky=sticky,
+                                        )
 
-        text_fi: str = f'Total investido em Renda Fixa: R$ {self.report_fixed_income()}'
-        label_fixed_income = ttk.Label(self,
-                                       text=text_fi,
-                                       style='L.TLabel',
-                                       )
-        label_fixed_income.grid(row=3, column=0, padx=5, pady=5, sticky=sticky)
-
-        text_re: str = f'Total na Reserva de Emergência: R${self.report_emergency_reserv()}'
-        label_emergency_reserve = ttk.Label(self,
-                                            text=text_re,
+        self.label_fixed_income = ttk.Label(self,
                                             style='L.TLabel',
                                             )
-        label_emergency_reserve.grid(row=4, column=0, padx=5, pady=5, sticky=sticky)
+        self.label_fixed_income.grid(row=3, column=0, padx=5, pady=5, sticky=sticky)
 
-        text_ti: str = f'Total investido: R$ {self.report_total_invested()}'
-        label_total_invest = ttk.Label(self,
-                                       text=text_ti,
-                                       style='T.TLabel',
-                                       )
-        label_total_invest.grid(row=5, column=0, sticky=sticky)
+        self.label_emergency_reserve = ttk.Label(self,
+                                                 style='L.TLabel',
+                                                 )
+        self.label_emergency_reserve.grid(row=4, column=0, padx=5, pady=5, sticky=sticky)
+
+        self.label_total_invest = ttk.Label(self,
+                                            style='T.TLabel',
+                                            )
+        self.label_total_invest.grid(row=5, column=0, sticky=sticky)
+        self.update_labels()
+
+        # LIVE UPDATES
+        # the repositories publish from the database thread; the events
+        # are queued and applied here, on the Tk thread
+        self.unsubscribe = self.rep_rv.eventos.assinar(self.events.put)
+        self.bind('<Destroy>', self.on_destroy)
+        self.after(200, self.apply_events)
 
         # ADAPTATIVE
         self.columnconfigure(0, weight=3)
@@ -178,36 +202,69 @@ class FrameReport(ttk.Frame):
         self.rowconfigure(4, weight=1)
         self.rowconfigure(5, weight=1)
     
+    def load_totals(self) -> None:
+        totals: dict = self.rep_rv.resumo_carteira() | self.rep_rf.resumo_carteira()
+        self.totals = {category: tot for category, tot in totals.items() if category != 'Total'}
+
+    def apply_events(self) -> None:
+        """
+        Applies the deltas of the queued events to the totals. Bulk
+        writes carry no delta, so they reload the totals instead.
+        """
+        changed: bool = False
+        reload: bool = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except Empty:
+                break
+            changed = True
+            if isinstance(event, LoteGravado):
+                reload = True
+            else:
+                self.totals[event.categoria] = self.totals.get(event.categoria, 0) + event.delta
+        if reload:
+            self.load_totals()
+        if changed:
+            self.update_labels()
+        self.after(200, self.apply_events)
+
+    def update_labels(self) -> None:
+        self.label_actions.configure(text=f'Total investido em Ações: R$ {self.report_actions()}')
+        self.label_fii.configure(text=f'Total investido em FIIs: R$ {self.report_fiis()}')
+        self.label_direct_treasure.configure(
+            text=f'Total investido no Tesouro Direto: R$ {self.report_direct_treasure()}')
+        self.label_fixed_income.configure(text=f'Total investido em Renda Fixa: R$ {self.report_fixed_income()}')
+        self.label_emergency_reserve.configure(
+            text=f'Total na Reserva de Emergência: R${self.report_emergency_reserv()}')
+        self.label_total_invest.configure(text=f'Total investido: R$ {self.report_total_invested()}')
+
+    def on_destroy(self, event) -> None:
+        if event.widget is self:
+            self.unsubscribe()
+
     def report_actions(self) -> str:
-        tot: str = self.rep_rv.relatorio_acoes()
+        tot: float = self.totals.get('Ações', 0.0)
         return f'{tot:.2f}'
 
     def report_fiis(self) -> str:
-        tot: str = self.rep_rv.relatorio_fiis()
+        tot: float = self.totals.get('FIIs', 0.0)
         return f'{tot:.2f}'
 
     def report_emergency_reserv(self) -> str:
-        tot: str = self.rep_rf.relatorio_res_emerg()
+        tot: float = self.totals.get('Reserva de Emergência', 0.0)
         return f'{tot:.2f}'
     
     def report_direct_treasure(self) -> str:
-        tot: str = self.rep_rf.relatorio_tesouro_direto()
+        tot: float = self.totals.get('Tesouro Direto', 0.0)
         return f'{tot:.2f}'
 
     def report_fixed_income(self) -> str:
-        tot: str = self.rep_rf.relatorio_renda_fixa()
+        tot: float = self.totals.get('Renda Fixa', 0.0)
         return f'{tot:.2f}'
-    
-    def report_total_invested(self) -> str:
-        actions: str = self.rep_rv.relatorio_acoes()
-        fiis: str = self.rep_rv.relatorio_fiis()
-        fixed_income: str = self.rep_rf.relatorio_renda_fixa()
-        direct_treasure: str = self.rep_rf.relatorio_tesouro_direto()
-        emergency_reserve: str = self.rep_rf.relatorio_res_emerg()
-        list_of_invest: list = [actions, fiis, fixed_income, direct_treasure, emergency_reserve]
-
-        tot: float = sum([value for value in list_of_invest])
 
+    def report_total_invested(self) -> str:
+        tot: float = sum(self.totals.values())
         return f'{tot:.2f}'
 
 
@@ -253,6 +310,242 @@ class TopLevelRegister:
                            500,
                            )
 
+class TopLevelImport(Toplevel):
+    def __init__(self, master):
+        Toplevel.__init__(self, master)
+        self.title('Importar extrato CSV')
+        self.configure(background='#000000')
+        self.resizable(0, 0)
+        GeneralFunctions.set_size_window(self, 500, 200)
+
+        # VARIABLES
+        self.importer = RepositorioAssincrono(ImportadorCSV())
+        self.events: Queue = Queue()
+
+        # STYLES
+        s = ttk.Style()
+        s.configure('IMP.TLabel',
+                    background='#000000',
+                    foreground='white',
+                    font='arial 14',
+                    padding=10,
+                    )
+
+        self.label_status = ttk.Label(self,
+                                      text='Selecione o arquivo CSV',
+                                      style='IMP.TLabel',
+                                      )
+        self.label_status.pack(side='top')
+
+        self.progress = ttk.Progressbar(self,
+                                        orient='horizontal',
+                                        length=400,
+                                        mode='determinate',
+                                        maximum=100,
+                                        )
+        self.progress.pack(side='top', pady=10)
+
+        self.button_file = ttk.Button(self,
+                                      text='ESCOLHER',
+                                      takefocus=0,
+                                      command=self.import_file,
+                                      )
+        self.button_file.pack(side='top')
+
+    # FUNCTIONS
+    def import_file(self) -> None:
+        path: str = filedialog.askopenfilename(parent=self,
+                                               title='Extrato CSV',
+                                               filetypes=[('CSV', '*.csv'), ('Todos', '*.*')],
+                                               )
+        if not path:
+            return
+
+        self.button_file['state'] = 'disabled'
+        self.progress['value'] = 0
+        self.label_status['text'] = 'Importando...'
+        future: Future = self.importer.importar(path, self.queue_progress)
+        GeneralFunctions.wait_future(self, future, self.import_done, self.import_failed)
+        self.after(100, self.show_progress)
+
+    def import_done(self, result: ResultadoImportacao) -> None:
+        self.show_progress(poll=False)
+        self.progress['value'] = 100
+        self.label_status['text'] = f'{result.cadastradas} ativo(s) cadastrado(s)'
+        showinfo(title='OK',
+                 message=f'Linhas lidas: {result.lidas}\n'
+                         f'Ativos cadastrados: {result.cadastradas}\n'
+                         f'Já cadastrados: {len(result.conflitos)}\n'
+                         f'Linhas inválidas: {len(result.invalidas)}')
+        self.button_file['state'] = 'enable'
+
+    def import_failed(self, error: BaseException) -> None:
+        self.show_progress(poll=False)
+        if isinstance(error, (OSError, UnicodeDecodeError)):
+            showerror(title='Error', message=f'Não foi possível ler o arquivo.\n{error}')
+        else:
+            showerror(title='Error', message=f'Error: {error}')
+        self.label_status['text'] = 'Selecione o arquivo CSV'
+        self.button_file['state'] = 'enable'
+
+    def queue_progress(self, lines: int, fraction: float) -> None:
+        """
+        Called by the importer on the database thread after each batch,
+        so it only queues the numbers; show_progress draws them.
+        """
+        self.events.put((lines, fraction))
+
+    def show_progress(self, poll: bool = True) -> None:
+        """
+        Draws the latest queued progress. While the import runs it keeps
+        polling the queue with after(); the Tk thread never blocks.
+        """
+        if not self.winfo_exists():
+            return
+        latest: tuple | None = None
+        while True:
+            try:
+                latest = self.events.get_nowait()
+            except Empty:
+                break
+        if latest is not None:
+            lines, fraction = latest
+            self.progress['value'] = fraction * 100
+            self.label_status['text'] = f'{lines} linha(s) processada(s)'
+        if poll and str(self.button_file['state']) == 'disabled':
+            self.after(100, self.show_progress)
+
+
+class TopLevelCalendar(Toplevel):
+    """
+    Month calendar of fixed income maturities. Days with maturities are
+    highlighted and the list shows the assets of the month (or of the
+    selected day). Each month is a single indexed range query.
+    """
+    def __init__(self, master):
+        Toplevel.__init__(self, master)
+        self.title('Vencimentos')
+        self.configure(background='#000000')
+        self.resizable(0, 0)
+        GeneralFunctions.set_size_window(self, 900, 600)
+
+        # VARIABLES
+        self.rep_rf = RepositorioAssincrono(AtivoFactory().conectar_bd_rf())
+        today: date = date.today()
+        self.year: int = today.year
+        self.month: int = today.month
+        self.rows: dict = {}
+
+        # STYLES
+        s = ttk.Style()
+        s.configure('AT.TFrame',
+                    background='#000000',
+                    )
+        s.configure('CAL.TLabel',
+                    background='#000000',
+                    foreground='white',
+                    font='arial 16',
+                    )
+        s.configure('DAY.TButton',
+                    width=4,
+                    padding=4,
+                    font='arial 12',
+                    )
+        s.configure('DUE.TButton',
+                    width=4,
+                    padding=4,
+                    font='arial 12 bold',
+                    )
+        s.map('DUE.TButton',
+              background=[('!active', '#D27C00'),
+                          ('active', '#F0A030'),
+                          ],
+              )
+
+        # MONTH NAVIGATION
+        header = ttk.Frame(self, style='AT.TFrame')
+        header.grid(row=0, column=0, columnspan=2, pady=10)
+
+        ttk.Button(header,
+                   text='<',
+                   style='DAY.TButton',
+                   takefocus=0,
+                   command=lambda: self.change_month(-1),
+                   ).grid(row=0, column=0, padx=10)
+
+        self.label_month = ttk.Label(header, style='CAL.TLabel', width=16, anchor='center')
+        self.label_month.grid(row=0, column=1)
+
+        ttk.Button(header,
+                   text='>',
+                   style='DAY.TButton',
+                   takefocus=0,
+                   command=lambda: self.change_month(1),
+                   ).grid(row=0, column=2, padx=10)
+
+        # DAYS OF THE MONTH
+        self.frame_days = ttk.Frame(self, style='AT.TFrame')
+        self.frame_days.grid(row=1, column=0, columnspan=2, padx=10)
+
+        # MATURITIES OF THE MONTH
+        columns = ('vencimento', 'nome', 'categoria', 'valor_aplicado', 'rentabilidade')
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=10)
+        self.tree.heading('vencimento', text='VENCIMENTO')
+        self.tree.heading('nome', text='NOME')
+        self.tree.heading('categoria', text='CATEGORIA')
+        self.tree.heading('valor_aplicado', text='VALOR APLICADO')
+        self.tree.heading('rentabilidade', text='RENTABILIDADE')
+        for column in columns:
+            self.tree.column(column, width=170, anchor='center')
+        self.tree.grid(row=2, column=0, padx=(10, 0), pady=10, sticky=('n', 's', 'e', 'w'))
+
+        scroll = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        scroll.grid(row=2, column=1, pady=10, sticky=('n', 's'))
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        self.load_month()
+
+    # FUNCTIONS
+    def change_month(self, step: int) -> None:
+        self.year, self.month = divmod(self.year * 12 + self.month - 1 + step, 12)
+        self.month += 1
+        self.load_month()
+
+    def load_month(self) -> None:
+        self.label_month['text'] = f'{self.month:02d}/{self.year}'
+        last_day: int = calendar.monthrange(self.year, self.month)[1]
+        future = self.rep_rf.vencimentos_entre(date(self.year, self.month, 1),
+                                               date(self.year, self.month, last_day))
+        GeneralFunctions.wait_future(self, future, self.show_month)
+
+    def show_month(self, rows: list) -> None:
+        self.rows = {}
+        for row in rows:
+            self.rows.setdefault(int(converter_data(row[6])[8:]), []).append(row)
+
+        for widget in self.frame_days.winfo_children():
+            widget.destroy()
+        for column, name in enumerate(('Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom')):
+            ttk.Label(self.frame_days, text=name, style='CAL.TLabel').grid(row=0, column=column, padx=4)
+        for week, days in enumerate(calendar.monthcalendar(self.year, self.month), start=1):
+            for column, day in enumerate(days):
+                if not day:
+                    continue
+                ttk.Button(self.frame_days,
+                           text=str(day),
+                           style='DUE.TButton' if day in self.rows else 'DAY.TButton',
+                           takefocus=0,
+                           command=lambda day=day: self.show_rows(self.rows.get(day, [])),
+                           ).grid(row=week, column=column, padx=2, pady=2)
+
+        self.show_rows(rows)
+
+    def show_rows(self, rows: list) -> None:
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert('', 'end', values=(row[6], row[1], row[3], f'R$ {row[5]:.2f}', row[7]))
+
+
 class TLRegVariableIncome(Toplevel):
     def __init__(self, master, title: str, color: str, width: str, height: str):
         Toplevel.__init__(self, master)
@@ -680,7 +973,7 @@ class ListProductsRF(Toplevel):
         GeneralFunctions.set_size_window(self, 1200, 600)
         
         # VARIABLES
-        self.rep_rf = AtivoFactory().conectar_bd_rf()
+        self.rep_rf = RepositorioAssincrono(AtivoFactory().conectar_bd_rf())
 
         # STYLES
         self.s = ttk.Style()
@@ -743,17 +1036,23 @@ class ListProductsRF(Toplevel):
         self.tree.column(column=6, width=140, anchor='center', stretch=True)
         self.tree.column(column=7, anchor='center', stretch=True)
 
-        # INSERT ITENS INTO TREEVIEW
-        self.list_items()
-
         self.tree.grid(row=0, column=0, sticky=('n', 's', 'e', 'w'))
         self.tree.bind('<<TreeviewSelect>>', self.item_selected)
         
         # SCROLLBAR
         scroll = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scroll.set)
         scroll.grid(row=0, column=1, sticky=('n', 's'))
 
+        # INSERT ITENS INTO TREEVIEW (ONE PAGE AT A TIME)
+        self.pager = PagedTree(self.tree,
+                               scroll,
+                               self.rep_rf.relatorio_pagina,
+                               self.rep_rf.relatorio_por_ids,
+                               self.rep_rf.buscar,
+                               self.rep_rf.repositorio.cursor_relatorio,
+                               )
+        self.list_items()
+
         # FRAME FOR BUTTONS
         frame = ttk.Frame(self, style='AT.TFrame')
         frame.grid(row=1, column=0, columnspan=2)
@@ -796,10 +1095,32 @@ class ListProductsRF(Toplevel):
                                              )
         self.button_change_data.grid(row=0, column=3, pady=(5, 10), padx=10)
 
+        # LIVE FILTER
+        label_search = ttk.Label(frame, text='Buscar:')
+        label_search.grid(row=0, column=4, pady=(5, 10), padx=(30, 5))
+
+        self.search_var = StringVar(self)
+        self.search_var.trace_add('write', lambda *args: self.pager.search_later(self.search_var.get()))
+        entry_search = ttk.Entry(frame,
+                                 textvariable=self.search_var,
+                                 font='arial 14',
+                                 width=20,
+                                 )
+        entry_search.grid(row=0, column=5, pady=(5, 10), padx=10)
+
+        # GROSS VALUE OF THE PORTFOLIO TODAY
+        self.label_gross = ttk.Label(frame)
+        self.label_gross.grid(row=0, column=6, pady=(5, 10), padx=(30, 10))
+
     # FUNCTIONS
     def list_items(self) -> None:
-        for data in self.rep_rf.relatorio_for_tkinter():
-            self.tree.insert('', 'end', values=data)
+        self.pager.reload()
+        self.load_gross_value()
+
+    def load_gross_value(self) -> None:
+        def done(values: dict) -> None:
+            self.label_gross['text'] = f'Valor bruto hoje: R$ {sum(values.values()):.2f}'
+        GeneralFunctions.wait_future(self, self.rep_rf.valor_atual(), done)
 
     def item_selected(self, *args) -> list:
         self.button_purchase['state'] = 'enable'
@@ -1120,24 +1441,26 @@ class ListProductsRF(Toplevel):
                 showerror(title='Error', message="Verifique a quantidade e valor informados")
                 return
             else:
-                self.rep_rf.comprar(code, int(amount), float(value))
-                showinfo(title='Ok', message=f'Compra realizada com sucesso')
-                self.refresh()
-                self.top_l_purchase.destroy()
+                future: Future = self.rep_rf.comprar(code, int(amount), float(value))
         except ValueError:
             showerror(title='Error', message='Entrada de dados inválida')
-        except Exception as error:
-            showerror(title='Error', message=f'Error: {error}')
+            return
+
+        def done(_) -> None:
+            showinfo(title='Ok', message=f'Compra realizada com sucesso')
+            self.refresh(code)
+            self.top_l_purchase.destroy()
+        GeneralFunctions.wait_future(self, future, done)
     
     def dell(self) -> None:
+        ident: str = str(self.item[0])
         code: str = str(self.item[1])
-        try:
-            self.rep_rf.deletar_ativo(code)
+
+        def done(_) -> None:
             showinfo(title='OK', message=f'Ativo deletado com sucesso')
-            self.refresh()
+            self.refresh(ident)
             self.top_level_del.destroy()
-        except Exception as error:
-            showerror(title='Error', message=f'Error: {error}')
+        GeneralFunctions.wait_future(self, self.rep_rf.deletar_ativo(code), done)
     
     def change_value_amount(self) -> None:
         code: str = str(self.item[0])
@@ -1149,14 +1472,16 @@ class ListProductsRF(Toplevel):
                 showerror(title='Error', message="Verifique a quantidade e valor informados")
                 return
             else:
-                self.rep_rf.acertar_valor_aplicado(code, float(value), int(amount))
-                showinfo(title='OK', message=f'Dados alterados com sucesso')
-                self.refresh()
-                self.top_level_change.destroy()
+                future: Future = self.rep_rf.acertar_valor_aplicado(code, float(value), int(amount))
         except ValueError:
             showerror(title='Error', message='Entrada de dados inválida')
-        except Exception as error:
-            showerror(title='Error', message=f'Error: {error}')
+            return
+
+        def done(_) -> None:
+            showinfo(title='OK', message=f'Dados alterados com sucesso')
+            self.refresh(code)
+            self.top_level_change.destroy()
+        GeneralFunctions.wait_future(self, future, done)
 
     def get_category(self, event) -> str:
         self.entry_category.select_clear()
@@ -1176,27 +1501,34 @@ class ListProductsRF(Toplevel):
                 showerror(title='Error', message='Preencha todos os campos.')
                 return
             else:
-                self.rep_rf.alterar_dados_ativo(code,
-                                                name,
-                                                category,
-                                                redeem,
-                                                expiration,
-                                                profitability,
-                                                )
-                showinfo(title='OK', message='Dados alterados com sucesso')
-                self.refresh()
-                self.top_level_rdm.destroy()
+                future: Future = self.rep_rf.alterar_dados_ativo(code,
+                                                                 name,
+                                                                 category,
+                                                                 redeem,
+                                                                 expiration,
+                                                                 profitability,
+                                                                 )
         except ValueError:
             showerror(title='Error', message='Verifique os dados informados.')
-        except Exception as error:
+            return
+
+        def done(_) -> None:
+            showinfo(title='OK', message='Dados alterados com sucesso')
+            self.refresh(code)
+            self.top_level_rdm.destroy()
+
+        def failed(error: BaseException) -> None:
             showerror(title='Error', message=f'O nome "{name}" já está em uso.\n'
                       f'{error}'
                       )
+        GeneralFunctions.wait_future(self, future, done, failed)
     
-    def refresh(self) -> None:
-        for record in self.tree.get_children():
-            self.tree.delete(record)
-        self.list_items()
+    def refresh(self, *ids) -> None:
+        if ids:
+            self.pager.refresh_ids(ids)
+            self.load_gross_value()
+        else:
+            self.list_items()
 
 
 class ListProductsRV(Toplevel):
@@ -1209,7 +1541,7 @@ class ListProductsRV(Toplevel):
         GeneralFunctions.set_size_window(self, 1200, 600)
 
         # VARIABLES
-        self.rep_rv = AtivoFactory().conectar_bd_rv()
+        self.rep_rv = RepositorioAssincrono(AtivoFactory().conectar_bd_rv())
         self.check: bool = False
 
         # STYLES
@@ -1272,17 +1604,23 @@ class ListProductsRV(Toplevel):
         self.tree.column(column=6, width=140, anchor='center', stretch=True)
         self.tree.column(column=7, anchor='center', stretch=True)
 
-        # INSERT ITENS INTO TREEVIEW
-        self.list_items()
-
         self.tree.grid(row=0, column=0, sticky=('n', 's', 'e', 'w'))
         self.tree.bind('<<TreeviewSelect>>', self.item_selected)
         
         # SCROLLBAR
         scroll = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scroll.set)
         scroll.grid(row=0, column=1, sticky=('n', 's'))
 
+        # INSERT ITENS INTO TREEVIEW (ONE PAGE AT A TIME)
+        self.pager = PagedTree(self.tree,
+                               scroll,
+                               self.rep_rv.relatorio_pagina,
+                               self.rep_rv.relatorio_por_ids,
+                               self.rep_rv.buscar,
+                               self.rep_rv.repositorio.cursor_relatorio,
+                               )
+        self.list_items()
+
         # FRAME FOR BUTTONS
         frame = ttk.Frame(self, style='AT.TFrame')
         frame.grid(row=1, column=0, columnspan=2)
@@ -1333,11 +1671,23 @@ class ListProductsRV(Toplevel):
                                                   command=self.top_level_amount_value,
                                                   )
         self.button_set_value_amount.grid(row=0, column=4, pady=(5, 10), padx=10)
-    
+
+        # LIVE FILTER
+        label_search = ttk.Label(frame, text='Buscar:')
+        label_search.grid(row=0, column=5, pady=(5, 10), padx=(30, 5))
+
+        self.search_var = StringVar(self)
+        self.search_var.trace_add('write', lambda *args: self.pager.search_later(self.search_var.get()))
+        entry_search = ttk.Entry(frame,
+                                 textvariable=self.search_var,
+                                 font='arial 14',
+                                 width=20,
+                                 )
+        entry_search.grid(row=0, column=6, pady=(5, 10), padx=10)
+
     # FUNCTIONS
     def list_items(self) -> None:
-        for data in self.rep_rv.relatorio_for_tkinter():
-            self.tree.insert('', 'end', values=data)
+        self.pager.reload()
 
     def item_selected(self, *args) -> list:
         self.button_purchase['state'] = 'enable'
@@ -1745,14 +2095,19 @@ class ListProductsRV(Toplevel):
                 showerror(title='Error', message="Verifique a quantidade e valor informados")
                 return
             else:
-                self.rep_rv.comprar(code, int(amount), float(value))
-                showinfo(title='Ok',
-                        message=f'Compra de {amount} unidade(s) de {label} no total \n'
-                                f'de R$ {self.total_value()} realizada com sucesso.')
-                self.top_l_purchase.destroy()
-                self.refresh()
-        except Exception as error:
+                total: str = self.total_value()
+                future: Future = self.rep_rv.comprar(code, int(amount), float(value))
+        except ValueError as error:
             showerror(title='Error', message=error)
+            return
+
+        def done(_) -> None:
+            showinfo(title='Ok',
+                    message=f'Compra de {amount} unidade(s) de {label} no total \n'
+                            f'de R$ {total} realizada com sucesso.')
+            self.top_l_purchase.destroy()
+            self.refresh(code)
+        GeneralFunctions.wait_future(self, future, done, self.show_error)
 
     def sell(self) -> None:
         code: str = self.item[0]
@@ -1764,30 +2119,29 @@ class ListProductsRV(Toplevel):
             if not amount or not value or amount == '' or value == '':
                 showerror(title='Error', message="Verifique a quantidade e valor informados")
                 return
-            elif int(amount) > int(self.item[4]):
-                showerror(title='Error', message='Quantidade insuficiente para realizar'
-                          'esta operação.')
-                return
             else:
-                self.rep_rv.vender(code, int(amount), float(value))
-                showinfo(title='Ok',
-                        message=f'Venda de {amount} unidade(s) de {label} no total \n'
-                                f'de R$ {self.total_value()} realizada com sucesso.')
-                self.refresh()
-                self.top_l_sell.destroy()
-        except Exception as error:
+                total: str = self.total_value()
+                future: Future = self.rep_rv.vender(code, int(amount), float(value))
+        except ValueError as error:
             showerror(title='Error', message=error)
+            return
+
+        def done(_) -> None:
+            showinfo(title='Ok',
+                    message=f'Venda de {amount} unidade(s) de {label} no total \n'
+                            f'de R$ {total} realizada com sucesso.')
+            self.refresh(code)
+            self.top_l_sell.destroy()
+        GeneralFunctions.wait_future(self, future, done, self.show_error)
     
     def delete(self) -> None:
         code: str = self.item[0]
-        
-        try:
-            self.rep_rv.deletar(code)
+
+        def done(_) -> None:
             showinfo(message=f'Ativo deletado com sucesso')
-            self.refresh()
+            self.refresh(code)
             self.top_level_del.destroy()
-        except Exception as error:
-            showerror(message=f'Error: {error}')
+        GeneralFunctions.wait_future(self, self.rep_rv.deletar(code), done)
     
     def total_value(self) -> str:
         value: str = self.value_entry.get().replace(',', '.')
@@ -1812,18 +2166,23 @@ class ListProductsRV(Toplevel):
                 showerror(message='Preencha todos os campos.')
                 return
             else:
-                self.rep_rv.alterar_dados(ident,
-                                          name,
-                                          code,
-                                          category,
-                                          )
-                showinfo(title='OK', message='Dados alterados com sucesso')
-                self.refresh()
-                self.top_level_sd.destroy()
+                future: Future = self.rep_rv.alterar_dados(ident,
+                                                           name,
+                                                           code,
+                                                           category,
+                                                           )
         except ValueError:
             showerror(title='Error', message='Verifique os dados informados.')
-        except Exception:
+            return
+
+        def done(_) -> None:
+            showinfo(title='OK', message='Dados alterados com sucesso')
+            self.refresh(ident)
+            self.top_level_sd.destroy()
+
+        def failed(error: BaseException) -> None:
             showerror(title='Error', message=f'O Codigo "{code}" já está em uso.')
+        GeneralFunctions.wait_future(self, future, done, failed)
 
     def change_value_amount(self) -> None:
         code: str = self.item[0]
@@ -1835,24 +2194,180 @@ class ListProductsRV(Toplevel):
                 showerror(message="Verifique a quantidade e valor informados")
                 return
             else:
-                self.rep_rv.acertar_valor_quantidade(code,
-                                                     int(amount),
-                                                     float(value),
-                                                     )
-                showinfo(message=f'Dados alterados com sucesso')
-                self.refresh()
-                self.top_level_set_values.destroy()
+                future: Future = self.rep_rv.acertar_valor_quantidade(code,
+                                                                      int(amount),
+                                                                      float(value),
+                                                                      )
         except TypeError:
             showerror(title='Error', message='Nenhum item selecionado')
+            return
         except ValueError:
             showerror(message='Entrada de dados inválida')
-        except Exception as error:
-            showerror(message=f'Error: {error}')
+            return
+
+        def done(_) -> None:
+            showinfo(message=f'Dados alterados com sucesso')
+            self.refresh(code)
+            self.top_level_set_values.destroy()
+        GeneralFunctions.wait_future(self, future, done)
+
+    def show_error(self, error: BaseException) -> None:
+        showerror(title='Error', message=error)
     
-    def refresh(self) -> None:
-        for record in self.tree.get_children():
-            self.tree.delete(record)
-        self.list_items()
+    def refresh(self, *ids) -> None:
+        if ids:
+            self.pager.refresh_ids(ids)
+        else:
+            self.list_items()
+
+
+class PagedTree:
+    """
+    Fills a Treeview one page at a time using keyset pagination on id
+    and fetches the next page when the scrollbar gets near the end, so
+    opening the window costs the same whatever the size of the table.
+
+    Items use the asset id as iid, which lets refresh_ids() update only
+    the rows touched by an operation. The ids of the paged rows are
+    also kept in a sorted list, so placing a new row costs a bisect
+    instead of a walk over every child. With a search term the tree
+    shows the matches of fetch_search instead of the pages.
+
+    The next page continues after the cursor_of(row) of the last loaded
+    row, so deleting that row does not break the paging.
+
+    fetch_page(after, limit), fetch_rows(ids) and fetch_search(term,
+    limit) must return a Future with the rows; cursor_of(row) returns
+    the cursor synchronously.
+    """
+    PAGE_SIZE: int = 200
+
+    def __init__(self,
+                 tree: ttk.Treeview,
+                 scroll: ttk.Scrollbar,
+                 fetch_page,
+                 fetch_rows,
+                 fetch_search,
+                 cursor_of,
+                 page_size: int = PAGE_SIZE):
+        self.tree = tree
+        self.scroll = scroll
+        self.fetch_page = fetch_page
+        self.fetch_rows = fetch_rows
+        self.fetch_search = fetch_search
+        self.cursor_of = cursor_of
+        self.term: str = ''
+        self.search_job: str | None = None
+        self.page_size: int = page_size
+        self.last_id: int = 0
+        self.cursor: tuple | int = 0
+        self.keys: list = []
+        self.loading: bool = False
+        self.finished: bool = False
+        self.generation: int = 0
+        self.tree.configure(yscrollcommand=self.on_scroll)
+
+    def reload(self) -> None:
+        self.generation += 1
+        self.tree.delete(*self.tree.get_children())
+        self.last_id = 0
+        self.cursor = 0
+        self.keys = []
+        self.loading = False
+        self.finished = False
+        if self.term:
+            self.show_search()
+        else:
+            self.load_more()
+
+    def search(self, term: str) -> None:
+        self.search_job = None
+        self.term = term.strip()
+        self.reload()
+
+    def search_later(self, term: str, delay: int = 150) -> None:
+        # waits for a pause in typing before querying
+        if self.search_job is not None:
+            self.tree.after_cancel(self.search_job)
+        self.search_job = self.tree.after(delay, self.search, term)
+
+    def show_search(self) -> None:
+        self.finished = True
+        generation: int = self.generation
+
+        def done(rows: list) -> None:
+            if generation != self.generation:
+                return
+            for row in rows:
+                self.tree.insert('', 'end', iid=str(row[0]), values=row)
+        GeneralFunctions.wait_future(self.tree, self.fetch_search(self.term, self.page_size), done)
+
+    def load_more(self) -> None:
+        if self.loading or self.finished:
+            return
+        self.loading = True
+        generation: int = self.generation
+
+        def done(rows: list) -> None:
+            if generation != self.generation:
+                return
+            self.loading = False
+            for row in rows:
+                self.tree.insert('', 'end', iid=str(row[0]), values=row)
+            # pages arrive in id order, after every id already loaded
+            self.keys.extend(int(row[0]) for row in rows)
+            if rows:
+                self.last_id = int(rows[-1][0])
+                self.cursor = self.cursor_of(rows[-1])
+            self.finished = len(rows) < self.page_size
+
+        def failed(error: BaseException) -> None:
+            self.loading = False
+            showerror(title='Error', message=f'Error: {error}')
+        GeneralFunctions.wait_future(self.tree, self.fetch_page(self.cursor, self.page_size), done, failed)
+
+    def refresh_ids(self, ids) -> None:
+        """
+        Re-reads only the given ids and updates, inserts or deletes the
+        matching items. Selection and scroll position are untouched.
+        """
+        ids = [int(ident) for ident in ids]
+        generation: int = self.generation
+
+        def done(rows: list) -> None:
+            if generation != self.generation:
+                return
+            found: dict = {int(row[0]): row for row in rows}
+            for ident in ids:
+                iid: str = str(ident)
+                row = found.get(ident)
+                if row is None:
+                    if self.tree.exists(iid):
+                        self.tree.delete(iid)
+                        self.forget(ident)
+                elif self.tree.exists(iid):
+                    self.tree.item(iid, values=row)
+                elif ident <= self.last_id:
+                    # ids after last_id arrive with the next pages
+                    position: int = self.position_of(ident)
+                    self.tree.insert('', position, iid=iid, values=row)
+                    self.keys.insert(position, ident)
+        GeneralFunctions.wait_future(self.tree, self.fetch_rows(ids), done)
+
+    def position_of(self, ident: int) -> int:
+        return bisect_left(self.keys, ident)
+
+    def forget(self, ident: int) -> None:
+        position: int = self.position_of(ident)
+        if position < len(self.keys) and self.keys[position] == ident:
+            del self.keys[position]
+
+    def on_scroll(self, first: str, last: str) -> None:
+        self.scroll.set(first, last)
+        # the tree also calls this after inserts, which keeps loading
+        # pages until the visible area is filled
+        if float(last) >= 0.9:
+            self.load_more()
 
 
 class GeneralFunctions:
@@ -1862,5 +2377,27 @@ class GeneralFunctions:
         h = int((window.winfo_screenheight() / 2) - (height/2))
         window.geometry(f'{width}x{height}+{w}+{h}')
 
+    @staticmethod
+    def wait_future(widget, future: Future, on_done, on_error=None, interval: int = 50) -> None:
+        """
+        Polls the future with after() so the main loop never blocks, then
+        calls on_done(result) or on_error(error) on the Tk thread. Without
+        on_error the error is shown in a message box.
+        """
+        def check() -> None:
+            if not widget.winfo_exists():
+                return
+            if not future.done():
+                widget.after(interval, check)
+                return
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                showerror(title='Error', message=f'Error: {error}')
+        widget.after(interval, check)
+
 
 PyInvest()
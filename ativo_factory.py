@@ -1,4 +1,10 @@
+import datetime
+from typing import Iterable
+
+from data.conexao import GerenciadorConexao, obter_gerenciador
 from data.data import RepositorioRendaFixa, RepositorioRendaVariavel
+from data.historico import HistoricoCarteira, valor_carteira_historico
+from data.metodos_sql import ResultadoLote
 from modulos.ativos.acoes import Acao
 from modulos.ativos.fiis import Fiis
 from modulos.ativos.renda_fixa import RendaFixa
@@ -7,9 +13,10 @@ from modulos.ativos.tesouro_direto import TesouroDireto
 
 
 class AtivoFactory:
-    def __init__(self):
-        self.__rep_rv = RepositorioRendaVariavel()
-        self.__rep_rf = RepositorioRendaFixa()
+    def __init__(self, gerenciador: GerenciadorConexao | None = None):
+        self.__gerenciador: GerenciadorConexao = gerenciador or obter_gerenciador()
+        self.__rep_rv = RepositorioRendaVariavel(self.__gerenciador)
+        self.__rep_rf = RepositorioRendaFixa(self.__gerenciador)
     
     def conectar_bd_rf(self) -> RepositorioRendaFixa:
         return self.__rep_rf
@@ -51,3 +58,58 @@ class AtivoFactory:
                                                       resgate,
                                                       vencimento,
                                                       rentabilidade))
+
+    def criar_acoes_em_lote(self, ativos: Iterable[tuple]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> (nome, codigo)
+
+        return ResultadoLote
+        """
+        return self.__rep_rv.cadastrar_ativos_em_lote(Acao(nome, codigo) for nome, codigo in ativos)
+
+    def criar_fiis_em_lote(self, ativos: Iterable[tuple]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> (nome, codigo)
+
+        return ResultadoLote
+        """
+        return self.__rep_rv.cadastrar_ativos_em_lote(Fiis(nome, codigo) for nome, codigo in ativos)
+
+    def criar_rendas_fixas_em_lote(self, ativos: Iterable[tuple]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> (nome, resgate, vencimento, rentabilidade)
+
+        return ResultadoLote
+        """
+        return self.__rep_rf.cadastrar_ativos_em_lote(RendaFixa(*ativo) for ativo in ativos)
+
+    def criar_tesouros_diretos_em_lote(self, ativos: Iterable[tuple]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> (nome, resgate, vencimento, rentabilidade, periodicidade_pagamentos)
+
+        return ResultadoLote
+        """
+        return self.__rep_rf.cadastrar_ativos_em_lote(TesouroDireto(*ativo) for ativo in ativos)
+
+    def criar_reservas_emergencia_em_lote(self, ativos: Iterable[tuple]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> (nome, resgate, vencimento, rentabilidade)
+
+        return ResultadoLote
+        """
+        return self.__rep_rf.cadastrar_ativos_em_lote(ReservaEmergencia(*ativo) for ativo in ativos)
+
+    def valor_carteira_historico(self,
+                                 inicio: datetime.date | str,
+                                 fim: datetime.date | str | None = None) -> HistoricoCarteira:
+        """
+        Valor de renda variável e de renda fixa em cada dia corrido do
+        intervalo, calculado de uma vez a partir do livro de
+        movimentações, das cotações e das séries de indexadores.
+
+        Param: inicio: datetime.date | str
+        Param: fim: datetime.date | str -> hoje, se omitida
+
+        return HistoricoCarteira
+        """
+        return valor_carteira_historico(self.__gerenciador.obter(), inicio, fim)
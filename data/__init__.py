@@ -1,4 +1,10 @@
+from .conexao import GerenciadorConexao, obter_gerenciador
+from .perfis import PERFIS, PerfilDesempenho
+from .centavos import CENTAVOS, REAIS, Moeda
+from .eventos import BarramentoEventos
+from .assincrono import RepositorioAssincrono, obter_executor
+from .cotacoes import RepositorioCotacoes, ResultadoCotacoes
 from .data import RepositorioRendaFixa, RepositorioRendaVariavel
 from .exceptions import AtivoJaCadastradoError, AtivoNaoCadastradoError
 from .exceptions import SaldoInsuficienteError, QuantidadeInsuficienteError
-from .metodos_sql import MetodosSqlRF, MetodosSqlRV
+from .metodos_sql import MetodosSqlRF, MetodosSqlRV, ResultadoLote
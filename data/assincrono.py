@@ -0,0 +1,66 @@
+import atexit
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_executor: ThreadPoolExecutor | None = None
+_lock_executor = threading.Lock()
+
+
+def obter_executor() -> ThreadPoolExecutor:
+    """
+    Executor compartilhado por todas as fachadas. Tem uma única thread:
+    o SQLite aceita um escritor por vez e assim as operações terminam
+    na ordem em que foram pedidas (uma compra seguida de um relatório
+    sempre enxerga a compra).
+
+    return ThreadPoolExecutor
+    """
+    global _executor
+    with _lock_executor:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pyinvest-bd')
+            atexit.register(encerrar_executor)
+        return _executor
+
+
+def encerrar_executor() -> None:
+    """
+    Espera as operações pendentes e encerra a thread do executor.
+
+    return None
+    """
+    global _executor
+    with _lock_executor:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+class RepositorioAssincrono:
+    """
+    Fachada sobre RepositorioRendaVariavel ou RepositorioRendaFixa: os
+    mesmos métodos, executados fora da thread que chama e devolvendo um
+    concurrent.futures.Future. Exceções do repositório (inclusive as que
+    derivam de BaseException) ficam guardadas no Future.
+
+        futuro = RepositorioAssincrono(rep_rv).comprar('1', 10, 20.0)
+        futuro.result()
+    """
+    def __init__(self, repositorio: object, executor: ThreadPoolExecutor | None = None) -> None:
+        self.__repositorio: object = repositorio
+        self.__executor: ThreadPoolExecutor = executor or obter_executor()
+
+    @property
+    def repositorio(self) -> object:
+        return self.__repositorio
+
+    def __getattr__(self, nome: str):
+        atributo = getattr(self.__repositorio, nome)
+        if not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        def submeter(*args, **kwargs) -> Future:
+            return self.__executor.submit(atributo, *args, **kwargs)
+        return submeter
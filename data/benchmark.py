@@ -0,0 +1,297 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import argparse
+import datetime
+import json
+import platform
+import sqlite3 as sq
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+from ativos.acoes import Acao
+from ativos.renda_fixa import RendaFixa
+
+from .conexao import GerenciadorConexao
+from .data import RepositorioRendaFixa, RepositorioRendaVariavel
+from .perfis import PERFIL_PADRAO, PERFIS
+from .sintetico import CarteiraGerada, gerar_carteira
+
+# ativos (e movimentações iniciais) de cada banco sintético da suíte
+TAMANHOS: dict = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+PERCENTIS: tuple = (0.5, 0.9, 0.95, 0.99)
+LOTE_CARGA: int = 50_000
+
+
+def medir(operacao: Callable[[int], object], repeticoes: int) -> list:
+    """
+    Param: operacao: função chamada com o número da repetição
+    Param: repeticoes: int
+
+    return list -> duração de cada chamada em milissegundos
+    """
+    tempos: list = []
+    for i in range(repeticoes):
+        inicio: float = time.perf_counter()
+        operacao(i)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def percentil(tempos: list, fracao: float) -> float:
+    ordenados: list = sorted(tempos)
+    return ordenados[min(int(len(ordenados) * fracao), len(ordenados) - 1)]
+
+
+def medir_perfil(perfil: str, pasta: str, repeticoes: int, base: int) -> dict:
+    """
+    Mede a latência das operações do dia a dia em um banco novo com
+    `base` ações já cadastradas.
+
+    Param: perfil: str -> nome em PERFIS
+    Param: pasta: str -> onde criar o banco
+    Param: repeticoes: int -> chamadas por operação
+    Param: base: int
+
+    return dict -> {operação: lista de tempos em ms}
+    """
+    gerenciador: GerenciadorConexao = GerenciadorConexao(os.path.join(pasta, f'{perfil}.db'), perfil)
+    try:
+        rep: RepositorioRendaVariavel = RepositorioRendaVariavel(gerenciador)
+        rep.cadastrar_ativos_em_lote(Acao(f'Empresa {i}', f'EMP{i}') for i in range(base))
+        tempos: dict = {
+            'cadastrar': medir(lambda i: rep.cadastrar_ativo(Acao(f'Nova {i}', f'NOVA{i}')), repeticoes),
+            'comprar': medir(lambda i: rep.comprar(str(i % base + 1), 10, 20.0), repeticoes),
+        }
+        # as mesmas compras agrupadas em uma única transação
+        with rep.transacao():
+            tempos['comprar_em_transacao'] = medir(lambda i: rep.comprar(str(i % base + 1), 10, 20.0), repeticoes)
+        return tempos | {
+            'vender': medir(lambda i: rep.vender(str(i % base + 1), 5, 25.0), repeticoes),
+            'relatorio_pagina': medir(lambda i: rep.relatorio_pagina(i % base), repeticoes),
+            'buscar': medir(lambda i: rep.buscar(f'Empresa {i % base}'), repeticoes),
+            'resumo_carteira': medir(lambda i: rep.resumo_carteira(), repeticoes),
+        }
+    finally:
+        gerenciador.fechar_todas()
+
+
+def resumir(tempos: list) -> dict:
+    """
+    Param: tempos: list -> durações em milissegundos
+
+    return dict -> repetições, vazão (operações por segundo), média,
+                   percentis de PERCENTIS e máximo, em ms
+    """
+    total: float = sum(tempos)
+    resumo: dict = {'repeticoes': len(tempos),
+                    'por_segundo': len(tempos) / (total / 1000) if total else float('inf'),
+                    'media_ms': total / len(tempos)}
+    for fracao in PERCENTIS:
+        resumo[f'p{round(fracao * 100)}_ms'] = percentil(tempos, fracao)
+    resumo['max_ms'] = max(tempos)
+    return resumo
+
+
+def preparar_banco(gerenciador: GerenciadorConexao, tamanho: int, semente: int = 0) -> tuple:
+    """
+    Carteira sintética com `tamanho` ativos, metade de renda variável
+    (ações e FIIs) e metade de renda fixa (as três categorias), todos
+    com uma movimentação inicial, gerada por data.sintetico e gravada
+    pelo caminho em lote dos repositórios.
+
+    Param: gerenciador: GerenciadorConexao
+    Param: tamanho: int
+    Param: semente: int
+
+    return tuple -> (ids de RV, ids de RF)
+    """
+    carteira: CarteiraGerada = gerar_carteira(gerenciador, tamanho, semente, tamanho_lote=LOTE_CARGA)
+    return carteira.ids_rv, carteira.ids_rf
+
+
+def medir_suite(tamanho: int,
+                pasta: str,
+                repeticoes: int,
+                repeticoes_completas: int = 3,
+                perfil: str = PERFIL_PADRAO) -> dict:
+    """
+    Mede as operações dos repositórios em um banco sintético de
+    `tamanho` ativos (ver preparar_banco). Os relatórios que leem a
+    tabela inteira (relatorio e relatorio_for_tkinter) são repetidos
+    só `repeticoes_completas` vezes.
+
+    Param: tamanho: int
+    Param: pasta: str -> onde criar o banco
+    Param: repeticoes: int -> chamadas por operação
+    Param: repeticoes_completas: int
+    Param: perfil: str -> nome em PERFIS
+
+    return dict -> {operação: resumir(tempos)}, mais 'preparar_banco'
+                   com a duração da carga
+    """
+    gerenciador: GerenciadorConexao = GerenciadorConexao(os.path.join(pasta, f'suite_{tamanho}.db'), perfil)
+    try:
+        inicio: float = time.perf_counter()
+        ids_rv, ids_rf = preparar_banco(gerenciador, tamanho)
+        carga: float = (time.perf_counter() - inicio) * 1000
+        rep_rv: RepositorioRendaVariavel = RepositorioRendaVariavel(gerenciador)
+        rep_rf: RepositorioRendaFixa = RepositorioRendaFixa(gerenciador)
+        rv = lambda i: str(ids_rv[i * 7919 % len(ids_rv)])
+        rf = lambda i: str(ids_rf[i * 7919 % len(ids_rf)])
+        amostra_rv: list = ids_rv[::max(len(ids_rv) // 50, 1)][:50]
+        amostra_rf: list = ids_rf[::max(len(ids_rf) // 50, 1)][:50]
+
+        operacoes: dict = {
+            'rv.cadastrar_ativo': lambda i: rep_rv.cadastrar_ativo(Acao(f'Nova {i}', f'NOVA{i:06d}')),
+            'rv.comprar': lambda i: rep_rv.comprar(rv(i), 10, 20.0),
+            'rv.vender': lambda i: rep_rv.vender(rv(i), 1, 25.0),
+            'rv.relatorio_acoes': lambda i: rep_rv.relatorio_acoes(),
+            'rv.relatorio_fiis': lambda i: rep_rv.relatorio_fiis(),
+            'rv.relatorio_pagina': lambda i: rep_rv.relatorio_pagina(int(rv(i))),
+            'rv.relatorio_por_ids': lambda i: rep_rv.relatorio_por_ids(amostra_rv),
+            'rf.cadastrar_ativo': lambda i: rep_rf.cadastrar_ativo(
+                RendaFixa(f'Nova {i}', 'Imediato', '01/01/2031', '100% CDI')),
+            'rf.comprar': lambda i: rep_rf.comprar(rf(i), 1, 100.0),
+            'rf.resgatar': lambda i: rep_rf.resgatar(rf(i), 1, 1.0),
+            'rf.relatorio_renda_fixa': lambda i: rep_rf.relatorio_renda_fixa(),
+            'rf.relatorio_tesouro_direto': lambda i: rep_rf.relatorio_tesouro_direto(),
+            'rf.relatorio_res_emerg': lambda i: rep_rf.relatorio_res_emerg(),
+            'rf.relatorio_pagina': lambda i: rep_rf.relatorio_pagina(int(rf(i))),
+            'rf.relatorio_por_ids': lambda i: rep_rf.relatorio_por_ids(amostra_rf),
+        }
+        completas: dict = {
+            'rv.relatorio': lambda i: sum(1 for _ in rep_rv.relatorio()),
+            'rv.relatorio_for_tkinter': lambda i: rep_rv.relatorio_for_tkinter(),
+            'rf.relatorio': lambda i: sum(1 for _ in rep_rf.relatorio()),
+            'rf.relatorio_for_tkinter': lambda i: rep_rf.relatorio_for_tkinter(),
+        }
+        resultados: dict = {'preparar_banco': resumir([carga])}
+        for nome, operacao in operacoes.items():
+            resultados[nome] = resumir(medir(operacao, repeticoes))
+        for nome, operacao in completas.items():
+            resultados[nome] = resumir(medir(operacao, repeticoes_completas))
+        return resultados
+    finally:
+        gerenciador.fechar_todas()
+
+
+def comparar(atual: dict, anterior: dict, tolerancia: float = 0.2) -> list:
+    """
+    Compara dois resultados de salvar_resultados. Uma operação regrediu
+    quando a mediana ou o p95 cresceram mais que `tolerancia` (0.2 =
+    20%) no mesmo tamanho de banco.
+
+    Param: atual: dict
+    Param: anterior: dict
+    Param: tolerancia: float
+
+    return list -> (tamanho, operação, medida, antes, agora) de cada regressão
+    """
+    regressoes: list = []
+    for tamanho, operacoes in atual['resultados'].items():
+        for operacao, resumo in operacoes.items():
+            antes: dict | None = anterior['resultados'].get(tamanho, {}).get(operacao)
+            if antes is None:
+                continue
+            for medida in ('p50_ms', 'p95_ms'):
+                if resumo[medida] > antes[medida] * (1 + tolerancia):
+                    regressoes.append((tamanho, operacao, medida, antes[medida], resumo[medida]))
+    return regressoes
+
+
+def salvar_resultados(caminho: str, resultados: dict, rotulo: str = '') -> dict:
+    """
+    Grava os resultados da suíte em JSON, com o ambiente em que foram
+    medidos.
+
+    Param: caminho: str
+    Param: resultados: dict -> {tamanho: medir_suite(...)}
+    Param: rotulo: str -> versão ou commit medido
+
+    return dict -> o documento gravado
+    """
+    documento: dict = {
+        'rotulo': rotulo,
+        'gerado_em': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sq.sqlite_version,
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+    return documento
+
+
+def executar_suite(args: argparse.Namespace) -> int:
+    resultados: dict = {}
+    print(f'{"tamanho":<8} {"operação":<28} {"op/s":>10} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome in args.tamanho:
+            resultados[nome] = medir_suite(TAMANHOS[nome], pasta, args.repeticoes,
+                                           args.repeticoes_completas, (args.perfil or [PERFIL_PADRAO])[0])
+            for operacao, resumo in resultados[nome].items():
+                print(f'{nome:<8} {operacao:<28} {resumo["por_segundo"]:>10.1f} {resumo["p50_ms"]:>9.3f} '
+                      f'{resumo["p95_ms"]:>9.3f} {resumo["p99_ms"]:>9.3f}')
+    documento: dict = salvar_resultados(args.saida, resultados, args.rotulo)
+    print(f'Resultados gravados em {args.saida}.')
+
+    if args.comparar is None:
+        return 0
+    with open(args.comparar, encoding='utf-8') as arquivo:
+        regressoes: list = comparar(documento, json.load(arquivo), args.tolerancia)
+    for tamanho, operacao, medida, antes, agora in regressoes:
+        print(f'REGRESSÃO {tamanho} {operacao} {medida}: {antes:.3f} -> {agora:.3f} ms')
+    if not regressoes:
+        print('Nenhuma regressão acima da tolerância.')
+    return 1 if regressoes else 0
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m data.benchmark',
+                                     description='Latência por operação em cada perfil de desempenho. '
+                                                 'Com --tamanho, roda a suíte em bancos sintéticos.')
+    parser.add_argument('--perfil', choices=list(PERFIS), action='append',
+                        help='perfil a medir (pode repetir); padrão: todos (na suíte, o padrão)')
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--base', type=int, default=1000, help='ações cadastradas antes de medir')
+    suite = parser.add_argument_group('suíte')
+    suite.add_argument('--tamanho', choices=list(TAMANHOS), action='append',
+                       help='banco sintético a medir (pode repetir)')
+    suite.add_argument('--repeticoes-completas', type=int, default=3,
+                       help='chamadas dos relatórios que leem a tabela inteira')
+    suite.add_argument('--saida', default='benchmark.json', help='arquivo JSON com os resultados')
+    suite.add_argument('--rotulo', default='', help='versão ou commit medido, gravado no JSON')
+    suite.add_argument('--comparar', help='JSON de uma medição anterior; sai com 1 se houver regressão')
+    suite.add_argument('--tolerancia', type=float, default=0.2, help='aumento aceito na mediana e no p95')
+    args = parser.parse_args(argv)
+
+    if args.tamanho:
+        return executar_suite(args)
+
+    print(f'{"perfil":<12} {"operação":<22} {"mediana ms":>11} {"p95 ms":>9}')
+    with tempfile.TemporaryDirectory() as pasta:
+        for perfil in args.perfil or PERFIS:
+            for operacao, tempos in medir_perfil(perfil, pasta, args.repeticoes, args.base).items():
+                print(f'{perfil:<12} {operacao:<22} '
+                      f'{statistics.median(tempos):>11.3f} {percentil(tempos, 0.95):>9.3f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+CAPACIDADE_PADRAO: int = 4096
+
+
+class CachePosicoes:
+    """
+    Linhas de uma tabela de ativos (RV ou RF) guardadas em memória,
+    encontradas pelo id ou por uma das colunas únicas (codigo, nome).
+    Guarda no máximo `capacidade` linhas e descarta a usada há mais
+    tempo quando enche.
+
+    Cada operação recebe a versão do banco vista pela conexão (ver
+    _MetodosSqlBase._versao_banco). Se ela mudou desde a última vez,
+    alguém gravou sem passar pelos repositórios e o cache inteiro é
+    descartado. As gravações dos repositórios usam descartar(), que
+    remove só as linhas alteradas e adota a nova versão.
+    """
+    def __init__(self, colunas: dict, capacidade: int = CAPACIDADE_PADRAO) -> None:
+        """
+        Param: colunas: dict -> {nome da coluna única: posição na linha}
+        Param: capacidade: int
+        """
+        self.__colunas: dict = colunas
+        self.__capacidade: int = capacidade
+        self.__linhas: OrderedDict = OrderedDict()
+        self.__indices: dict = {coluna: {} for coluna in colunas}
+        self.__versao: tuple | None = None
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__linhas)
+
+    def obter(self, versao: tuple, coluna: str, valor: object) -> tuple | None:
+        """
+        Param: versao: tuple
+        Param: coluna: str -> 'id' ou uma das colunas únicas
+        Param: valor: object
+
+        return tuple | None -> a linha, ou None se não estiver no cache
+        """
+        with self.__lock:
+            self.__conferir_versao(versao)
+            ident: int | None = _como_id(valor) if coluna == 'id' else self.__indices[coluna].get(valor)
+            linha: tuple | None = self.__linhas.get(ident)
+            if linha is not None:
+                self.__linhas.move_to_end(ident)
+            return linha
+
+    def guardar(self, versao: tuple, linha: tuple) -> None:
+        """
+        Param: versao: tuple -> a mesma usada na leitura da linha
+        Param: linha: tuple -> linha completa da tabela, começando pelo id
+
+        return None
+        """
+        with self.__lock:
+            self.__conferir_versao(versao)
+            self.__remover(linha[0])
+            self.__linhas[linha[0]] = linha
+            for coluna, posicao in self.__colunas.items():
+                self.__indices[coluna][linha[posicao]] = linha[0]
+            while len(self.__linhas) > self.__capacidade:
+                self.__remover(next(iter(self.__linhas)))
+
+    def descartar(self, ids: Iterable, antes: tuple, depois: tuple) -> None:
+        """
+        Remove as linhas alteradas por uma gravação. Se a versão não era
+        `antes`, houve outra gravação no meio e tudo é descartado.
+
+        Param: ids: Iterable -> ids das linhas alteradas
+        Param: antes: tuple -> versão lida antes da gravação
+        Param: depois: tuple -> versão lida depois da gravação
+
+        return None
+        """
+        with self.__lock:
+            if self.__versao != antes:
+                self.__limpar()
+            for ident in ids:
+                self.__remover(_como_id(ident))
+            self.__versao = depois
+
+    def limpar(self) -> None:
+        with self.__lock:
+            self.__limpar()
+            self.__versao = None
+
+    def __conferir_versao(self, versao: tuple) -> None:
+        if versao != self.__versao:
+            self.__limpar()
+            self.__versao = versao
+
+    def __limpar(self) -> None:
+        self.__linhas.clear()
+        for indice in self.__indices.values():
+            indice.clear()
+
+    def __remover(self, ident: int | None) -> None:
+        linha: tuple | None = self.__linhas.pop(ident, None)
+        if linha is None:
+            return
+        for coluna, posicao in self.__colunas.items():
+            if self.__indices[coluna].get(linha[posicao]) == ident:
+                del self.__indices[coluna][linha[posicao]]
+
+
+def _como_id(valor: object) -> int | None:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
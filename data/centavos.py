@@ -0,0 +1,69 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+from typing import Callable, NamedTuple
+
+from ativos.dinheiro import de_centavos, para_centavos
+
+# posições das colunas de dinheiro nas linhas de cada tabela de ativos
+COLUNAS_DINHEIRO: dict = {'RV': (5, 6, 7), 'RF': (5,)}
+
+
+class Moeda(NamedTuple):
+    """
+    Conversão entre os valores das operações e o que fica gravado.
+
+    centavos: True se o banco guarda dinheiro em centavos (INTEGER)
+    para_banco: valor em reais -> valor gravado
+    do_banco: valor gravado -> valor em reais (float ou Decimal)
+    """
+    centavos: bool
+    para_banco: Callable
+    do_banco: Callable
+
+
+REAIS: Moeda = Moeda(False, float, float)
+CENTAVOS: Moeda = Moeda(True, para_centavos, de_centavos)
+
+
+def usa_centavos(conn: sq.Connection) -> bool:
+    """
+    O modo é do próprio arquivo: vale o tipo declarado de RV.PT.
+
+    Param: conn: sqlite3.Connection
+
+    return bool
+    """
+    for _, nome, tipo, *_ in conn.execute('PRAGMA table_info("RV")'):
+        if nome == 'PT':
+            return tipo.upper() == 'INTEGER'
+    return False
+
+
+def converter_linha(moeda: Moeda, tabela: str, linha: tuple) -> tuple:
+    """
+    Param: moeda: Moeda
+    Param: tabela: str -> RV | RF
+    Param: linha: tuple -> linha completa da tabela
+
+    return tuple -> a mesma linha com os valores em reais
+    """
+    if not moeda.centavos:
+        return linha
+    linha = list(linha)
+    for posicao in COLUNAS_DINHEIRO[tabela]:
+        linha[posicao] = moeda.do_banco(linha[posicao])
+    return tuple(linha)
@@ -0,0 +1,339 @@
+import atexit
+import os
+import sqlite3 as sq
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from .cache import CAPACIDADE_PADRAO, CachePosicoes
+from .centavos import CENTAVOS, REAIS, Moeda
+from .esquema import COLUNAS_UNICAS, aplicar_esquema
+from .eventos import BarramentoEventos
+from .perfis import PERFIL_LOTE, PERFIL_PADRAO, PerfilDesempenho, aplicar_perfil, obter_perfil
+
+CAMINHO_PADRAO: str = 'data/data.db'
+
+# transações confirmadas por arquivo, somadas entre todos os gerenciadores
+# do processo (ver GerenciadorConexao.gravacoes)
+_gravacoes: dict[str, int] = {}
+_lock_gravacoes = threading.Lock()
+
+
+class GerenciadorConexao:
+    """
+    Mantém uma conexão com o banco por thread e a reaproveita entre
+    todos os repositórios que compartilham o gerenciador. Cada conexão
+    aberta recebe os ajustes do perfil de desempenho (ver data.perfis).
+    Também guarda o cache de posições de cada tabela (ver data.cache)
+    e o barramento de eventos dos repositórios (ver data.eventos).
+
+    Com centavos=True um banco novo guarda dinheiro em centavos
+    (INTEGER) e um banco existente em REAL é migrado no primeiro uso.
+    """
+    def __init__(self,
+                 caminho: str = CAMINHO_PADRAO,
+                 perfil: str | PerfilDesempenho = PERFIL_PADRAO,
+                 capacidade_cache: int = CAPACIDADE_PADRAO,
+                 centavos: bool = False) -> None:
+        self.__caminho: str = caminho
+        self.__centavos: bool = centavos
+        self.__moeda: Moeda = REAIS
+        self.__perfil: PerfilDesempenho = obter_perfil(perfil)
+        self.__capacidade_cache: int = capacidade_cache
+        self.__caches: dict[str, CachePosicoes] = {}
+        self.__descartes: int = 0
+        self.__arquivo: str = os.path.realpath(caminho)
+        self.__eventos: BarramentoEventos = BarramentoEventos()
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__conexoes: list[sq.Connection] = []
+        self.__esquema_aplicado: bool = False
+
+    @property
+    def caminho(self) -> str:
+        return self.__caminho
+
+    @property
+    def perfil(self) -> PerfilDesempenho:
+        return self.__perfil
+
+    @property
+    def moeda(self) -> Moeda:
+        """
+        Como o banco guarda dinheiro (ver data.centavos). Aplica o
+        esquema, se ainda não foi aplicado, para conhecer o modo.
+        """
+        if not self.__esquema_aplicado:
+            self.obter()
+        return self.__moeda
+
+    @property
+    def eventos(self) -> BarramentoEventos:
+        return self.__eventos
+
+    def publicar(self, evento: tuple) -> None:
+        """
+        Publica o evento no barramento. Dentro de transacao() os eventos
+        ficam retidos até o commit do bloco mais externo e são
+        descartados junto com o que for desfeito.
+
+        Param: evento: tuple
+
+        return None
+        """
+        if self.em_transacao:
+            self.__local.pendentes.append(evento)
+        else:
+            self.__eventos.publicar(evento)
+
+    def cache_posicoes(self, tabela: str) -> CachePosicoes:
+        """
+        Param: tabela: str -> RV | RF
+
+        return CachePosicoes
+        """
+        with self.__lock:
+            cache: CachePosicoes | None = self.__caches.get(tabela)
+            if cache is None:
+                cache = CachePosicoes(COLUNAS_UNICAS[tabela], self.__capacidade_cache)
+                self.__caches[tabela] = cache
+        return cache
+
+    @property
+    def descartes(self) -> int:
+        """
+        Quantas vezes descartar_caches foi chamado. Entra na versão do
+        banco dos repositórios (ver _MetodosSqlBase._versao_banco), o
+        que invalida também o que eles guardam por conta própria, como
+        o resumo da carteira.
+        """
+        return self.__descartes
+
+    @property
+    def gravacoes(self) -> int:
+        """
+        Quantas transações já foram confirmadas neste arquivo pelo
+        processo, em qualquer thread e gerenciador. Com ele a versão do
+        banco de uma conexão muda quando outra conexão do processo grava,
+        sem consultar o SQLite.
+        """
+        return _gravacoes.get(self.__arquivo, 0)
+
+    def data_version(self) -> int:
+        """
+        PRAGMA data_version da conexão desta thread, lido quando ela é
+        aberta e no início de cada transacao(), e não a cada consulta:
+        o que outros processos gravarem fica visível para os caches na
+        próxima transação desta thread.
+
+        return int
+        """
+        self.obter()
+        return self.__local.data_version
+
+    def confirmar(self, conn: sq.Connection) -> None:
+        """
+        Commit de uma gravação feita fora de transacao(); conta em
+        gravacoes como as transações.
+
+        Param: conn: sqlite3.Connection
+
+        return None
+        """
+        conn.commit()
+        self.__contar_gravacao()
+
+    def __contar_gravacao(self) -> None:
+        with _lock_gravacoes:
+            _gravacoes[self.__arquivo] = _gravacoes.get(self.__arquivo, 0) + 1
+
+    def __ler_data_version(self, conn: sq.Connection) -> None:
+        self.__local.data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def descartar_caches(self) -> None:
+        """
+        Esvazia os caches de posições e muda a versão do banco vista
+        pelos repositórios. Chamado quando uma transação é desfeita, já
+        que o rollback não muda total_changes nem data_version.
+
+        return None
+        """
+        with self.__lock:
+            self.__descartes += 1
+            caches: list = list(self.__caches.values())
+        for cache in caches:
+            cache.limpar()
+
+    def obter(self) -> sq.Connection:
+        """
+        Retorna a conexão da thread atual, abrindo-a no primeiro uso.
+
+        return sqlite3.Connection
+        """
+        conn: sq.Connection | None = getattr(self.__local, 'conn', None)
+        if conn is None:
+            with self.__lock:
+                if not self.__esquema_aplicado:
+                    self.__aplicar_esquema()
+                conn = sq.connect(self.__caminho, check_same_thread=False)
+                aplicar_perfil(conn, self.__perfil)
+                self.__conexoes.append(conn)
+            self.__local.conn = conn
+            self.__ler_data_version(conn)
+        return conn
+
+    @property
+    def em_transacao(self) -> bool:
+        """
+        True dentro de um bloco transacao() nesta thread.
+        """
+        return getattr(self.__local, 'transacoes', 0) > 0
+
+    @contextmanager
+    def transacao(self) -> Iterator[sq.Connection]:
+        """
+        Unidade de trabalho na conexão desta thread. O bloco mais externo
+        abre a transação (BEGIN IMMEDIATE) e faz um único commit no fim;
+        blocos internos viram SAVEPOINTs, então um erro dentro deles
+        desfaz só o que foi feito ali. Com exceção no bloco externo, tudo
+        é desfeito. Se a conexão já estiver em uma transação aberta fora
+        deste método, o bloco vira um SAVEPOINT e o commit fica com quem
+        a abriu.
+
+            with gerenciador.transacao():
+                rep_rv.comprar('1', 10, 20.0)
+                rep_rv.vender('2', 5, 30.0)
+
+        return sqlite3.Connection
+        """
+        conn: sq.Connection = self.obter()
+        profundidade: int = getattr(self.__local, 'transacoes', 0)
+        externa: bool = not conn.in_transaction
+        ponto: str = f'pyinvest_{profundidade}'
+        conn.execute('BEGIN IMMEDIATE' if externa else f'SAVEPOINT {ponto}')
+        if externa:
+            self.__ler_data_version(conn)
+        if profundidade == 0:
+            self.__local.pendentes = []
+        pendentes: list = self.__local.pendentes
+        marca: int = len(pendentes)
+        self.__local.transacoes = profundidade + 1
+        try:
+            yield conn
+        except BaseException:
+            if externa:
+                conn.rollback()
+            elif conn.in_transaction:
+                conn.execute(f'ROLLBACK TO {ponto}')
+                conn.execute(f'RELEASE {ponto}')
+            self.descartar_caches()
+            del pendentes[marca:]
+            raise
+        else:
+            if externa:
+                self.confirmar(conn)
+            else:
+                conn.execute(f'RELEASE {ponto}')
+        finally:
+            self.__local.transacoes = profundidade
+        if profundidade == 0:
+            self.__local.pendentes = []
+            for evento in pendentes:
+                self.__eventos.publicar(evento)
+
+    @contextmanager
+    def modo_lote(self) -> Iterator[sq.Connection]:
+        """
+        Relaxa a durabilidade da conexão desta thread enquanto durar o
+        bloco (synchronous=OFF e cache maior), para importações grandes.
+        Se o processo cair o banco continua íntegro; uma queda do sistema
+        operacional pode perder ou corromper o que foi gravado no bloco,
+        então use só com dados que possam ser importados de novo.
+
+        Como em `with conn:`, a transação pendente é confirmada ao sair do
+        bloco, ou desfeita se houver exceção. Blocos aninhados mantêm o
+        modo até o mais externo terminar.
+
+        return sqlite3.Connection
+        """
+        conn: sq.Connection = self.obter()
+        profundidade: int = getattr(self.__local, 'lote', 0)
+        if profundidade == 0:
+            if conn.in_transaction:
+                raise sq.ProgrammingError('modo_lote não pode começar dentro de uma transação')
+            aplicar_perfil(conn, PERFIL_LOTE, sessao=True)
+        self.__local.lote = profundidade + 1
+        try:
+            yield conn
+        except BaseException:
+            if profundidade == 0 and conn.in_transaction:
+                conn.rollback()
+                self.descartar_caches()
+            raise
+        else:
+            if profundidade == 0 and conn.in_transaction:
+                self.confirmar(conn)
+        finally:
+            self.__local.lote = profundidade
+            if profundidade == 0:
+                aplicar_perfil(conn, self.__perfil, sessao=True)
+
+    def __aplicar_esquema(self) -> None:
+        # Usa uma conexão própria para que as migrações não contem nas
+        # alterações das conexões entregues aos repositórios.
+        conn: sq.Connection = sq.connect(self.__caminho)
+        try:
+            aplicar_perfil(conn, self.__perfil)
+            self.__moeda = CENTAVOS if aplicar_esquema(conn, self.__centavos) else REAIS
+        finally:
+            conn.close()
+        self.__esquema_aplicado = True
+
+    def fechar(self) -> None:
+        """
+        Fecha a conexão da thread atual, se existir.
+
+        return None
+        """
+        conn: sq.Connection | None = getattr(self.__local, 'conn', None)
+        if conn is not None:
+            self.__local.conn = None
+            with self.__lock:
+                self.__conexoes.remove(conn)
+            conn.close()
+            self.descartar_caches()
+
+    def fechar_todas(self) -> None:
+        """
+        Fecha as conexões de todas as threads.
+
+        return None
+        """
+        with self.__lock:
+            conexoes: list[sq.Connection] = self.__conexoes
+            self.__conexoes = []
+        for conn in conexoes:
+            conn.close()
+        self.__local = threading.local()
+        self.descartar_caches()
+
+
+_gerenciadores: dict[str, GerenciadorConexao] = {}
+_lock_gerenciadores = threading.Lock()
+
+
+def obter_gerenciador(caminho: str = CAMINHO_PADRAO) -> GerenciadorConexao:
+    """
+    Retorna o gerenciador compartilhado do banco informado.
+
+    Param: caminho: str
+
+    return GerenciadorConexao
+    """
+    with _lock_gerenciadores:
+        gerenciador: GerenciadorConexao | None = _gerenciadores.get(caminho)
+        if gerenciador is None:
+            gerenciador = GerenciadorConexao(caminho)
+            _gerenciadores[caminho] = gerenciador
+            atexit.register(gerenciador.fechar_todas)
+    return gerenciador
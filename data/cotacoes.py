@@ -0,0 +1,212 @@
+import csv
+import datetime
+import io
+import os
+from contextlib import nullcontext
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Callable, ContextManager, Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from .datas import data_iso
+from .importador import converter_numero, normalizar
+from .metodos_sql import _MetodosSqlBase
+
+# nome do campo -> cabeçalhos aceitos (já normalizados)
+COLUNAS_COTACOES: dict = {
+    'codigo': ('codigo', 'ticker', 'papel', 'ativo'),
+    'data': ('data', 'date', 'pregao', 'data do pregao'),
+    'fechamento': ('fechamento', 'preco de fechamento', 'close', 'preco', 'ultimo'),
+}
+
+DIA_ZERO: datetime.date = datetime.date(1970, 1, 1)
+
+
+class ResultadoCotacoes(NamedTuple):
+    """
+    lidas: linhas de dados lidas do arquivo
+    gravadas: cotações gravadas (novas ou substituídas)
+    invalidas: números das linhas que não puderam ser convertidas
+    """
+    lidas: int
+    gravadas: int
+    invalidas: list
+
+
+def numero_do_dia(data: datetime.date | str | int) -> int:
+    """
+    Param: data: datetime.date | str | int -> date, 'dd/mm/aaaa',
+                 'aaaa-mm-dd' ou um número já convertido
+
+    return int -> dias desde 1970-01-01, como gravado em cotacoes.data
+    """
+    if isinstance(data, int):
+        return data
+    if not isinstance(data, datetime.date):
+        data = datetime.date.fromisoformat(data_iso(data))
+    return (data - DIA_ZERO).days
+
+
+class RepositorioCotacoes(_MetodosSqlBase):
+    """
+    Histórico diário de preços de fechamento por código de negociação.
+    A tabela é WITHOUT ROWID com chave (codigo, data): as cotações de um
+    código ficam juntas e em ordem no arquivo, e uma leitura por
+    intervalo é uma varredura contínua da chave primária. Os intervalos
+    são devolvidos como arrays do NumPy.
+    """
+    def gravar(self, linhas: Iterable[tuple], tamanho_lote: int = 50000) -> int:
+        """
+        Grava as cotações em lotes de executemany, todos na mesma
+        transação. Uma cotação já gravada para o mesmo dia é substituída.
+
+        Param: linhas: Iterable -> (codigo, data, fechamento) ; data como em numero_do_dia
+        Param: tamanho_lote: int
+
+        return int -> cotações gravadas
+        """
+        acao: str = "INSERT INTO cotacoes (codigo, data, fechamento) VALUES (?, ?, ?) " \
+                    "ON CONFLICT (codigo, data) DO UPDATE SET fechamento = excluded.fechamento"
+        para_banco = self._moeda.para_banco
+        linhas = ((codigo.upper(), numero_do_dia(data), para_banco(fechamento))
+                  for codigo, data, fechamento in linhas)
+        total: int = 0
+        with self._gerenciador.transacao() as conn:
+            while lote := list(islice(linhas, tamanho_lote)):
+                conn.executemany(acao, lote)
+                total += len(lote)
+        return total
+
+    def carregar_csv(self,
+                     caminho: str,
+                     tamanho_lote: int = 50000,
+                     progresso: Callable[[int, float], None] | None = None,
+                     encoding: str = 'utf-8-sig') -> ResultadoCotacoes:
+        """
+        Carrega um CSV com as colunas código, data e fechamento (os
+        cabeçalhos aceitos estão em COLUNAS_COTACOES; separador ',' ou
+        ';'). O arquivo é lido e gravado em lotes, sem ser carregado
+        inteiro na memória, no modo_lote do gerenciador. Um cabeçalho sem
+        uma das três colunas levanta ValueError.
+
+        Param: caminho: str
+        Param: tamanho_lote: int
+        Param: progresso: função chamada após cada lote com o número de
+                          linhas lidas e a fração do arquivo já lida (0 a 1)
+        Param: encoding: str
+
+        return ResultadoCotacoes
+        """
+        tamanho_arquivo: int = os.path.getsize(caminho) or 1
+        lidas: int = 0
+        gravadas: int = 0
+        invalidas: list = []
+
+        with open(caminho, 'rb') as binario, self.__modo_lote():
+            linhas = _ler_cotacoes(io.TextIOWrapper(binario, encoding=encoding, newline=''))
+            while lote := list(islice(linhas, tamanho_lote)):
+                lidas += len(lote)
+                # as mesmas datas se repetem para cada código do lote
+                dias: dict = {}
+                validas: list = []
+                for numero, codigo, data, fechamento in lote:
+                    try:
+                        if not codigo:
+                            raise ValueError('Código não informado')
+                        dia: int | None = dias.get(data)
+                        if dia is None:
+                            dia = dias[data] = numero_do_dia(data)
+                        validas.append((codigo, dia, converter_numero(fechamento)))
+                    except ValueError:
+                        invalidas.append(numero)
+                gravadas += self.gravar(validas, tamanho_lote)
+                if progresso is not None:
+                    progresso(lidas, min(binario.tell() / tamanho_arquivo, 1.0))
+
+        return ResultadoCotacoes(lidas, gravadas, invalidas)
+
+    def serie(self,
+              codigo: str,
+              inicio: datetime.date | str | None = None,
+              fim: datetime.date | str | None = None) -> tuple:
+        """
+        Cotações de um código no intervalo (inclusive), em ordem de data.
+
+        Param: codigo: str
+        Param: inicio: datetime.date | str -> desde a primeira, se omitida
+        Param: fim: datetime.date | str -> até a última, se omitida
+
+        return tuple -> (datas datetime64[D], fechamentos float64)
+        """
+        de: int = numero_do_dia(inicio) if inicio is not None else np.iinfo(np.int64).min
+        ate: int = numero_do_dia(fim) if fim is not None else np.iinfo(np.int64).max
+        acao: str = "SELECT data, fechamento FROM cotacoes WHERE codigo = ? AND data BETWEEN ? AND ? ORDER BY data"
+        cursor = self._conn.execute(acao, (codigo.upper(), de, ate))
+        # as linhas vão direto para o array, sem a lista intermediária de tuplas
+        tabela: np.ndarray = np.fromiter(chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 2)
+        precos: np.ndarray = tabela[:, 1] / 100 if self._moeda.centavos else tabela[:, 1]
+        return tabela[:, 0].astype(np.int64).astype('datetime64[D]'), precos
+
+    def series(self,
+               codigos: Iterable[str],
+               inicio: datetime.date | str | None = None,
+               fim: datetime.date | str | None = None) -> dict:
+        """
+        Param: codigos: Iterable[str]
+        Param: inicio, fim: os mesmos de serie
+
+        return dict -> {codigo: (datas, fechamentos)}; códigos sem
+                       cotação no intervalo vêm com arrays vazios
+        """
+        return {codigo: self.serie(codigo, inicio, fim) for codigo in codigos}
+
+    def codigos(self) -> list:
+        """
+        return list -> códigos com alguma cotação gravada, em ordem alfabética
+        """
+        # percorre a chave primária saltando de um código para o próximo
+        codigos: list = []
+        acao: str = "SELECT codigo FROM cotacoes WHERE codigo > ? ORDER BY codigo LIMIT 1"
+        linha: tuple | None = self._conn.execute(acao, ('',)).fetchone()
+        while linha is not None:
+            codigos.append(linha[0])
+            linha = self._conn.execute(acao, (linha[0],)).fetchone()
+        return codigos
+
+    def __modo_lote(self) -> ContextManager:
+        # dentro de uma transação aberta por quem chamou o modo não pode
+        # ser trocado; os lotes entram nessa transação
+        if self._conn.in_transaction:
+            return nullcontext()
+        return self._gerenciador.modo_lote()
+
+
+def _ler_cotacoes(arquivo: io.TextIOBase) -> Iterator[tuple]:
+    """
+    Param: arquivo: arquivo texto aberto com newline=''
+
+    return Iterator[tuple] -> (número da linha, código, data, fechamento);
+                              campos que faltam na linha vêm como ''
+    """
+    cabecalho: str = arquivo.readline()
+    delimitador: str = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+    campos: dict = {}
+    for posicao, nome in enumerate(next(csv.reader([cabecalho], delimiter=delimitador))):
+        for campo, aceitos in COLUNAS_COTACOES.items():
+            if normalizar(nome) in aceitos and campo not in campos:
+                campos[campo] = posicao
+    ausentes: list = [campo for campo in COLUNAS_COTACOES if campo not in campos]
+    if ausentes:
+        raise ValueError(f'Colunas ausentes no arquivo de cotações: {", ".join(ausentes)}')
+
+    largura: int = max(campos.values()) + 1
+    campos_da_linha = itemgetter(*(campos[campo] for campo in COLUNAS_COTACOES))
+    leitor = csv.reader(arquivo, delimiter=delimitador)
+    for linha in leitor:
+        if not any(linha):
+            continue
+        if len(linha) < largura:
+            linha += [''] * (largura - len(linha))
+        codigo, data, fechamento = campos_da_linha(linha)
+        yield leitor.line_num + 1, codigo.strip(), data.strip(), fechamento.strip()
@@ -14,7 +14,8 @@ except Exception as error:
     print(f'{error}')
 
 
-import sqlite3 as sq
+import datetime
+from typing import Iterable, Iterator
 
 from ativos.acoes import Acao
 from ativos.fiis import Fiis
@@ -22,7 +23,10 @@ from ativos.renda_fixa import RendaFixa
 from ativos.reserva_emergencia import ReservaEmergencia
 from ativos.tesouro_direto import TesouroDireto
 
-from .metodos_sql import MetodosSqlRF, MetodosSqlRV
+from .metodos_sql import CATEGORIAS_RF, CATEGORIAS_RV, ORDENACOES_RF, ORDENACOES_RV
+from .metodos_sql import MetodosSqlRF, MetodosSqlRV, ResultadoLote
+from .movimentacoes import apurar_custo_medio
+from .rendimentos import gravar_indices, marcar_renda_fixa
 
 
 class RepositorioRendaVariavel(MetodosSqlRV):
@@ -33,26 +37,66 @@ class RepositorioRendaVariavel(MetodosSqlRV):
         return None
         """
         self.acao_sql_cadastrar_ativo(ativo)
+
+    def cadastrar_ativos_em_lote(self, ativos: Iterable[Acao | Fiis]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> Acao | Fiis
+
+        return ResultadoLote -> ids atribuídos e posições em conflito
+        """
+        return self.acao_sql_cadastrar_ativos_em_lote(ativos)
+
+    def movimentar_em_lote(self, linhas: Iterable[tuple]) -> int:
+        """
+        Compras, vendas e ajustes em sequência, gravados juntos: ou
+        todos entram ou nenhum entra.
+
+        Param: linhas: Iterable -> (id, tipo, qtde, pu, data) em ordem
+                       cronológica ; tipo compra | venda | ajuste e data
+                       ISO 8601 (None para agora)
+
+        return int -> movimentações gravadas
+        """
+        return self.acao_sql_movimentacoes_em_lote(linhas)
     
-    def comprar(self, id: str, qtde: int, pu: float) -> None:
+    def comprar(self, id: str, qtde: int, pu: float, data: str | None = None) -> None:
         """
         Param: id: str
         Param: qtde: int
         Param: pu: float
+        Param: data: str -> ISO 8601; agora, se omitida
         
         return None
         """      
-        self.acao_aql_comprar_ativo(id, qtde, pu)
+        self.acao_aql_comprar_ativo(id, qtde, pu, data)
             
-    def vender(self, id: str, qtde: int, pu: float) -> None:
+    def vender(self, id: str, qtde: int, pu: float, data: str | None = None) -> None:
         """
         Param: id: str
         Param: qtde: int
         Param: pu: float
+        Param: data: str -> ISO 8601; agora, se omitida
         
         return None
         """
-        self.acao_sql_vender(id, qtde, pu)
+        self.acao_sql_vender(id, qtde, pu, data)
+
+    def historico(self, id: str) -> list:
+        """
+        Param: id: str
+
+        return list -> [(id, tipo, quantidade, preço unitário, data), ...]
+        """
+        return self._acao_sql_historico('RV', id)
+
+    def custo_medio(self) -> dict:
+        """
+        Preço médio ponderado e lucro realizado de toda a carteira,
+        recalculados a partir do histórico de movimentações.
+
+        return dict -> {id: (quantidade, PM, PT, lucro realizado)}
+        """
+        return apurar_custo_medio(self._conn)
       
     def deletar(self, id: str) -> None:
         """
@@ -75,6 +119,9 @@ class RepositorioRendaVariavel(MetodosSqlRV):
 
     def acertar_valor_quantidade(self, id: str, qtde: int, pu: float) -> int | None:
         """
+        A posição passa a ser qtde ao preço pu: PU e PM ficam iguais a
+        pu e PT a qtde * pu.
+
         Param: id: str
         Param: qtde: int
         Param: pu: float
@@ -83,37 +130,100 @@ class RepositorioRendaVariavel(MetodosSqlRV):
         """
         self.acao_sql_acertar_valor_qtde(id, qtde, pu)
     
-    def relatorio_acoes(self) -> float:
-        acao: str = "SELECT * FROM RV"
-        self._cursor.execute(acao)
-        tot: int | float = 0
+    def resumo_carteira(self) -> dict:
+        """
+        Total investido em cada categoria de renda variável e o total
+        geral na chave 'Total', lidos de totais_categoria.
 
-        for item in self._cursor.fetchall():
-            if item[3] == 'Ações':
-                tot += float(item[7])
+        return dict
+        """
+        return self._acao_sql_resumo('RV', CATEGORIAS_RV)
 
-        return tot
+    def relatorio_acoes(self) -> float:
+        return self.resumo_carteira()['Ações']
     
     def relatorio_fiis(self) -> float:
-        acao: str = "SELECT * FROM RV"
-        self._cursor.execute(acao)
-        tot: int | float = 0
+        return self.resumo_carteira()['FIIs']
+
+    def relatorio(self,
+                  apos_id: int | tuple = 0,
+                  limite: int | None = None,
+                  ordem: str = 'id',
+                  tamanho_bloco: int = 500) -> Iterator[tuple]:
+        """
+        Gerador com as linhas da tabela, lidas em blocos paginados por
+        chave. As linhas vêm sem formatação; use formatar_linha apenas
+        nas que forem exibidas.
 
-        for item in self._cursor.fetchall():
-            if item[3] == 'FIIs':
-                tot += float(item[7])
+        Param: apos_id: int | tuple -> id da última linha já lida (0 para
+                        começar) ou, de preferência, o seu cursor_relatorio
+        Param: limite: int -> None para todas
+        Param: ordem: str -> id, nome, codigo, categoria ou PT; '-' na frente para decrescente
+        Param: tamanho_bloco: int
 
-        return tot
+        return Iterator[tuple]
+        """
+        return self._acao_sql_relatorio('RV', ORDENACOES_RV, apos_id, limite, ordem, tamanho_bloco)
+
+    def cursor_relatorio(self, linha: tuple, ordem: str = 'id') -> tuple:
+        """
+        Posição de relatorio logo depois de `linha`, que continua válida
+        mesmo que a linha seja apagada.
+
+        Param: linha: tuple -> linha de relatorio
+        Param: ordem: str -> a mesma usada em relatorio
+
+        return tuple -> (valor da coluna de ordem, id), para apos_id
+        """
+        return self._acao_sql_cursor_relatorio('RV', ORDENACOES_RV, linha, ordem)
 
     def relatorio_for_tkinter(self) -> list:
-        acao: str = "SELECT * FROM RV"
-        self._cursor.execute(acao)
-        rep: list = []
+        return [self.formatar_linha(i) for i in self.relatorio()]
+
+    def relatorio_pagina(self, apos_id: int | tuple = 0, limite: int = 200, ordem: str = 'id') -> list:
+        """
+        Uma página do relatório, já formatada, paginada por chave: o
+        custo não depende de quantas páginas já foram lidas.
+
+        Param: apos_id: int | tuple -> cursor_relatorio da última linha da
+                        página anterior, ou o seu id (0 na primeira)
+        Param: limite: int
+        Param: ordem: str -> a mesma de relatorio
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        return [self.formatar_linha(i) for i in self.relatorio(apos_id, limite, ordem, limite)]
+
+    def relatorio_por_ids(self, ids: Iterable[int]) -> list:
+        """
+        Linhas do relatório apenas dos ids informados, para atualizar a
+        lista depois de uma operação sem relê-la inteira. Ids que não
+        existem mais simplesmente não aparecem no resultado.
+
+        Param: ids: Iterable[int]
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        ids = [int(id) for id in ids]
+        marcadores: str = ', '.join('?' * len(ids))
+        acao: str = f"SELECT * FROM RV WHERE id IN ({marcadores}) ORDER BY id"
+        self._cursor.execute(acao, ids)
+        return [self.formatar_linha(i) for i in self._linhas_do_banco('RV', self._cursor.fetchall())]
+
+    def buscar(self, termo: str, limite: int = 50) -> list:
+        """
+        Ativos cujo nome ou código contém o termo, sem diferenciar maiúsculas.
 
-        for i in self._cursor.fetchall():
-            res: list = [i[0], i[1], i[2], i[3], i[4], f'R$ {i[5]:.2f}', f'R$ {i[6]:.2f}', f'R$ {i[7]:.2f}']
-            rep.append(res)
-        return rep
+        Param: termo: str
+        Param: limite: int
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        return [self.formatar_linha(i) for i in self._acao_sql_buscar('RV', termo, limite)]
+
+    @staticmethod
+    def formatar_linha(i: tuple) -> list:
+        return [i[0], i[1], i[2], i[3], i[4], f'R$ {i[5]:.2f}', f'R$ {i[6]:.2f}', f'R$ {i[7]:.2f}']
 
 
 class RepositorioRendaFixa(MetodosSqlRF):      
@@ -124,32 +234,66 @@ class RepositorioRendaFixa(MetodosSqlRF):
         return None
         """        
         self.acao_sql_insert(ativo)
+
+    def cadastrar_ativos_em_lote(self,
+                                 ativos: Iterable[RendaFixa | TesouroDireto | ReservaEmergencia]) -> ResultadoLote:
+        """
+        Param: ativos: Iterable -> RendaFixa | TesouroDireto | ReservaEmergencia
+
+        return ResultadoLote -> ids atribuídos e posições em conflito
+        """
+        return self.acao_sql_insert_em_lote(ativos)
+
+    def movimentar_em_lote(self, linhas: Iterable[tuple]) -> int:
+        """
+        Aplicações, resgates e ajustes em sequência, gravados juntos: ou
+        todos entram ou nenhum entra.
+
+        Param: linhas: Iterable -> (id, tipo, qtde, valor, data) em ordem
+                       cronológica ; tipo compra | resgate | ajuste e data
+                       ISO 8601 (None para agora)
+
+        return int -> movimentações gravadas
+        """
+        return self.acao_sql_movimentacoes_em_lote(linhas)
     
     def comprar(self,
                 ativo: RendaFixa | TesouroDireto | ReservaEmergencia,
                 qtde: int,
-                valor: float) -> None:
+                valor: float,
+                data: str | None = None) -> None:
         """
         Param: ativo: Object -> RendaFixa | TesouroDireto | ReservaEmergencia
         Param: qtde: int
         Param: valor: float
+        Param: data: str -> ISO 8601; agora, se omitida
                 
         return None
         """
-        self.acao_sql_comprar(ativo, qtde, valor)
+        self.acao_sql_comprar(ativo, qtde, valor, data)
     
     def resgatar(self,
                  ativo: RendaFixa | TesouroDireto | ReservaEmergencia,
                  qtde: int,
-                 valor: float) -> None:
+                 valor: float,
+                 data: str | None = None) -> None:
         """
         Param: ativo: Object -> RendaFixa | TesouroDireto | ReservaEmergencia
         Param: qtde: int
         Param: valor: float
+        Param: data: str -> ISO 8601; agora, se omitida
         
         return None
         """
-        self.acao_sql_alterar_saldo_apos_resgate(ativo, qtde, valor)
+        self.acao_sql_alterar_saldo_apos_resgate(ativo, qtde, valor, data)
+
+    def historico(self, id: str) -> list:
+        """
+        Param: id: str
+
+        return list -> [(id, tipo, quantidade, valor, data), ...]
+        """
+        return self._acao_sql_historico('RF', id)
         
     def alterar_dados_ativo(self,
                              id: str,
@@ -195,45 +339,138 @@ class RepositorioRendaFixa(MetodosSqlRF):
         """
         self.acao_sql_deletar_ativo(ativo)
     
-    def relatorio_res_emerg(self) -> float:
-        acao: str = "SELECT * FROM RF"
-        self._cursor.execute(acao)
-        tot: int | float = 0
+    def valor_atual(self, ate: datetime.date | str | None = None) -> dict:
+        """
+        Valor bruto de cada ativo na data, com o rendimento acumulado
+        desde cada aplicação segundo a rentabilidade cadastrada e as
+        séries gravadas com atualizar_indice. Calculado para a carteira
+        inteira em uma única passada vetorizada.
 
-        for item in self._cursor.fetchall():
-            if item[3] == 'Reserva de Emergência':
-                tot += float(item[5])
+        Param: ate: datetime.date | str -> hoje, se omitida
+
+        return dict -> {id: valor bruto}
+        """
+        return marcar_renda_fixa(self._conn, ate)
 
-        return tot
+    def atualizar_indice(self, indice: str, linhas: Iterable[tuple]) -> int:
+        """
+        Param: indice: str -> CDI | SELIC | IPCA
+        Param: linhas: Iterable -> (data, taxa do dia como fração)
+
+        return int -> dias gravados
+        """
+        with self.transacao():
+            return gravar_indices(self._conn, indice, linhas)
+
+    def resumo_carteira(self) -> dict:
+        """
+        Total aplicado em cada categoria de renda fixa e o total
+        geral na chave 'Total', lidos de totais_categoria.
+
+        return dict
+        """
+        return self._acao_sql_resumo('RF', CATEGORIAS_RF)
+
+    def relatorio_res_emerg(self) -> float:
+        return self.resumo_carteira()['Reserva de Emergência']
     
     def relatorio_tesouro_direto(self) -> float:
-        acao: str = "SELECT * FROM RF"
-        self._cursor.execute(acao)
-        tot: int | float = 0
-
-        for item in self._cursor.fetchall():
-            if item[3] == 'Tesouro Direto':
-                tot += float(item[5])
-        
-        return tot
+        return self.resumo_carteira()['Tesouro Direto']
 
     def relatorio_renda_fixa(self) -> float:
-        acao: str = "SELECT * FROM RF"
-        self._cursor.execute(acao)
-        tot: int | float = 0
+        return self.resumo_carteira()['Renda Fixa']
 
-        for item in self._cursor.fetchall():
-            if item[3] == 'Renda Fixa':
-                tot += float(item[5])
-        
-        return tot
+    def relatorio(self,
+                  apos_id: int | tuple = 0,
+                  limite: int | None = None,
+                  ordem: str = 'id',
+                  tamanho_bloco: int = 500) -> Iterator[tuple]:
+        """
+        Gerador com as linhas da tabela, lidas em blocos paginados por
+        chave. As linhas vêm sem formatação; use formatar_linha apenas
+        nas que forem exibidas.
+
+        Param: apos_id: int | tuple -> id da última linha já lida (0 para
+                        começar) ou, de preferência, o seu cursor_relatorio
+        Param: limite: int -> None para todas
+        Param: ordem: str -> id, nome, categoria, valor_aplicado, multiplicador ou spread
+                             (rentabilidade); '-' na frente para decrescente
+        Param: tamanho_bloco: int
+
+        return Iterator[tuple]
+        """
+        return self._acao_sql_relatorio('RF', ORDENACOES_RF, apos_id, limite, ordem, tamanho_bloco)
+
+    def cursor_relatorio(self, linha: tuple, ordem: str = 'id') -> tuple:
+        """
+        Posição de relatorio logo depois de `linha`, que continua válida
+        mesmo que a linha seja apagada.
+
+        Param: linha: tuple -> linha de relatorio
+        Param: ordem: str -> a mesma usada em relatorio
+
+        return tuple -> (valor da coluna de ordem, id), para apos_id
+        """
+        return self._acao_sql_cursor_relatorio('RF', ORDENACOES_RF, linha, ordem)
 
     def relatorio_for_tkinter(self) -> list:
-        acao: str = "SELECT * FROM RF"
-        self._cursor.execute(acao)
-        rep: list = []
-
-        for i in self._cursor.fetchall():
-            res: list = [i[0], i[1], i[2], i[3], i[4], f'R$ {i[5]:.2f}', i[6], i[7]]
-            rep.append(res)
-        return rep
+        return [self.formatar_linha(i) for i in self.relatorio()]
+
+    def relatorio_pagina(self, apos_id: int | tuple = 0, limite: int = 200, ordem: str = 'id') -> list:
+        """
+        Uma página do relatório, já formatada, paginada por chave: o
+        custo não depende de quantas páginas já foram lidas.
+
+        Param: apos_id: int | tuple -> cursor_relatorio da última linha da
+                        página anterior, ou o seu id (0 na primeira)
+        Param: limite: int
+        Param: ordem: str -> a mesma de relatorio
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        return [self.formatar_linha(i) for i in self.relatorio(apos_id, limite, ordem, limite)]
+
+    def relatorio_por_ids(self, ids: Iterable[int]) -> list:
+        """
+        Linhas do relatório apenas dos ids informados, para atualizar a
+        lista depois de uma operação sem relê-la inteira. Ids que não
+        existem mais simplesmente não aparecem no resultado.
+
+        Param: ids: Iterable[int]
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        ids = [int(id) for id in ids]
+        marcadores: str = ', '.join('?' * len(ids))
+        acao: str = f"SELECT * FROM RF WHERE id IN ({marcadores}) ORDER BY id"
+        self._cursor.execute(acao, ids)
+        return [self.formatar_linha(i) for i in self._linhas_do_banco('RF', self._cursor.fetchall())]
+
+    def vencimentos_entre(self, inicio: datetime.date | str, fim: datetime.date | str) -> list:
+        """
+        Ativos que vencem entre as duas datas (inclusive), do vencimento
+        mais próximo ao mais distante. A consulta usa o índice de
+        datas_rf e não lê os ativos fora do intervalo; ativos cujo
+        vencimento não é uma data não aparecem.
+
+        Param: inicio: datetime.date | str -> date, 'dd/mm/aaaa' ou 'aaaa-mm-dd'
+        Param: fim: datetime.date | str
+
+        return list -> linhas sem formatação, como as de relatorio
+        """
+        return self.acao_sql_vencimentos_entre(inicio, fim)
+
+    def buscar(self, termo: str, limite: int = 50) -> list:
+        """
+        Ativos cujo nome contém o termo, sem diferenciar maiúsculas.
+
+        Param: termo: str
+        Param: limite: int
+
+        return list -> mesmas linhas de relatorio_for_tkinter
+        """
+        return [self.formatar_linha(i) for i in self._acao_sql_buscar('RF', termo, limite)]
+
+    @staticmethod
+    def formatar_linha(i: tuple) -> list:
+        return [i[0], i[1], i[2], i[3], i[4], f'R$ {i[5]:.2f}', i[6], i[7]]
@@ -0,0 +1,77 @@
+import datetime
+import sqlite3 as sq
+from functools import lru_cache
+
+# formatos aceitos nas colunas de texto de RF e o padrão GLOB de cada um
+PADRAO_BR: str = '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]'
+PADRAO_ISO: str = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+
+
+@lru_cache(maxsize=1024)
+def converter_data(texto: str) -> str | None:
+    """
+    Converte 'dd/mm/aaaa' (como o aplicativo grava) ou 'aaaa-mm-dd'
+    para a data ISO. Textos que não são datas, como 'Imediato', e datas
+    inexistentes (31/02) viram None. As mesmas regras são aplicadas em
+    SQL por expressao_data. As datas se repetem muito, por isso o
+    resultado é memorizado.
+
+    Param: texto: str
+
+    return str | None -> 'aaaa-mm-dd'
+    """
+    texto = texto.strip()
+    if len(texto) == 10 and texto[2] == '/' and texto[5] == '/':
+        texto = f'{texto[6:]}-{texto[3:5]}-{texto[:2]}'
+    digitos: str = texto[:4] + texto[5:7] + texto[8:]
+    if len(texto) != 10 or texto[4] != '-' or texto[7] != '-' or not (digitos.isascii() and digitos.isdigit()):
+        return None
+    try:
+        return datetime.date.fromisoformat(texto).isoformat()
+    except ValueError:
+        return None
+
+
+def data_iso(data: datetime.date | str) -> str:
+    """
+    Param: data: datetime.date | str -> date, 'dd/mm/aaaa' ou 'aaaa-mm-dd'
+
+    return str -> 'aaaa-mm-dd'
+    """
+    if isinstance(data, datetime.date):
+        return data.isoformat()
+    iso: str | None = converter_data(data)
+    if iso is None:
+        raise ValueError(f'Data inválida: {data}')
+    return iso
+
+
+def expressao_data(coluna: str) -> str:
+    """
+    Expressão SQL equivalente a converter_data aplicada à coluna, usada
+    pelos gatilhos que mantêm datas_rf em dia.
+
+    Param: coluna: str -> por exemplo NEW.vencimento
+
+    return str
+    """
+    texto: str = f"trim({coluna})"
+    iso: str = f"(CASE WHEN {texto} GLOB '{PADRAO_BR}' " \
+               f"THEN substr({texto}, 7, 4) || '-' || substr({texto}, 4, 2) || '-' || substr({texto}, 1, 2) " \
+               f"WHEN {texto} GLOB '{PADRAO_ISO}' THEN {texto} END)"
+    # a data passa por julianday, que leva 31/02 a 03/03; só vale a que volta igual
+    return f"(CASE WHEN date(julianday({iso})) = {iso} THEN {iso} END)"
+
+
+def preencher_datas_rf(conn: sq.Connection) -> None:
+    """
+    Refaz datas_rf a partir das colunas de texto de RF. Usada quando a
+    tabela é criada em um banco que já tem ativos.
+
+    Param: conn: sqlite3.Connection
+
+    return None
+    """
+    conn.execute("DELETE FROM datas_rf")
+    conn.execute("INSERT INTO datas_rf (ativo_id, vencimento, resgate) "
+                 f"SELECT id, {expressao_data('vencimento')}, {expressao_data('resgate')} FROM RF")
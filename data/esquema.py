@@ -0,0 +1,363 @@
+import sqlite3 as sq
+
+from .centavos import usa_centavos
+from .datas import expressao_data, preencher_datas_rf
+from .rendimentos import preencher_taxas_rf
+from .movimentacoes import criar_checkpoint
+from .totais import reconstruir_totais
+
+
+TABELA_RV: str = """
+CREATE TABLE IF NOT EXISTS "RV" (
+    "id"    INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE,
+    "nome"  TEXT NOT NULL UNIQUE,
+    "codigo"    TEXT NOT NULL UNIQUE,
+    "categoria" TEXT NOT NULL,
+    "quantidade"    INTEGER NOT NULL,
+    "PU"    REAL NOT NULL,
+    "PM"    REAL NOT NULL,
+    "PT"    REAL NOT NULL
+)
+"""
+
+TABELA_RF: str = """
+CREATE TABLE IF NOT EXISTS "RF" (
+    "id"    INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE,
+    "nome"  TEXT NOT NULL UNIQUE,
+    "quantidade"    INTEGER NOT NULL,
+    "categoria" TEXT NOT NULL,
+    "resgate"   TEXT NOT NULL,
+    "valor_aplicado"    REAL NOT NULL,
+    "vencimento"    TEXT NOT NULL,
+    "rentabilidade" TEXT NOT NULL,
+    "indexador" TEXT,
+    "multiplicador" FLOAT,
+    "spread"    FLOAT,
+    "base"  INTEGER
+)
+"""
+
+# rentabilidade interpretada (ver calculos.rendimento.TaxaRentabilidade),
+# acrescentada ao fim de RF em bancos criados antes dela
+COLUNAS_TAXA_RF: dict = {
+    'indexador': 'TEXT',
+    'multiplicador': 'FLOAT',
+    'spread': 'FLOAT',
+    'base': 'INTEGER',
+}
+
+TABELA_TOTAIS_CATEGORIA: str = """
+CREATE TABLE IF NOT EXISTS "totais_categoria" (
+    "tabela"    TEXT NOT NULL,
+    "categoria" TEXT NOT NULL,
+    "total" REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY ("tabela", "categoria")
+) WITHOUT ROWID
+"""
+
+TABELA_MOVIMENTACOES: str = """
+CREATE TABLE IF NOT EXISTS "movimentacoes" (
+    "id"    INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    "tabela"    TEXT NOT NULL,
+    "ativo_id"  INTEGER NOT NULL,
+    "tipo"  TEXT NOT NULL,
+    "quantidade"    INTEGER NOT NULL,
+    "valor" REAL NOT NULL,
+    "data"  TEXT NOT NULL
+)
+"""
+
+INDICE_MOVIMENTACOES_ATIVO: str = """
+CREATE INDEX IF NOT EXISTS "idx_movimentacoes_ativo" ON "movimentacoes" ("tabela", "ativo_id", "id")
+"""
+
+INDICE_MOVIMENTACOES_DATA: str = """
+CREATE INDEX IF NOT EXISTS "idx_movimentacoes_data" ON "movimentacoes" ("data")
+"""
+
+TABELA_CHECKPOINTS_POSICOES: str = """
+CREATE TABLE IF NOT EXISTS "checkpoints_posicoes" (
+    "tabela"    TEXT NOT NULL,
+    "ativo_id"  INTEGER NOT NULL,
+    "movimentacao_id"   INTEGER NOT NULL,
+    "quantidade"    INTEGER NOT NULL,
+    "PU"    REAL NOT NULL,
+    "PM"    REAL NOT NULL,
+    "valor" REAL NOT NULL,
+    PRIMARY KEY ("tabela", "ativo_id")
+) WITHOUT ROWID
+"""
+
+TABELA_DATAS_RF: str = """
+CREATE TABLE IF NOT EXISTS "datas_rf" (
+    "ativo_id"  INTEGER NOT NULL PRIMARY KEY,
+    "vencimento"    TEXT,
+    "resgate"   TEXT
+) WITHOUT ROWID
+"""
+
+INDICE_DATAS_RF_VENCIMENTO: str = """
+CREATE INDEX IF NOT EXISTS "idx_datas_rf_vencimento" ON "datas_rf" ("vencimento", "ativo_id")
+"""
+
+TABELA_INDICES_DIARIOS: str = """
+CREATE TABLE IF NOT EXISTS "indices_diarios" (
+    "indice"    TEXT NOT NULL,
+    "data"  TEXT NOT NULL,
+    "taxa"  REAL NOT NULL,
+    PRIMARY KEY ("indice", "data")
+) WITHOUT ROWID
+"""
+
+# data em dias desde 1970-01-01, o mesmo número de um datetime64[D]
+TABELA_COTACOES: str = """
+CREATE TABLE IF NOT EXISTS "cotacoes" (
+    "codigo"    TEXT NOT NULL,
+    "data"  INTEGER NOT NULL,
+    "fechamento"    REAL NOT NULL,
+    PRIMARY KEY ("codigo", "data")
+) WITHOUT ROWID
+"""
+
+INDICES_RELATORIO: tuple = (
+    'CREATE INDEX IF NOT EXISTS "idx_rv_categoria" ON "RV" ("categoria", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_rv_pt" ON "RV" ("PT", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_rf_categoria" ON "RF" ("categoria", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_rf_valor_aplicado" ON "RF" ("valor_aplicado", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_rf_multiplicador" ON "RF" ("multiplicador", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_rf_spread" ON "RF" ("spread", "id")',
+)
+
+# colunas pesquisáveis de cada tabela
+COLUNAS_BUSCA: dict = {'RV': ('nome', 'codigo'), 'RF': ('nome',)}
+
+# colunas únicas de cada tabela de ativos e sua posição na linha
+COLUNAS_UNICAS: dict = {'RV': {'nome': 1, 'codigo': 2}, 'RF': {'nome': 1}}
+
+# posição de (categoria, valor somado em totais_categoria) na linha
+COLUNAS_TOTAIS: dict = {'RV': (3, 7), 'RF': (3, 5)}
+
+
+def _gatilhos_totais(tabela: str, coluna: str) -> tuple:
+    """
+    Gatilhos que mantêm totais_categoria em dia com as gravações
+    feitas na tabela informada.
+
+    Param: tabela: str
+    Param: coluna: str
+
+    return tuple
+    """
+    somar: str = "INSERT INTO totais_categoria (tabela, categoria, total) " \
+                 f"VALUES ('{tabela}', NEW.categoria, NEW.{coluna}) " \
+                 "ON CONFLICT (tabela, categoria) DO UPDATE SET total = total + excluded.total;"
+    subtrair: str = f"UPDATE totais_categoria SET total = total - OLD.{coluna} " \
+                    f"WHERE tabela = '{tabela}' AND categoria = OLD.categoria;"
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS totais_{tabela}_insert AFTER INSERT ON {tabela} "
+        f"BEGIN {somar} END",
+        f"CREATE TRIGGER IF NOT EXISTS totais_{tabela}_update AFTER UPDATE OF {coluna}, categoria ON {tabela} "
+        f"BEGIN {subtrair} {somar} END",
+        f"CREATE TRIGGER IF NOT EXISTS totais_{tabela}_delete AFTER DELETE ON {tabela} "
+        f"BEGIN {subtrair} END",
+    )
+
+
+def _gatilhos_datas_rf() -> tuple:
+    """
+    Gatilhos que mantêm em datas_rf as datas ISO de vencimento e
+    resgate de cada ativo de RF, convertidas do texto gravado em RF
+    (NULL quando o texto não é uma data, como 'Imediato').
+
+    return tuple
+    """
+    gravar: str = "INSERT OR REPLACE INTO datas_rf (ativo_id, vencimento, resgate) " \
+                  f"VALUES (NEW.id, {expressao_data('NEW.vencimento')}, {expressao_data('NEW.resgate')});"
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS datas_rf_insert AFTER INSERT ON RF BEGIN {gravar} END",
+        f"CREATE TRIGGER IF NOT EXISTS datas_rf_update AFTER UPDATE OF vencimento, resgate ON RF "
+        f"BEGIN {gravar} END",
+        "CREATE TRIGGER IF NOT EXISTS datas_rf_delete AFTER DELETE ON RF "
+        "BEGIN DELETE FROM datas_rf WHERE ativo_id = OLD.id; END",
+    )
+
+
+def _estruturas_busca(tabela: str, colunas: tuple) -> tuple:
+    """
+    Índice FTS5 com tokenizador trigram (busca por trecho, sem
+    diferenciar maiúsculas) sobre as colunas informadas, mais os
+    gatilhos que o mantêm em dia. O índice não guarda cópia dos dados:
+    o conteúdo é lido da própria tabela.
+
+    Param: tabela: str
+    Param: colunas: tuple
+
+    return tuple
+    """
+    busca: str = f'busca_{tabela}'
+    lista: str = ', '.join(colunas)
+    inserir: str = f"INSERT INTO {busca} (rowid, {lista}) " \
+                   f"VALUES (NEW.id, {', '.join(f'NEW.{coluna}' for coluna in colunas)});"
+    remover: str = f"INSERT INTO {busca} ({busca}, rowid, {lista}) " \
+                   f"VALUES ('delete', OLD.id, {', '.join(f'OLD.{coluna}' for coluna in colunas)});"
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {busca} USING fts5({lista}, "
+        f"content='{tabela}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {busca}_insert AFTER INSERT ON {tabela} "
+        f"BEGIN {inserir} END",
+        f"CREATE TRIGGER IF NOT EXISTS {busca}_update AFTER UPDATE OF {lista} ON {tabela} "
+        f"BEGIN {remover} {inserir} END",
+        f"CREATE TRIGGER IF NOT EXISTS {busca}_delete AFTER DELETE ON {tabela} "
+        f"BEGIN {remover} END",
+    )
+
+
+# tabelas com colunas de dinheiro; no modo centavos elas são INTEGER
+TABELAS_DINHEIRO: dict = {
+    'RV': TABELA_RV,
+    'RF': TABELA_RF,
+    'totais_categoria': TABELA_TOTAIS_CATEGORIA,
+    'movimentacoes': TABELA_MOVIMENTACOES,
+    'checkpoints_posicoes': TABELA_CHECKPOINTS_POSICOES,
+    'cotacoes': TABELA_COTACOES,
+}
+
+
+def _em_centavos(tabela: str) -> str:
+    # todas as colunas REAL do esquema guardam dinheiro; as taxas de RF
+    # são FLOAT (mesma afinidade) justamente para ficar de fora
+    return tabela.replace(' REAL ', ' INTEGER ')
+
+
+def estruturas(centavos: bool = False) -> tuple:
+    """
+    Param: centavos: bool -> dinheiro em centavos (INTEGER) em vez de REAL
+
+    return tuple -> tabelas, gatilhos e índices, na ordem de criação
+    """
+    tabela = _em_centavos if centavos else str
+    return (tabela(TABELA_RV),
+            tabela(TABELA_RF),
+            tabela(TABELA_TOTAIS_CATEGORIA),
+            *_gatilhos_totais('RV', 'PT'),
+            *_gatilhos_totais('RF', 'valor_aplicado'),
+            tabela(TABELA_MOVIMENTACOES),
+            INDICE_MOVIMENTACOES_ATIVO,
+            INDICE_MOVIMENTACOES_DATA,
+            tabela(TABELA_CHECKPOINTS_POSICOES),
+            *INDICES_RELATORIO,
+            TABELA_DATAS_RF,
+            INDICE_DATAS_RF_VENCIMENTO,
+            *_gatilhos_datas_rf(),
+            TABELA_INDICES_DIARIOS,
+            tabela(TABELA_COTACOES),
+            )
+
+
+ESTRUTURAS: tuple = estruturas()
+
+
+def _existe_tabela(conn: sq.Connection, nome: str) -> bool:
+    acao: str = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
+    return conn.execute(acao, (nome,)).fetchone() is not None
+
+
+def _acrescentar_colunas_taxa(conn: sq.Connection) -> bool:
+    # True se alguma coluna foi criada agora
+    existentes: set = {nome for _, nome, *_ in conn.execute('PRAGMA table_info("RF")')}
+    novas: list = [(nome, tipo) for nome, tipo in COLUNAS_TAXA_RF.items() if nome not in existentes]
+    for nome, tipo in novas:
+        conn.execute(f'ALTER TABLE "RF" ADD COLUMN "{nome}" {tipo}')
+    return bool(novas)
+
+
+def _criar_busca(conn: sq.Connection, tabela: str, reconstruir: bool) -> None:
+    try:
+        for acao in _estruturas_busca(tabela, COLUNAS_BUSCA[tabela]):
+            conn.execute(acao)
+    except sq.OperationalError:
+        # SQLite sem FTS5 ou sem o tokenizador trigram: a busca usa LIKE
+        return
+    if reconstruir:
+        conn.execute(f"INSERT INTO busca_{tabela} (busca_{tabela}) VALUES ('rebuild')")
+
+
+def migrar_para_centavos(conn: sq.Connection) -> None:
+    """
+    Converte um banco com dinheiro em REAL para centavos (INTEGER). O
+    SQLite não muda o tipo de uma coluna, então cada tabela é recriada,
+    copiada com os valores arredondados ao centavo e renomeada; os ids
+    e as sequências de AUTOINCREMENT são preservados. Gatilhos e
+    índices, que somem com a tabela antiga, são criados de novo, o
+    índice de busca é refeito e totais_categoria é recalculado já em
+    centavos. Tudo acontece em uma única transação.
+
+    Param: conn: sqlite3.Connection -> sem transação aberta
+
+    return None
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        sequencias: dict = dict(conn.execute("SELECT name, seq FROM sqlite_sequence"))
+        for tabela, criar in TABELAS_DINHEIRO.items():
+            colunas: list = [(nome, tipo.upper()) for _, nome, tipo, *_ in conn.execute(f'PRAGMA table_info("{tabela}")')]
+            lista: str = ', '.join(f'"{nome}"' for nome, _ in colunas)
+            valores: str = ', '.join(f'CAST(ROUND("{nome}" * 100) AS INTEGER)' if tipo == 'REAL' else f'"{nome}"'
+                                     for nome, tipo in colunas)
+            conn.execute(_em_centavos(criar).replace(f'"{tabela}"', f'"{tabela}_centavos"', 1))
+            conn.execute(f'INSERT INTO "{tabela}_centavos" ({lista}) SELECT {valores} FROM "{tabela}"')
+            conn.execute(f'DROP TABLE "{tabela}"')
+            conn.execute(f'ALTER TABLE "{tabela}_centavos" RENAME TO "{tabela}"')
+            if tabela in sequencias:
+                conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                             (sequencias[tabela], tabela))
+        for acao in estruturas(centavos=True):
+            conn.execute(acao)
+        for tabela in COLUNAS_BUSCA:
+            _criar_busca(conn, tabela, reconstruir=True)
+        reconstruir_totais(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def aplicar_esquema(conn: sq.Connection, centavos: bool = False) -> bool:
+    """
+    Cria as tabelas e gatilhos do PyInvest que ainda não existirem no
+    banco. Pode ser chamada quantas vezes for necessário.
+
+    Param: conn: sqlite3.Connection
+    Param: centavos: bool -> guardar dinheiro em centavos; um banco
+                             existente em REAL é migrado
+
+    return bool -> True se o banco guarda dinheiro em centavos
+    """
+    banco_novo: bool = not _existe_tabela(conn, 'RV')
+    modo: bool = centavos if banco_novo else usa_centavos(conn)
+    totais_novos: bool = not _existe_tabela(conn, 'totais_categoria')
+    movimentacoes_novas: bool = not _existe_tabela(conn, 'movimentacoes')
+    datas_novas: bool = not _existe_tabela(conn, 'datas_rf')
+    taxas_novas: bool = _existe_tabela(conn, 'RF') and _acrescentar_colunas_taxa(conn)
+    buscas_novas: dict = {tabela: not _existe_tabela(conn, f'busca_{tabela}') for tabela in COLUNAS_BUSCA}
+    for acao in estruturas(modo):
+        conn.execute(acao)
+    for tabela in COLUNAS_BUSCA:
+        _criar_busca(conn, tabela, buscas_novas[tabela])
+    if totais_novos:
+        reconstruir_totais(conn)
+    if movimentacoes_novas:
+        # posições anteriores ao livro passam a ser o ponto de partida
+        criar_checkpoint(conn)
+    if datas_novas:
+        preencher_datas_rf(conn)
+    if taxas_novas:
+        # só na criação das colunas; textos não reconhecidos ficam sem
+        # taxa e não são relidos a cada abertura (ver o comando
+        # reconstruir-taxas da manutenção para ativos gravados por fora)
+        preencher_taxas_rf(conn)
+    conn.commit()
+    if centavos and not modo:
+        migrar_para_centavos(conn)
+        modo = True
+    return modo
@@ -0,0 +1,136 @@
+import threading
+import traceback
+from typing import Callable, NamedTuple
+
+
+class AtivoCadastrado(NamedTuple):
+    """
+    Os eventos de ativo trazem a variação do total investido em uma
+    categoria, a mesma que os gatilhos aplicam em totais_categoria.
+
+    tabela: RV | RF
+    id: id do ativo
+    categoria: categoria afetada
+    delta: variação do total investido na categoria
+    """
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoComprado(NamedTuple):
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoVendido(NamedTuple):
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoResgatado(NamedTuple):
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoAjustado(NamedTuple):
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoAlterado(NamedTuple):
+    """
+    Dados cadastrais alterados. Uma troca de categoria gera dois
+    eventos: um que retira o valor da categoria antiga e outro que o
+    soma na nova.
+    """
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class AtivoExcluido(NamedTuple):
+    tabela: str
+    id: int
+    categoria: str
+    delta: float
+
+
+class LoteGravado(NamedTuple):
+    """
+    Cadastro ou posições iniciais gravados em lote (importação). Não
+    traz variações: quem acompanha os totais deve relê-los.
+
+    tabela: RV | RF
+    quantidade: linhas gravadas
+    """
+    tabela: str
+    quantidade: int
+
+
+EVENTOS_ATIVO: tuple = (AtivoCadastrado, AtivoComprado, AtivoVendido, AtivoResgatado,
+                        AtivoAjustado, AtivoAlterado, AtivoExcluido)
+
+# tipo de movimentação -> evento publicado
+EVENTOS_MOVIMENTACAO: dict = {
+    'compra': AtivoComprado,
+    'venda': AtivoVendido,
+    'resgate': AtivoResgatado,
+    'ajuste': AtivoAjustado,
+}
+
+
+class BarramentoEventos:
+    """
+    Entrega os eventos publicados pelos repositórios a quem os assinou.
+    As funções são chamadas na thread que publicou (a do executor, no
+    aplicativo); quem mexe em widgets deve repassar o evento para a
+    thread do Tk. Um erro em um assinante é mostrado e não impede a
+    entrega aos demais.
+    """
+    def __init__(self) -> None:
+        self.__assinantes: list = []
+        self.__lock = threading.Lock()
+
+    def assinar(self, funcao: Callable[[tuple], None], *tipos: type) -> Callable[[], None]:
+        """
+        Param: funcao: chamada com cada evento
+        Param: tipos: classes de evento aceitas; nenhuma para todas
+
+        return função que cancela a assinatura
+        """
+        assinatura: tuple = (funcao, tipos)
+        with self.__lock:
+            self.__assinantes = self.__assinantes + [assinatura]
+
+        def cancelar() -> None:
+            with self.__lock:
+                self.__assinantes = [a for a in self.__assinantes if a is not assinatura]
+        return cancelar
+
+    def tem_assinantes(self) -> bool:
+        return bool(self.__assinantes)
+
+    def publicar(self, evento: tuple) -> None:
+        """
+        Param: evento: tuple -> uma das classes deste módulo
+
+        return None
+        """
+        for funcao, tipos in self.__assinantes:
+            if tipos and not isinstance(evento, tipos):
+                continue
+            try:
+                funcao(evento)
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,143 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import datetime
+import sqlite3 as sq
+from itertools import chain
+
+import numpy as np
+
+from calculos.carteira import POSICAO_INICIAL, HistoricoCarteira, valor_renda_fixa_diario, valor_renda_variavel_diario
+from calculos.custo_medio import AJUSTE
+
+from .centavos import usa_centavos
+from .cotacoes import DIA_ZERO
+from .datas import data_iso
+from .rendimentos import _taxa, carregar_series
+
+
+def valor_carteira_historico(conn: sq.Connection,
+                             inicio: datetime.date | str,
+                             fim: datetime.date | str | None = None,
+                             tamanho_bloco: int = 256) -> HistoricoCarteira:
+    """
+    Valor da carteira em cada dia corrido do intervalo (inclusive). A
+    renda variável vale a quantidade em carteira no fim do dia (do
+    livro de movimentações) vezes o último fechamento gravado em
+    cotacoes; sem cotação, o preço da última movimentação. A renda fixa
+    vale o valor bruto com o rendimento acumulado até o dia, pelas
+    mesmas regras de marcar_renda_fixa. O checkpoint de cada ativo
+    entra como posição inicial, válida em todos os dias até o primeiro
+    ajuste posterior a ele.
+
+    Param: conn: sqlite3.Connection
+    Param: inicio: datetime.date | str
+    Param: fim: datetime.date | str -> hoje, se omitida
+    Param: tamanho_bloco: int -> ativos (RV) ou taxas (RF) por bloco da matriz ativo x dia
+
+    return HistoricoCarteira
+    """
+    de: np.datetime64 = np.datetime64(data_iso(inicio), 'D')
+    ate: np.datetime64 = np.datetime64(data_iso(fim or datetime.date.today()), 'D')
+    if ate < de:
+        raise ValueError('A data final é anterior à inicial')
+    grade: np.ndarray = np.arange(de, ate + 1)
+    divisor: float = 100.0 if usa_centavos(conn) else 1.0
+    return HistoricoCarteira(grade,
+                             _renda_variavel(conn, grade, divisor, tamanho_bloco),
+                             _renda_fixa(conn, grade, divisor, tamanho_bloco))
+
+
+def _renda_variavel(conn: sq.Connection, grade: np.ndarray, divisor: float, tamanho_bloco: int) -> np.ndarray:
+    acao: str = "SELECT c.ativo_id, ?, c.quantidade, c.PU, NULL, 0 FROM checkpoints_posicoes c " \
+                "JOIN RV ON RV.id = c.ativo_id WHERE c.tabela = 'RV' AND c.quantidade > 0 " \
+                "UNION ALL " \
+                "SELECT m.ativo_id, m.tipo, m.quantidade, m.valor, substr(m.data, 1, 10), m.id " \
+                "FROM movimentacoes m JOIN RV ON RV.id = m.ativo_id " \
+                "LEFT JOIN checkpoints_posicoes c ON c.tabela = 'RV' AND c.ativo_id = m.ativo_id " \
+                "WHERE m.tabela = 'RV' AND m.id > COALESCE(c.movimentacao_id, 0) AND substr(m.data, 1, 10) <= ? " \
+                "ORDER BY 1, 6"
+    linhas: list = conn.execute(acao, (AJUSTE, str(grade[-1]))).fetchall()
+    resultado: np.ndarray = np.zeros(len(grade))
+    if not linhas:
+        return resultado
+
+    ids, tipos, quantidades, precos, datas, _ = map(np.array, zip(*linhas))
+    ids = ids.astype(np.int64)
+    colunas: np.ndarray = _colunas(datas, grade)
+    precos = precos.astype(np.float64) / divisor
+    codigos: dict = dict(conn.execute("SELECT id, codigo FROM RV"))
+
+    distintos, linha = np.unique(ids, return_inverse=True)
+    limites: np.ndarray = np.searchsorted(linha, np.arange(0, len(distintos) + tamanho_bloco, tamanho_bloco))
+    for bloco, (inicio, fim) in enumerate(zip(limites[:-1], limites[1:])):
+        if inicio == fim:
+            continue
+        primeira: int = bloco * tamanho_bloco
+        cotacoes: tuple = _cotacoes(conn, [codigos[ativo] for ativo in distintos[primeira:primeira + tamanho_bloco]],
+                                    grade, divisor)
+        resultado += valor_renda_variavel_diario(linha[inicio:fim] - primeira, colunas[inicio:fim],
+                                                 tipos[inicio:fim], quantidades[inicio:fim],
+                                                 precos[inicio:fim], cotacoes, len(grade))
+    return resultado
+
+
+def _cotacoes(conn: sq.Connection, codigos: list, grade: np.ndarray, divisor: float) -> tuple:
+    # cotações do intervalo e a última anterior a ele, que vale no primeiro dia
+    primeiro: int = int((grade[0] - np.datetime64(DIA_ZERO, 'D')).astype(np.int64))
+    ultimo: int = primeiro + len(grade) - 1
+    acao: str = "SELECT ?, data - ?, fechamento FROM cotacoes WHERE codigo = ? AND data BETWEEN " \
+                "COALESCE((SELECT MAX(data) FROM cotacoes WHERE codigo = ? AND data <= ?), ?) AND ? ORDER BY data"
+    cursores = (conn.execute(acao, (linha, primeiro, codigo, codigo, primeiro, primeiro, ultimo))
+                for linha, codigo in enumerate(codigos))
+    tabela: np.ndarray = np.fromiter(chain.from_iterable(chain.from_iterable(cursores)),
+                                     dtype=np.float64).reshape(-1, 3)
+    return tabela[:, 0].astype(np.int64), tabela[:, 1].astype(np.int64), tabela[:, 2] / divisor
+
+
+def _renda_fixa(conn: sq.Connection, grade: np.ndarray, divisor: float, tamanho_bloco: int) -> np.ndarray:
+    taxa: str = "RF.indexador, RF.multiplicador, RF.spread, RF.base, RF.rentabilidade"
+    acao: str = f"SELECT c.ativo_id, ?, c.valor, NULL, 0, {taxa} FROM checkpoints_posicoes c " \
+                "JOIN RF ON RF.id = c.ativo_id WHERE c.tabela = 'RF' AND c.valor <> 0 " \
+                "UNION ALL " \
+                f"SELECT m.ativo_id, m.tipo, m.valor, substr(m.data, 1, 10), m.id, {taxa} " \
+                "FROM movimentacoes m JOIN RF ON RF.id = m.ativo_id " \
+                "LEFT JOIN checkpoints_posicoes c ON c.tabela = 'RF' AND c.ativo_id = m.ativo_id " \
+                "WHERE m.tabela = 'RF' AND m.id > COALESCE(c.movimentacao_id, 0) AND substr(m.data, 1, 10) <= ? " \
+                "ORDER BY 1, 5"
+    linhas: list = conn.execute(acao, (POSICAO_INICIAL, str(grade[-1]))).fetchall()
+    if not linhas:
+        return np.zeros(len(grade))
+
+    ids, tipos, valores, datas = map(np.array, zip(*(linha[:4] for linha in linhas)))
+    indexadores, multiplicadores, spreads, bases = zip(*(
+        linha[5:9] if linha[5] is not None else _taxa(linha[9]) for linha in linhas))
+    return valor_renda_fixa_diario(ids,
+                                   tipos,
+                                   valores.astype(np.float64) / divisor,
+                                   datas.astype('datetime64[D]'),
+                                   np.array(indexadores),
+                                   np.array(multiplicadores),
+                                   np.array(spreads),
+                                   np.array(bases),
+                                   grade,
+                                   carregar_series(conn),
+                                   tamanho_bloco)
+
+
+def _colunas(datas: np.ndarray, grade: np.ndarray) -> np.ndarray:
+    # dia de cada movimentação na grade; sem data (checkpoint) é o primeiro
+    dias: np.ndarray = datas.astype('datetime64[D]')
+    return np.where(np.isnat(dias), 0, (dias - grade[0]).astype(np.int64))
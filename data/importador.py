@@ -0,0 +1,268 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import csv
+import io
+import unicodedata
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, ContextManager, Iterator, NamedTuple
+
+from ativos.acoes import Acao
+from ativos.fiis import Fiis
+from ativos.renda_fixa import RendaFixa
+from ativos.reserva_emergencia import ReservaEmergencia
+from ativos.tesouro_direto import TesouroDireto
+
+from .conexao import GerenciadorConexao, obter_gerenciador
+from .data import RepositorioRendaFixa, RepositorioRendaVariavel
+
+# nome do campo -> cabeçalhos aceitos (já normalizados)
+COLUNAS: dict = {
+    'nome': ('nome', 'ativo', 'descricao', 'empresa'),
+    'codigo': ('codigo', 'ticker', 'codigo de negociacao', 'papel'),
+    'produto': ('produto',),
+    'categoria': ('categoria', 'tipo', 'tipo de investimento', 'classe'),
+    'quantidade': ('quantidade', 'qtde', 'qtd'),
+    'preco': ('preco', 'preco unitario', 'preco medio', 'pu', 'pm'),
+    'valor': ('valor aplicado', 'valor', 'valor investido', 'saldo'),
+    'resgate': ('resgate', 'liquidez', 'carencia'),
+    'vencimento': ('vencimento', 'data de vencimento'),
+    'rentabilidade': ('rentabilidade', 'taxa', 'indexador'),
+    'periodicidade': ('periodicidade', 'periodicidade dos pagamentos', 'pagamentos'),
+}
+
+# categoria normalizada -> classe do ativo
+CATEGORIAS: dict = {
+    'acao': Acao,
+    'acoes': Acao,
+    'fii': Fiis,
+    'fiis': Fiis,
+    'fundo imobiliario': Fiis,
+    'renda fixa': RendaFixa,
+    'cdb': RendaFixa,
+    'lci': RendaFixa,
+    'lca': RendaFixa,
+    'tesouro direto': TesouroDireto,
+    'tesouro': TesouroDireto,
+    'reserva de emergencia': ReservaEmergencia,
+    'reserva': ReservaEmergencia,
+}
+
+
+class ResultadoImportacao(NamedTuple):
+    """
+    lidas: linhas de dados lidas do arquivo
+    cadastradas: ativos gravados no banco
+    conflitos: linhas recusadas por nome ou código já cadastrado
+    invalidas: linhas que não puderam ser convertidas em ativo
+    """
+    lidas: int
+    cadastradas: int
+    conflitos: list
+    invalidas: list
+
+
+@lru_cache(maxsize=256)
+def normalizar(texto: str) -> str:
+    """
+    Remove acentos, espaços extras e caixa alta. Os valores de
+    categoria se repetem muito, por isso o resultado é memorizado.
+
+    Param: texto: str
+
+    return str
+    """
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.replace('_', ' ').lower().split())
+
+
+def converter_numero(texto: str) -> float:
+    """
+    Aceita '1.234,56', '1234.56' e 'R$ 10,00'.
+
+    Param: texto: str
+
+    return float
+    """
+    texto = texto.replace('R$', '').strip()
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    return float(texto)
+
+
+def ler_csv(arquivo: io.TextIOBase) -> Iterator[dict]:
+    """
+    Lê o CSV linha a linha, sem carregar o arquivo na memória.
+    O separador (',' ou ';') é detectado pelo cabeçalho.
+
+    Param: arquivo: arquivo texto aberto com newline=''
+
+    return Iterator[tuple] -> (número da linha no arquivo, {campo: valor})
+                              com os campos definidos em COLUNAS
+    """
+    cabecalho: str = arquivo.readline()
+    delimitador: str = ';' if cabecalho.count(';') > cabecalho.count(',') else ','
+    nomes: list = next(csv.reader([cabecalho], delimiter=delimitador))
+
+    campos: dict = {}
+    for posicao, nome in enumerate(nomes):
+        nome = normalizar(nome)
+        for campo, aceitos in COLUNAS.items():
+            if nome in aceitos and campo not in campos:
+                campos[campo] = posicao
+
+    leitor = csv.reader(arquivo, delimiter=delimitador)
+    for linha in leitor:
+        if not any(valor.strip() for valor in linha):
+            continue
+        yield leitor.line_num + 1, {campo: linha[posicao].strip()
+                                    for campo, posicao in campos.items() if posicao < len(linha)}
+
+
+def converter_linha(linha: dict, categoria_padrao: str = 'Ações') -> tuple:
+    """
+    Converte uma linha lida por ler_csv no ativo correspondente.
+
+    Param: linha: dict
+    Param: categoria_padrao: str -> usada quando o arquivo não traz categoria
+
+    return tuple -> (ativo, quantidade, valor) ; valor é o preço unitário
+                    em renda variável e o valor aplicado em renda fixa
+    """
+    nome: str = linha.get('nome', '')
+    codigo: str = linha.get('codigo', '').upper()
+    produto: str = linha.get('produto', '')
+    if produto and (not nome or not codigo):
+        # extratos da B3 trazem 'BBAS3 - BANCO DO BRASIL S/A'
+        partes: list = [parte.strip() for parte in produto.split(' - ', 1)]
+        codigo = codigo or partes[0].upper()
+        nome = nome or partes[-1]
+
+    classe = CATEGORIAS.get(normalizar(linha.get('categoria') or categoria_padrao))
+    if classe is None:
+        raise ValueError(f'Categoria desconhecida: {linha.get("categoria")}')
+
+    quantidade: int = int(converter_numero(linha['quantidade'])) if linha.get('quantidade') else 0
+
+    if classe in (Acao, Fiis):
+        if not codigo:
+            raise ValueError('Código não informado')
+        valor: float = converter_numero(linha['preco']) if linha.get('preco') else 0.0
+        return classe(nome.title() or codigo, codigo), quantidade, valor
+
+    if not nome:
+        raise ValueError('Nome não informado')
+    dados: tuple = (nome.upper(),
+                    linha.get('resgate', '').upper(),
+                    linha.get('vencimento', '').upper(),
+                    linha.get('rentabilidade', '').upper())
+    valor = converter_numero(linha['valor']) if linha.get('valor') else 0.0
+    if classe is TesouroDireto:
+        return TesouroDireto(*dados, linha.get('periodicidade', '').upper()), quantidade, valor
+    return classe(*dados), quantidade, valor
+
+
+class ImportadorCSV:
+    """
+    Importa extratos CSV em lotes. Cada lote é gravado em uma única
+    transação e a memória usada não cresce com o tamanho do arquivo.
+    A importação roda no modo_lote do gerenciador (sem fsync a cada lote).
+    """
+    def __init__(self,
+                 gerenciador: GerenciadorConexao | None = None,
+                 tamanho_lote: int = 5000,
+                 categoria_padrao: str = 'Ações') -> None:
+        self.__gerenciador: GerenciadorConexao = gerenciador or obter_gerenciador()
+        self.__rep_rv = RepositorioRendaVariavel(self.__gerenciador)
+        self.__rep_rf = RepositorioRendaFixa(self.__gerenciador)
+        self.__tamanho_lote: int = tamanho_lote
+        self.__categoria_padrao: str = categoria_padrao
+
+    def importar(self,
+                 caminho: str,
+                 progresso: Callable[[int, float], None] | None = None,
+                 encoding: str = 'utf-8-sig') -> ResultadoImportacao:
+        """
+        Param: caminho: str
+        Param: progresso: função chamada após cada lote com o número de
+                          linhas lidas e a fração do arquivo já lida (0 a 1)
+        Param: encoding: str
+
+        return ResultadoImportacao
+        """
+        tamanho_arquivo: int = os.path.getsize(caminho) or 1
+        lidas: int = 0
+        cadastradas: int = 0
+        conflitos: list = []
+        invalidas: list = []
+
+        with open(caminho, 'rb') as binario, self.__modo_lote():
+            texto = io.TextIOWrapper(binario, encoding=encoding, newline='')
+            linhas = ler_csv(texto)
+            while True:
+                lote: list = list(islice(linhas, self.__tamanho_lote))
+                if not lote:
+                    break
+                lidas += len(lote)
+
+                gravadas, recusadas, erros = self.__gravar_lote(lote)
+                cadastradas += gravadas
+                conflitos.extend(recusadas)
+                invalidas.extend(erros)
+
+                if progresso is not None:
+                    progresso(lidas, min(binario.tell() / tamanho_arquivo, 1.0))
+
+        return ResultadoImportacao(lidas, cadastradas, conflitos, invalidas)
+
+    def __modo_lote(self) -> ContextManager:
+        # dentro de uma transação aberta por quem chamou o modo não pode
+        # ser trocado; os lotes entram nessa transação como antes
+        if self.__gerenciador.obter().in_transaction:
+            return nullcontext()
+        return self.__gerenciador.modo_lote()
+
+    def __gravar_lote(self, lote: list) -> tuple:
+        rv: list = []
+        rf: list = []
+        invalidas: list = []
+        for numero, linha in lote:
+            try:
+                ativo, quantidade, valor = converter_linha(linha, self.__categoria_padrao)
+            except (ValueError, KeyError):
+                invalidas.append(numero)
+                continue
+            destino: list = rv if isinstance(ativo, (Acao, Fiis)) else rf
+            destino.append((numero, ativo, quantidade, valor))
+
+        with self.__gerenciador.transacao():
+            resultado_rv = self.__rep_rv.cadastrar_ativos_em_lote(item[1] for item in rv)
+            resultado_rf = self.__rep_rf.cadastrar_ativos_em_lote(item[1] for item in rf)
+            self.__rep_rv.acao_sql_posicoes_iniciais_em_lote(
+                (ident, quantidade, valor)
+                for ident, (_, _, quantidade, valor) in zip(resultado_rv.ids, rv)
+                if ident is not None and quantidade)
+            self.__rep_rf.acao_sql_posicoes_iniciais_em_lote(
+                (ident, valor, quantidade or 1)
+                for ident, (_, _, quantidade, valor) in zip(resultado_rf.ids, rf)
+                if ident is not None and (quantidade or valor))
+
+        conflitos: list = [rv[i][0] for i in resultado_rv.conflitos]
+        conflitos += [rf[i][0] for i in resultado_rf.conflitos]
+        gravadas: int = len(rv) + len(rf) - len(conflitos)
+        return gravadas, sorted(conflitos), invalidas
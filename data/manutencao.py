@@ -0,0 +1,143 @@
+import argparse
+import sqlite3 as sq
+import sys
+
+from .centavos import CENTAVOS, REAIS, Moeda, usa_centavos
+from .conexao import CAMINHO_PADRAO, GerenciadorConexao
+from .cotacoes import RepositorioCotacoes, ResultadoCotacoes
+from .esquema import migrar_para_centavos
+from .movimentacoes import criar_checkpoint, reconstruir_posicoes
+from .perfis import PERFIL_PADRAO, PERFIS
+from .rendimentos import preencher_taxas_rf
+from .totais import reconstruir_totais, verificar_totais
+
+
+def comando_totais(conn: sq.Connection, reconstruir: bool) -> int:
+    """
+    Mostra as divergências de totais_categoria e, se pedido,
+    reconstrói a tabela.
+
+    Param: conn: sqlite3.Connection
+    Param: reconstruir: bool
+
+    return int -> código de saída
+    """
+    divergencias: list = verificar_totais(conn)
+    # verificar_totais devolve os valores como gravados (centavos ou reais)
+    moeda: Moeda = CENTAVOS if usa_centavos(conn) else REAIS
+    for tabela, categoria, armazenado, real in divergencias:
+        armazenado, real = moeda.do_banco(armazenado), moeda.do_banco(real)
+        print(f'{tabela} / {categoria}: armazenado {armazenado:.2f}, real {real:.2f}, '
+              f'diferença {armazenado - real:.2f}')
+    if not divergencias:
+        print('Nenhuma divergência encontrada.')
+
+    if reconstruir:
+        reconstruir_totais(conn)
+        conn.commit()
+        print('Totais reconstruídos.')
+        return 0
+    return 1 if divergencias else 0
+
+
+def comando_posicoes(conn: sq.Connection, reconstruir: bool) -> int:
+    """
+    Cria um checkpoint das posições ou as reconstrói a partir do
+    livro de movimentações.
+
+    Param: conn: sqlite3.Connection
+    Param: reconstruir: bool
+
+    return int -> código de saída
+    """
+    if reconstruir:
+        print(f'{reconstruir_posicoes(conn)} posição(ões) reconstruída(s).')
+    else:
+        print(f'Checkpoint criado até a movimentação {criar_checkpoint(conn)}.')
+    conn.commit()
+    return 0
+
+
+def comando_centavos(conn: sq.Connection) -> int:
+    """
+    Passa o banco a guardar dinheiro em centavos (INTEGER).
+
+    Param: conn: sqlite3.Connection
+
+    return int -> código de saída
+    """
+    if usa_centavos(conn):
+        print('O banco já guarda dinheiro em centavos.')
+        return 0
+    migrar_para_centavos(conn)
+    print('Valores convertidos para centavos.')
+    return 0
+
+
+def comando_taxas(conn: sq.Connection) -> int:
+    """
+    Interpreta de novo a rentabilidade de todos os ativos de RF.
+
+    Param: conn: sqlite3.Connection
+
+    return int -> código de saída
+    """
+    total: int = preencher_taxas_rf(conn, todas=True)
+    conn.commit()
+    reconhecidas: int = conn.execute("SELECT COUNT(*) FROM RF WHERE indexador IS NOT NULL").fetchone()[0]
+    print(f'{total} ativo(s) reinterpretado(s); {total - reconhecidas} sem taxa reconhecida.')
+    return 0
+
+
+def comando_cotacoes(gerenciador: GerenciadorConexao, caminho: str) -> int:
+    """
+    Carrega um CSV de cotações diárias (código, data, fechamento).
+
+    Param: gerenciador: GerenciadorConexao
+    Param: caminho: str
+
+    return int -> código de saída; 1 se alguma linha foi recusada
+    """
+    resultado: ResultadoCotacoes = RepositorioCotacoes(gerenciador).carregar_csv(caminho)
+    print(f'{resultado.gravadas} de {resultado.lidas} cotação(ões) gravada(s).')
+    if resultado.invalidas:
+        print(f'Linhas recusadas: {", ".join(map(str, resultado.invalidas[:20]))}'
+              f'{" ..." if len(resultado.invalidas) > 20 else ""}')
+        return 1
+    return 0
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m data.manutencao',
+                                     description='Rotinas de manutenção do banco do PyInvest.')
+    parser.add_argument('--banco', default=CAMINHO_PADRAO)
+    parser.add_argument('--perfil', choices=list(PERFIS), default=PERFIL_PADRAO)
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    comandos.add_parser('verificar-totais', help='Compara totais_categoria com RV e RF.')
+    comandos.add_parser('reconstruir-totais', help='Recalcula totais_categoria do zero.')
+    comandos.add_parser('checkpoint', help='Guarda as posições atuais como ponto de partida.')
+    comandos.add_parser('reconstruir-posicoes', help='Refaz RV e RF a partir do livro de movimentações.')
+    comandos.add_parser('reconstruir-taxas', help='Reinterpreta a rentabilidade de todos os ativos de RF.')
+    comandos.add_parser('migrar-centavos', help='Converte os valores em REAL para centavos (INTEGER).')
+    cotacoes = comandos.add_parser('carregar-cotacoes', help='Carrega um CSV de cotações diárias.')
+    cotacoes.add_argument('arquivo')
+    args = parser.parse_args(argv)
+
+    gerenciador: GerenciadorConexao = GerenciadorConexao(args.banco, args.perfil)
+    try:
+        if args.comando == 'carregar-cotacoes':
+            return comando_cotacoes(gerenciador, args.arquivo)
+        conn: sq.Connection = gerenciador.obter()
+        if args.comando == 'reconstruir-taxas':
+            return comando_taxas(conn)
+        if args.comando == 'migrar-centavos':
+            return comando_centavos(conn)
+        if args.comando in ('checkpoint', 'reconstruir-posicoes'):
+            return comando_posicoes(conn, args.comando == 'reconstruir-posicoes')
+        return comando_totais(conn, args.comando == 'reconstruir-totais')
+    finally:
+        gerenciador.fechar_todas()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,7 +13,13 @@ try:
 except Exception as error:
     print(f'{error}')
 
+import datetime
 import sqlite3 as sq
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import ContextManager, Iterable, Iterator, NamedTuple
 
 from ativos.acoes import Acao
 from ativos.fiis import Fiis
@@ -21,112 +27,600 @@ from ativos.renda_fixa import RendaFixa
 from ativos.reserva_emergencia import ReservaEmergencia
 from ativos.tesouro_direto import TesouroDireto
 
+from .centavos import COLUNAS_DINHEIRO, Moeda, converter_linha
+from .conexao import GerenciadorConexao, obter_gerenciador
+from .datas import data_iso
+from .esquema import COLUNAS_BUSCA, COLUNAS_TOTAIS, COLUNAS_UNICAS
+from .eventos import EVENTOS_MOVIMENTACAO, AtivoAlterado, AtivoCadastrado, AtivoExcluido
+from .eventos import BarramentoEventos, LoteGravado
+from .exceptions import AtivoNaoCadastradoError, QuantidadeInsuficienteError, SaldoInsuficienteError
+from .movimentacoes import ATUALIZACOES, ATUALIZACOES_CENTAVOS, agora, historico, registrar_movimentacao
+from .rendimentos import colunas_taxa
 
-class MetodosSqlRV:
-    def __init__(self):
-        self._conn = sq.connect('data/data.db')
-        self._cursor = self._conn.cursor()
-        
-    def _existe_ativo(self, id: str) -> bool:
+CATEGORIAS_RV: tuple = ('Ações', 'FIIs')
+CATEGORIAS_RF: tuple = ('Renda Fixa', 'Tesouro Direto', 'Reserva de Emergência')
+
+# colunas aceitas na ordem dos relatórios (todas têm índice terminando em id)
+ORDENACOES_RV: tuple = ('id', 'nome', 'codigo', 'categoria', 'PT')
+ORDENACOES_RF: tuple = ('id', 'nome', 'categoria', 'valor_aplicado', 'multiplicador', 'spread')
+
+
+class ResultadoLote(NamedTuple):
+    """
+    ids: id atribuído a cada ativo, na ordem de entrada (None se não foi inserido)
+    conflitos: posições dos ativos recusados por nome ou código repetido
+    """
+    ids: list
+    conflitos: list
+
+
+class _MetodosSqlBase:
+    def __init__(self, gerenciador: GerenciadorConexao | None = None):
+        self._gerenciador: GerenciadorConexao = gerenciador or obter_gerenciador()
+        self.__local = threading.local()
+        self.__resumo: tuple | None = None
+
+    @property
+    def _conn(self) -> sq.Connection:
+        return self._gerenciador.obter()
+
+    @property
+    def _cursor(self) -> sq.Cursor:
+        conn: sq.Connection = self._conn
+        cursor: sq.Cursor | None = getattr(self.__local, 'cursor', None)
+        if cursor is None or cursor.connection is not conn:
+            cursor = conn.cursor()
+            self.__local.cursor = cursor
+        return cursor
+
+    @property
+    def _moeda(self) -> Moeda:
+        return self._gerenciador.moeda
+
+    def _linhas_do_banco(self, tabela: str, linhas: Iterable[tuple]) -> list:
+        """
+        Linhas lidas da tabela com o dinheiro em reais, qualquer que seja
+        o modo do banco (ver data.centavos).
+        """
+        moeda: Moeda = self._moeda
+        return [converter_linha(moeda, tabela, linha) for linha in linhas]
+
+    def transacao(self) -> ContextManager[sq.Connection]:
+        """
+        Agrupa várias operações em uma transação só, com um commit no
+        fim (ver GerenciadorConexao.transacao). Vale para todos os
+        repositórios que compartilham o gerenciador.
+
+            with rep_rv.transacao():
+                rep_rv.comprar('1', 10, 20.0)
+                rep_rv.vender('2', 5, 30.0)
+
+        return ContextManager
+        """
+        return self._gerenciador.transacao()
+
+    def _commit(self) -> None:
+        """
+        Confirma a operação, a menos que ela faça parte de uma
+        transacao() aberta; nesse caso o commit fica para o fim do bloco.
+        """
+        if not self._gerenciador.em_transacao:
+            self._gerenciador.confirmar(self._conn)
+
+    def _versao_banco(self) -> tuple:
+        """
+        Identifica o estado do banco visto pela conexão atual, sem
+        consultar o SQLite. Muda quando esta conexão grava algo
+        (total_changes), quando outra conexão do gerenciador confirma
+        uma gravação (gravacoes), quando uma transação é desfeita
+        (descartes) e, para gravações de outros processos, no início da
+        próxima transação desta conexão (ver GerenciadorConexao.data_version).
+
+        return tuple
+        """
+        conn: sq.Connection = self._conn
+        gerenciador = self._gerenciador
+        return (id(conn), conn.total_changes, gerenciador.data_version(), gerenciador.gravacoes, gerenciador.descartes)
+
+    def _acao_sql_posicao(self, tabela: str, coluna: str, valor: object) -> tuple | None:
+        """
+        Linha do ativo procurada pelo id ou por uma coluna única, servida
+        do cache de posições do gerenciador sempre que possível.
+
+        Param: tabela: str -> RV | RF
+        Param: coluna: str -> id | nome | codigo (só RV)
+        Param: valor: object
+
+        return tuple | None -> a linha, ou None se o ativo não existir
+        """
+        if coluna != 'id' and coluna not in COLUNAS_UNICAS[tabela]:
+            raise ValueError(f'Coluna sem índice único: {coluna}')
+        cache = self._gerenciador.cache_posicoes(tabela)
+        versao: tuple = self._versao_banco()
+        linha: tuple | None = cache.obter(versao, coluna, valor)
+        if linha is None:
+            linha = self._conn.execute(f"SELECT * FROM {tabela} WHERE {coluna}=?", (valor,)).fetchone()
+            if linha is not None:
+                cache.guardar(versao, linha)
+        return linha
+
+    @property
+    def eventos(self) -> BarramentoEventos:
+        """
+        Barramento onde os repositórios deste gerenciador publicam as
+        alterações da carteira (ver data.eventos).
+        """
+        return self._gerenciador.eventos
+
+    @contextmanager
+    def _gravando(self, tabela: str, *ids, evento: type | None = None) -> Iterator[list]:
+        """
+        Envolve uma gravação dos repositórios: ao final, tira do cache
+        de posições só as linhas alteradas (ids) em vez de esvaziá-lo e,
+        se houver assinantes, publica `evento` com a variação do total
+        de cada linha. Inserções acrescentam o id novo à lista entregue
+        pelo bloco.
+
+        Param: tabela: str
+        Param: ids -> ids das linhas alteradas; nenhum para inserções
+        Param: evento: type -> classe de data.eventos
+        """
+        versao: tuple = self._versao_banco()
+        observar: bool = evento is not None and self._gerenciador.eventos.tem_assinantes()
+        antes: list = [(id, self._acao_sql_posicao(tabela, 'id', id)) for id in ids] if observar else []
+        novos: list = []
+        yield novos
+        self._gerenciador.cache_posicoes(tabela).descartar(ids, versao, self._versao_banco())
+        if observar:
+            for id, linha in antes + [(id, None) for id in novos]:
+                self.__publicar_variacao(evento, tabela, id, linha)
+
+    def __publicar_variacao(self, evento: type, tabela: str, id: int | str, antes: tuple | None) -> None:
+        depois: tuple | None = self._acao_sql_posicao(tabela, 'id', id)
+        categoria, valor = COLUNAS_TOTAIS[tabela]
+        if antes is not None and depois is not None and antes[categoria] == depois[categoria]:
+            variacoes: list = [(depois[categoria], depois[valor] - antes[valor])]
+        else:
+            variacoes = [(linha[categoria], sinal * linha[valor])
+                         for linha, sinal in ((antes, -1), (depois, 1)) if linha is not None]
+        for nome_categoria, delta in variacoes:
+            self._gerenciador.publicar(evento(tabela, int(id), nome_categoria, self._moeda.do_banco(delta)))
+
+    def _acao_sql_resumo(self, tabela: str, categorias: tuple) -> dict:
+        """
+        Lê os totais por categoria mantidos pelos gatilhos em
+        totais_categoria. O resultado fica guardado até a próxima
+        gravação no banco.
+
+        Param: tabela: str
+        Param: categorias: tuple
+
+        return dict
+        """
+        versao: tuple = self._versao_banco()
+        if self.__resumo is not None and self.__resumo[0] == versao:
+            return dict(self.__resumo[1])
+
+        resumo: dict = {categoria: 0 for categoria in categorias}
+        acao: str = "SELECT categoria, total FROM totais_categoria WHERE tabela=?"
+        for categoria, total in self._conn.execute(acao, (tabela,)):
+            resumo[categoria] = total
+        resumo['Total'] = sum(resumo.values())
+        # em centavos as somas acima são inteiras e exatas; só o
+        # resultado é convertido
+        resumo = {categoria: self._moeda.do_banco(total) for categoria, total in resumo.items()}
+
+        self.__resumo = (versao, resumo)
+        return dict(resumo)
+
+    def _acao_sql_inserir_em_lote(self,
+                                  tabela: str,
+                                  colunas: tuple,
+                                  unicas: tuple,
+                                  linhas: Iterable[tuple]) -> ResultadoLote:
+        """
+        Insere todas as linhas com um único executemany dentro de uma
+        transação. Linhas que repetem uma coluna única, no lote ou no
+        banco, são ignoradas e informadas como conflito.
+
+        Param: tabela: str
+        Param: colunas: tuple -> deve conter 'nome'
+        Param: unicas: tuple -> posições das colunas únicas em cada linha
+        Param: linhas: Iterable[tuple]
+
+        return ResultadoLote
+        """
+        vistos: list = [set() for _ in unicas]
+        posicoes: list = []
+        validas: list = []
+        for linha in linhas:
+            if any(linha[i] in vistos[n] for n, i in enumerate(unicas)):
+                posicoes.append(None)
+                continue
+            for n, i in enumerate(unicas):
+                vistos[n].add(linha[i])
+            posicoes.append(len(validas))
+            validas.append(linha)
+
+        acao: str = f"INSERT OR IGNORE INTO {tabela} ({', '.join(colunas)}) " \
+                    f"VALUES ({', '.join('?' * len(colunas))})"
+        with self._gravando(tabela), self._gerenciador.transacao() as conn:
+            id_max: int = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabela}").fetchone()[0]
+            conn.executemany(acao, validas)
+            novos: dict = dict(conn.execute(f"SELECT nome, id FROM {tabela} WHERE id > ?", (id_max,)))
+        self._gerenciador.publicar(LoteGravado(tabela, len(novos)))
+
+        nome: int = colunas.index('nome')
+        ids: list = [None if pos is None else novos.get(validas[pos][nome]) for pos in posicoes]
+        conflitos: list = [i for i, ident in enumerate(ids) if ident is None]
+        return ResultadoLote(ids, conflitos)
+
+    def _acao_sql_executar_em_lote(self, *instrucoes: tuple) -> None:
+        """
+        Executa cada instrução para todas as suas linhas, tudo na mesma
+        transação. Se já houver uma transação aberta, participa dela e
+        deixa o commit para quem a abriu.
+
+        Param: instrucoes: tuple -> (acao: str, linhas: Iterable[tuple]), ...
+
+        return None
+        """
+        with self._gerenciador.transacao() as conn:
+            for acao, linhas in instrucoes:
+                conn.executemany(acao, linhas)
+
+    def _acao_sql_movimentar(self,
+                             tabela: str,
+                             id: str,
+                             tipo: str,
+                             qtde: int,
+                             valor: float,
+                             data: str | None = None) -> None:
+        """
+        Registra a movimentação no livro e atualiza a posição do ativo
+        na mesma transação. A nova posição é calculada pelo próprio
+        UPDATE e as verificações de quantidade e saldo fazem parte do
+        WHERE, sem leitura prévia da linha.
+
+        Param: tabela: str -> RV | RF
+        Param: id: str
+        Param: tipo: str -> compra | venda | resgate | ajuste
+        Param: qtde: int
+        Param: valor: float | Decimal -> em reais
+        Param: data: str -> ISO 8601; agora, se omitida
+
+        return None
+        """
+        moeda: Moeda = self._moeda
+        atribuicoes, condicao = (ATUALIZACOES_CENTAVOS if moeda.centavos else ATUALIZACOES)[(tabela, tipo)]
+        valor = moeda.para_banco(valor)
+        acao: str = f"UPDATE {tabela} SET {atribuicoes} WHERE id = :id"
+        if condicao:
+            acao += f" AND {condicao}"
+
+        with self._gravando(tabela, id, evento=EVENTOS_MOVIMENTACAO[tipo]), \
+                self._gerenciador.transacao() as conn:
+            self._cursor.execute(acao, {'id': id, 'qtde': qtde, 'valor': valor})
+            if self._cursor.rowcount == 0:
+                raise self.__erro_movimentacao(tabela, id, tipo)
+            registrar_movimentacao(conn, tabela, id, tipo, qtde, valor, data)
+
+    def _acao_sql_movimentar_em_lote(self, tabela: str, linhas: Iterable[tuple]) -> int:
+        """
+        Aplica uma sequência de movimentações com as mesmas regras de
+        _acao_sql_movimentar, em uma única transação. As linhas são
+        aplicadas na ordem recebida (que deve ser a cronológica): cada
+        trecho de movimentações consecutivas do mesmo tipo vira um
+        executemany do UPDATE e outro da gravação no livro. Se alguma
+        não puder ser aplicada (ativo inexistente, quantidade ou saldo
+        insuficiente), nenhuma é gravada.
+
+        Param: tabela: str -> RV | RF
+        Param: linhas: Iterable -> (id, tipo, qtde, valor, data) ; valor em reais
+
+        return int -> movimentações gravadas
+        """
+        moeda: Moeda = self._moeda
+        regras: dict = ATUALIZACOES_CENTAVOS if moeda.centavos else ATUALIZACOES
+        linhas = [(int(id), tipo, qtde, moeda.para_banco(valor), data or agora())
+                  for id, tipo, qtde, valor, data in linhas]
+        livro: str = "INSERT INTO movimentacoes (tabela, ativo_id, tipo, quantidade, valor, data) " \
+                     "VALUES (?, ?, ?, ?, ?, ?)"
+
+        with self._gravando(tabela, *{id for id, *_ in linhas}), self._gerenciador.transacao() as conn:
+            for tipo, trecho in groupby(linhas, key=itemgetter(1)):
+                trecho = list(trecho)
+                atribuicoes, condicao = regras[(tabela, tipo)]
+                acao: str = f"UPDATE {tabela} SET {atribuicoes} WHERE id = :id"
+                if condicao:
+                    acao += f" AND {condicao}"
+                cursor: sq.Cursor = conn.executemany(acao, ({'id': id, 'qtde': qtde, 'valor': valor}
+                                                            for id, _, qtde, valor, _ in trecho))
+                if cursor.rowcount != len(trecho):
+                    raise self.__erro_lote(tipo)
+                conn.executemany(livro, ((tabela, *linha) for linha in trecho))
+        self._gerenciador.publicar(LoteGravado(tabela, len(linhas)))
+        return len(linhas)
+
+    @staticmethod
+    def __erro_lote(tipo: str) -> BaseException:
+        # compras e ajustes não têm condição: só falham sem o ativo
+        if tipo == 'venda':
+            return QuantidadeInsuficienteError('Quantidade insuficiente (ou ativo não cadastrado) '
+                                               'em uma das movimentações do lote.')
+        if tipo == 'resgate':
+            return SaldoInsuficienteError('Saldo insuficiente (ou ativo não cadastrado) '
+                                          'em uma das movimentações do lote.')
+        return AtivoNaoCadastradoError('Ativo não cadastrado em uma das movimentações do lote.')
+
+    def __erro_movimentacao(self, tabela: str, id: str, tipo: str) -> BaseException:
+        """
+        Chamado só quando o UPDATE não alterou nenhuma linha, para
+        descobrir qual condição falhou.
+        """
+        if self._acao_sql_posicao(tabela, 'id', id) is None:
+            return AtivoNaoCadastradoError(f'Ativo {id} não cadastrado.')
+        if tipo == 'venda':
+            return QuantidadeInsuficienteError('Quantidade insuficiente para realizar esta operação.')
+        return SaldoInsuficienteError('Saldo insuficiente para realizar esta operação.')
+
+    def _acao_sql_historico(self, tabela: str, id: str) -> list:
+        do_banco = self._moeda.do_banco
+        return [(ident, tipo, quantidade, do_banco(valor), data)
+                for ident, tipo, quantidade, valor, data in historico(self._conn, tabela, id)]
+
+    def _acao_sql_buscar(self, tabela: str, termo: str, limite: int = 50) -> list:
+        """
+        Ativos cujo nome (ou código, em renda variável) contém o termo,
+        sem diferenciar maiúsculas. Usa o índice trigram busca_<tabela>;
+        termos com menos de 3 caracteres, ou bancos sem FTS5, caem em
+        um LIKE sobre a tabela.
+
+        Param: tabela: str
+        Param: termo: str
+        Param: limite: int
+
+        return list -> linhas da tabela, sem formatação
+        """
+        termo = termo.strip()
+        if not termo:
+            return []
+        busca: str = f'busca_{tabela}'
+        if len(termo) >= 3 and self.__existe_busca(busca):
+            acao: str = f"SELECT t.* FROM {busca} JOIN {tabela} t ON t.id = {busca}.rowid " \
+                        f"WHERE {busca} MATCH ? ORDER BY rank LIMIT ?"
+            frase: str = '"' + termo.replace('"', '""') + '"'
+            return self._linhas_do_banco(tabela, self._conn.execute(acao, (frase, limite)))
+
+        padrao: str = '%' + termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        condicao: str = ' OR '.join(f"{coluna} LIKE :padrao ESCAPE '\\'" for coluna in COLUNAS_BUSCA[tabela])
+        acao = f"SELECT * FROM {tabela} WHERE {condicao} ORDER BY id LIMIT :limite"
+        return self._linhas_do_banco(tabela, self._conn.execute(acao, {'padrao': padrao, 'limite': limite}))
+
+    def __existe_busca(self, busca: str) -> bool:
+        acao: str = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?"
+        return self._conn.execute(acao, (busca,)).fetchone() is not None
+
+    def _acao_sql_relatorio(self,
+                            tabela: str,
+                            ordenacoes: tuple,
+                            apos: int | tuple = 0,
+                            limite: int | None = None,
+                            ordem: str = 'id',
+                            tamanho_bloco: int = 500) -> Iterator[tuple]:
+        """
+        Percorre a tabela em blocos paginados por chave (keyset): cada
+        bloco é uma consulta nova que continua depois da última linha
+        lida, então nenhum cursor fica aberto entre um yield e outro e a
+        memória usada não depende do tamanho da tabela. A posição é o
+        par (valor da coluna de ordem, id) da última linha lida, levado
+        de um bloco para o outro, e continua válida mesmo que essa linha
+        seja apagada.
+
+        Param: tabela: str
+        Param: ordenacoes: tuple -> colunas aceitas em ordem
+        Param: apos: int | tuple -> id da última linha já lida (0 para
+                     começar) ou o seu cursor (ver _acao_sql_cursor_relatorio)
+        Param: limite: int -> total de linhas; None para todas
+        Param: ordem: str -> coluna; com '-' na frente, decrescente
+        Param: tamanho_bloco: int
+
+        return Iterator[tuple] -> linhas da tabela, sem formatação
+        """
+        decrescente: bool = ordem.startswith('-')
+        coluna: str = ordem.lstrip('-')
+        if coluna not in ordenacoes:
+            raise ValueError(f'Ordenação inválida: {ordem}')
+        sentido: str = 'DESC' if decrescente else 'ASC'
+        comparacao: str = '<' if decrescente else '>'
+
+        if coluna == 'id':
+            ordenar: str = f"ORDER BY id {sentido}"
+            chave: str = f"id {comparacao} :id"
+            chave_nula: str = chave
+        else:
+            # colunas que aceitam NULL (multiplicador, spread): os NULL vêm
+            # antes na ordem crescente e depois na decrescente, e uma
+            # comparação com NULL nunca é verdadeira, então cada caso tem
+            # a sua condição
+            ordenar = f"ORDER BY {coluna} {sentido} NULLS {'LAST' if decrescente else 'FIRST'}, id {sentido}"
+            if decrescente:
+                chave = f"(({coluna}, id) < (:valor, :id) OR {coluna} IS NULL)"
+                chave_nula = f"({coluna} IS NULL AND id < :id)"
+            else:
+                chave = f"({coluna}, id) > (:valor, :id)"
+                chave_nula = f"({coluna} IS NOT NULL OR id > :id)"
+        primeira: str = f"SELECT * FROM {tabela} {ordenar} LIMIT :bloco"
+        seguinte: tuple = (f"SELECT * FROM {tabela} WHERE {chave} {ordenar} LIMIT :bloco",
+                           f"SELECT * FROM {tabela} WHERE {chave_nula} {ordenar} LIMIT :bloco")
+
+        cursor: tuple | None = None
+        if isinstance(apos, tuple):
+            cursor = apos
+        elif apos and coluna == 'id':
+            # o próprio id é a posição: não precisa que a linha ainda exista
+            cursor = (int(apos), int(apos))
+        elif apos:
+            cursor = self._acao_sql_cursor_id(tabela, coluna, int(apos))
+        return self.__iterar_blocos(tabela, coluna, primeira, seguinte, cursor, limite, tamanho_bloco)
+
+    def _acao_sql_cursor_relatorio(self, tabela: str, ordenacoes: tuple, linha: tuple, ordem: str = 'id') -> tuple:
+        """
+        Param: tabela: str
+        Param: ordenacoes: tuple
+        Param: linha: tuple -> a última linha lida do relatório
+        Param: ordem: str -> a mesma passada ao relatório
+
+        return tuple -> (valor da coluna de ordem, id), para continuar depois da linha
+        """
+        coluna: str = ordem.lstrip('-')
+        if coluna not in ordenacoes:
+            raise ValueError(f'Ordenação inválida: {ordem}')
+        if coluna == 'id':
+            return linha[0], linha[0]
+        posicao: int = self.__colunas(tabela).index(coluna)
+        valor = linha[posicao]
+        # a linha vem em reais; o cursor é comparado com o valor gravado
+        if posicao in COLUNAS_DINHEIRO[tabela] and valor is not None:
+            valor = self._moeda.para_banco(valor)
+        return valor, linha[0]
+
+    def _acao_sql_cursor_id(self, tabela: str, coluna: str, id: int) -> tuple:
+        # só para retomar a partir de um id; entre blocos o cursor vem da linha
+        linha: tuple | None = self._conn.execute(f"SELECT {coluna}, id FROM {tabela} WHERE id = ?", (id,)).fetchone()
+        if linha is None:
+            raise AtivoNaoCadastradoError(f'O ativo {id} não está mais cadastrado; '
+                                          f'continue o relatório pelo cursor da última linha lida.')
+        return tuple(linha)
+
+    def __colunas(self, tabela: str) -> list:
+        return [nome for _, nome, *_ in self._conn.execute(f'PRAGMA table_info("{tabela}")')]
+
+    def __iterar_blocos(self,
+                        tabela: str,
+                        coluna: str,
+                        primeira: str,
+                        seguinte: tuple,
+                        cursor: tuple | None,
+                        limite: int | None,
+                        tamanho_bloco: int) -> Iterator[tuple]:
+        posicao: int = self.__colunas(tabela).index(coluna)
+        restantes: int | None = limite
+        while restantes is None or restantes > 0:
+            bloco: int = tamanho_bloco if restantes is None else min(tamanho_bloco, restantes)
+            if cursor is None:
+                linhas: list = self._conn.execute(primeira, {'bloco': bloco}).fetchall()
+            else:
+                # seguinte: (depois de um valor, depois de um NULL)
+                valor, id = cursor
+                acao: str = seguinte[valor is None]
+                linhas = self._conn.execute(acao, {'valor': valor, 'id': id, 'bloco': bloco}).fetchall()
+            yield from self._linhas_do_banco(tabela, linhas)
+            if len(linhas) < bloco:
+                return
+            if restantes is not None:
+                restantes -= len(linhas)
+            cursor = (linhas[-1][posicao], linhas[-1][0])
+
+    def sair(self) -> None:
+        """
+        Libera o cursor desta instância. A conexão é compartilhada
+        e quem a fecha é o gerenciador.
+
+        return None
+        """
+        cursor: sq.Cursor | None = getattr(self.__local, 'cursor', None)
+        if cursor is not None:
+            self.__local.cursor = None
+            cursor.close()
+
+
+class MetodosSqlRV(_MetodosSqlBase):
+    def _existe_ativo(self, codigo: str) -> bool:
         """
         Param: codigo: str
         return: bool
         """
-        resultado: bool = False
-        self.__sub_acao_sql_select_all_com_id(id)
-        for i in self._cursor.fetchall():
-            if i[2] == id:
-                resultado = True
-        return resultado
+        return self._acao_sql_posicao('RV', 'codigo', codigo) is not None
 
-    def _get_id_rv(self, id: str) -> str:
+    def _get_id_rv(self, codigo: str) -> int:
         """
-        Param: id: str
-        return: int
+        Param: codigo: str
+        return: int -> -1 se o ativo não existir
         """
-        resultado: int = -1
-        if self._existe_ativo(id):
-            self.__sub_acao_sql_select_all_com_id(id)
-            for i in self._cursor.fetchall():
-                if i[2] == id:
-                    resultado = i[0]
-        return resultado
+        linha: tuple | None = self._acao_sql_posicao('RV', 'codigo', codigo)
+        return -1 if linha is None else linha[0]
 
-    def _quantidade_suficiente(self, id: str) -> bool:
+    def _quantidade_suficiente(self, codigo: str) -> bool:
         """
-        Param: id: str
-        Param: nome: str
         Param: codigo: str
-    
-        return bool
+
+        return bool -> True se o ativo existe e tem quantidade em carteira
         """
-        resultado: bool = False
-        if self._existe_ativo(id):
-            self.__sub_acao_sql_select_all_com_id(id)
-            for at in self._cursor.fetchall():
-                quantidade_disponivel: int = at[4]
-                
-            if quantidade_disponivel > 0:
-                resultado = True
-        return resultado
+        linha: tuple | None = self._acao_sql_posicao('RV', 'codigo', codigo)
+        return linha is not None and linha[4] > 0
 
     def acao_sql_cadastrar_ativo(self, ativo: Acao | Fiis) -> None:
         acao = "INSERT INTO RV" \
                 "(nome, codigo, categoria, quantidade, PU, PM, PT)" \
                 "VALUES (?, ?, ?, ?, ?, ?, ?)"
-        self._cursor.execute(acao, 
-                                 (ativo.nome,
-                                 ativo.codigo,
-                                 ativo.categoria,
-                                 ativo.quantidade,
-                                 ativo.preco_unitario,
-                                 ativo.preco_medio,
-                                 ativo.preco_total)
-                                 )
-        self._conn.commit()
-
-    def acao_aql_comprar_ativo(self, id: str, qtde: int, pu: float) -> None:
-        self.__sub_acao_sql_select_all_com_id(id)
-
-        for at in self._cursor.fetchall():
-            qtde_atual: int = at[4]
-            pm_atual: float = at[6]
-            
-            nova_qtde: int = qtde_atual + qtde
-            novo_pu: float = pu
-            if pm_atual <= 0:
-                novo_pm: float = pu
-            else:
-                novo_pm = (pm_atual + pu) / 2
-            novo_pt: float = novo_pm * nova_qtde
-            
-            acao_2 = "UPDATE RV SET quantidade=?, PU=?, PM=?, PT=? WHERE id=?"
-            self._cursor.execute(acao_2, (nova_qtde, novo_pu, novo_pm, novo_pt, id))
-            self._conn.commit()
+        with self._gravando('RV', evento=AtivoCadastrado) as novos:
+            self._cursor.execute(acao, 
+                                     (ativo.nome,
+                                     ativo.codigo,
+                                     ativo.categoria,
+                                     ativo.quantidade,
+                                     self._moeda.para_banco(ativo.preco_unitario_exato),
+                                     self._moeda.para_banco(ativo.preco_medio_exato),
+                                     self._moeda.para_banco(ativo.preco_total_exato))
+                                     )
+            novos.append(self._cursor.lastrowid)
+            self._commit()
 
-    def acao_sql_vender(self, id: str, qtde: int, pu: float) -> None:
-        self.__sub_acao_sql_select_all_com_id(id)
-        
-        for at in self._cursor.fetchall():
-            qtde_atual: int = at[4]
-            pm_atual: float = at[6]
-            
-            nova_qtde: int = qtde_atual - qtde
-            novo_pu: float = pu
-            if pm_atual <= 0:
-                novo_pm: float = pu
-            else:
-                novo_pm = (pm_atual + pu) / 2 
-            novo_pt: float = novo_pm * nova_qtde
-            
-            acao_2 = "UPDATE RV SET quantidade=?, PU=?, PM=?, PT=? WHERE id=?"
-            self._cursor.execute(acao_2, (nova_qtde, novo_pu, novo_pm, novo_pt, id))
-            self._conn.commit()
+    def acao_sql_cadastrar_ativos_em_lote(self, ativos: Iterable[Acao | Fiis]) -> ResultadoLote:
+        colunas: tuple = ('nome', 'codigo', 'categoria', 'quantidade', 'PU', 'PM', 'PT')
+        para_banco = self._moeda.para_banco
+        linhas = ((ativo.nome,
+                   ativo.codigo,
+                   ativo.categoria,
+                   ativo.quantidade,
+                   para_banco(ativo.preco_unitario_exato),
+                   para_banco(ativo.preco_medio_exato),
+                   para_banco(ativo.preco_total_exato)) for ativo in ativos)
+        return self._acao_sql_inserir_em_lote('RV', colunas, (0, 1), linhas)
+
+    def acao_sql_posicoes_iniciais_em_lote(self, linhas: Iterable[tuple], data: str | None = None) -> None:
+        """
+        Registra a compra inicial de ativos recém-cadastrados (posição zerada).
+
+        Param: linhas: Iterable -> (id, qtde, pu)
+        Param: data: str
+        """
+        para_banco = self._moeda.para_banco
+        linhas = [(id, qtde, para_banco(pu)) for id, qtde, pu in linhas]
+        acao = "UPDATE RV SET quantidade=?, PU=?, PM=?, PT=? WHERE id=?"
+        acao_2 = "INSERT INTO movimentacoes (tabela, ativo_id, tipo, quantidade, valor, data) " \
+                 "VALUES ('RV', ?, 'compra', ?, ?, ?)"
+        data = data or agora()
+        with self._gravando('RV', *(id for id, _, _ in linhas)):
+            self._acao_sql_executar_em_lote((acao, [(qtde, pu, pu, qtde * pu, id) for id, qtde, pu in linhas]),
+                                            (acao_2, [(id, qtde, pu, data) for id, qtde, pu in linhas]))
+        self._gerenciador.publicar(LoteGravado('RV', len(linhas)))
+
+    def acao_sql_movimentacoes_em_lote(self, linhas: Iterable[tuple]) -> int:
+        return self._acao_sql_movimentar_em_lote('RV', linhas)
+
+    def acao_aql_comprar_ativo(self, id: str, qtde: int, pu: float, data: str | None = None) -> None:
+        self._acao_sql_movimentar('RV', id, 'compra', qtde, pu, data)
+
+    def acao_sql_vender(self, id: str, qtde: int, pu: float, data: str | None = None) -> None:
+        self._acao_sql_movimentar('RV', id, 'venda', qtde, pu, data)
 
     def acao_sql_deletar_ativo(self, id: str) -> None:
         acao = "DELETE FROM RV WHERE id=?"
-        self._cursor.execute(acao, (id,))
-        self._conn.commit()
+        with self._gravando('RV', id, evento=AtivoExcluido):
+            self._cursor.execute(acao, (id,))
+            self._commit()
 
     def acao_sql_alterar_dados(self,
                                id: str,
@@ -134,33 +628,20 @@ class MetodosSqlRV:
                                codigo: str,
                                categoria: str) -> None:
         acao = "UPDATE RV SET nome=?, codigo=?, categoria=? WHERE id=?"
-        self._cursor.execute(acao, (nome, codigo, categoria, id))
-        self._conn.commit()
+        with self._gravando('RV', id, evento=AtivoAlterado):
+            self._cursor.execute(acao, (nome, codigo, categoria, id))
+            self._commit()
 
     def acao_sql_acertar_valor_qtde(self, id: str, qtde: int, pu: float) -> None:
-        acao = "UPDATE RV SET quantidade=?, PU=?, PT=? WHERE id=?"
-        valor_total = float(qtde * pu)
-        self._cursor.execute(acao, (qtde, pu, valor_total, id))
-        self._conn.commit()
+        self._acao_sql_movimentar('RV', id, 'ajuste', qtde, pu)
     
     def acao_sql_retorna_tot_invst(self):
         acao = "SELECT * FROM RV"
         self._cursor.execute(acao)
         tot = 0
 
-    def __sub_acao_sql_select_all_com_id(self, id: str) -> None:
-        acao = "SELECT * FROM RV WHERE id=?"
-        self._cursor.execute(acao, (id,))
-    
-    def sair(self) -> None:
-        self._conn.close()
-
 
-class MetodosSqlRF:
-    def __init__(self):
-        self._conn = sq.connect('data/data.db')
-        self._cursor = self._conn.cursor()
-        
+class MetodosSqlRF(_MetodosSqlBase):
     def _existe(self, nome: str) -> bool:    
         if self._get_id(nome) != -1:
             return True
@@ -168,65 +649,86 @@ class MetodosSqlRF:
             return False
     
     def _get_id(self, nome: str) -> int:
-        resultado: int = -1
-        acao: str = "SELECT * FROM RF WHERE nome=?"
-        self._cursor.execute(acao, (nome,))
-        for at in self._cursor.fetchall():
-            if at[1] == nome:
-                resultado = int(at[0])
-        return resultado
+        linha: tuple | None = self._acao_sql_posicao('RF', 'nome', nome)
+        return -1 if linha is None else int(linha[0])
 
     def acao_sql_alterar_saldo_apos_resgate(self,
                                             ativo: RendaFixa | TesouroDireto | ReservaEmergencia,
                                             qtde: int,
-                                            valor: float) -> None:
-        self.__sub_acao_sql_select_all_com_id(ativo)
-        for at in self._cursor.fetchall():
-            qtde_atual: int = at[2]
-            saldo_atual: float = at[5]
-            
-            if (qtde_atual - qtde) <= 0:
-                nova_qtde: int = 1
-            else:
-                nova_qtde = qtde_atual - qtde
-            novo_saldo: float = saldo_atual - valor
-        
-        acao_2: str = "UPDATE RF SET quantidade=?, valor_aplicado=? WHERE id=?"
-        self._cursor.execute(acao_2, (nova_qtde, novo_saldo, at[0]))
-        self._conn.commit()
+                                            valor: float,
+                                            data: str | None = None) -> None:
+        self._acao_sql_movimentar('RF', ativo, 'resgate', qtde, valor, data)
             
     def acao_sql_get_saldo(self, ativo: RendaFixa | TesouroDireto | ReservaEmergencia) -> float | int:
-        self.__sub_acao_sql_select_all_com_id(ativo)
-        for at in self._cursor.fetchall():
-            saldo: int | float = at[5]
-        return saldo
+        linha: tuple | None = self._acao_sql_posicao('RF', 'id', ativo)
+        if linha is None:
+            raise AtivoNaoCadastradoError(f'Ativo {ativo} não cadastrado.')
+        return self._moeda.do_banco(linha[5])
+
+    def acao_sql_vencimentos_entre(self, inicio: datetime.date | str, fim: datetime.date | str) -> list:
+        acao: str = "SELECT RF.* FROM datas_rf JOIN RF ON RF.id = datas_rf.ativo_id " \
+                    "WHERE datas_rf.vencimento BETWEEN ? AND ? " \
+                    "ORDER BY datas_rf.vencimento, datas_rf.ativo_id"
+        self._cursor.execute(acao, (data_iso(inicio), data_iso(fim)))
+        return self._linhas_do_banco('RF', self._cursor.fetchall())
 
     def acao_sql_insert(self, ativo: RendaFixa | TesouroDireto | ReservaEmergencia) -> None:
         acao = "INSERT INTO RF" \
-                "(nome, quantidade, categoria, resgate, valor_aplicado, vencimento, rentabilidade)" \
-                "VALUES (?, ?, ?, ?, ?, ?, ?)"
-        self._cursor.execute(acao, (ativo.nome,
-                                    ativo.quantidade,
-                                    ativo.categoria,
-                                    ativo.resgate,
-                                    ativo.valor_aplicado,
-                                    ativo.vencimento,
-                                    ativo.rentabilidade)
-                                )
-        self._conn.commit()
+                "(nome, quantidade, categoria, resgate, valor_aplicado, vencimento, rentabilidade, " \
+                "indexador, multiplicador, spread, base)" \
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        with self._gravando('RF', evento=AtivoCadastrado) as novos:
+            self._cursor.execute(acao, (ativo.nome,
+                                        ativo.quantidade,
+                                        ativo.categoria,
+                                        ativo.resgate,
+                                        self._moeda.para_banco(ativo.valor_aplicado_exato),
+                                        ativo.vencimento,
+                                        ativo.rentabilidade,
+                                        *colunas_taxa(ativo.rentabilidade))
+                                    )
+            novos.append(self._cursor.lastrowid)
+            self._commit()
                 
-    def acao_sql_comprar(self, id, qtde: int, valor: float) -> None:
-        self.__sub_acao_sql_select_all_com_id(id)
-        for at in self._cursor.fetchall():
-            qtde_atual: int = at[2]
-            valor_atual: float = at[5]
-            
-            nova_qtde: int = qtde_atual + qtde
-            novo_valor: float = valor_atual + valor
-            
-            acao_2: str = "UPDATE RF SET quantidade=?, valor_aplicado=? WHERE id=?"
-            self._cursor.execute(acao_2, (nova_qtde, novo_valor, str(at[0])))
-            self._conn.commit()
+    def acao_sql_insert_em_lote(self,
+                                ativos: Iterable[RendaFixa | TesouroDireto | ReservaEmergencia]) -> ResultadoLote:
+        colunas: tuple = ('nome', 'quantidade', 'categoria', 'resgate',
+                          'valor_aplicado', 'vencimento', 'rentabilidade',
+                          'indexador', 'multiplicador', 'spread', 'base')
+        para_banco = self._moeda.para_banco
+        linhas = ((ativo.nome,
+                   ativo.quantidade,
+                   ativo.categoria,
+                   ativo.resgate,
+                   para_banco(ativo.valor_aplicado_exato),
+                   ativo.vencimento,
+                   ativo.rentabilidade,
+                   *colunas_taxa(ativo.rentabilidade)) for ativo in ativos)
+        return self._acao_sql_inserir_em_lote('RF', colunas, (0,), linhas)
+
+    def acao_sql_posicoes_iniciais_em_lote(self, linhas: Iterable[tuple], data: str | None = None) -> None:
+        """
+        Registra a aplicação inicial de ativos recém-cadastrados (posição zerada).
+
+        Param: linhas: Iterable -> (id, valor, quantidade)
+        Param: data: str
+        """
+        para_banco = self._moeda.para_banco
+        linhas = [(id, para_banco(valor), quantidade) for id, valor, quantidade in linhas]
+        acao: str = "UPDATE RF SET valor_aplicado=?, quantidade=? WHERE id=?"
+        acao_2: str = "INSERT INTO movimentacoes (tabela, ativo_id, tipo, quantidade, valor, data) " \
+                      "VALUES ('RF', ?, 'compra', ?, ?, ?)"
+        data = data or agora()
+        with self._gravando('RF', *(id for id, _, _ in linhas)):
+            self._acao_sql_executar_em_lote((acao, [(valor, quantidade, id) for id, valor, quantidade in linhas]),
+                                            (acao_2, [(id, quantidade, valor, data) for id, valor, quantidade in linhas]))
+        self._gerenciador.publicar(LoteGravado('RF', len(linhas)))
+
+    def acao_sql_movimentacoes_em_lote(self, linhas: Iterable[tuple]) -> int:
+        return self._acao_sql_movimentar_em_lote('RF', linhas)
+
+    def acao_sql_comprar(self, id, qtde: int, valor: float, data: str | None = None) -> None:
+        self._acao_sql_movimentar('RF', id, 'compra', qtde, valor, data)
     
     def acao_sql_alterar_dados(self,
                                 id: str,
@@ -243,30 +745,24 @@ class MetodosSqlRF:
                 n_vencimento: str = data_vencimento
                 n_rent: str = rentabilidade
                 
-                acao_2: str = "UPDATE RF SET nome=?, categoria=?, resgate=?, vencimento=?, rentabilidade=? WHERE id=?"
-                self._cursor.execute(acao_2, (n_nome, n_categoria, n_data_resgate, n_vencimento, n_rent, id))
-                self._conn.commit()
+                acao_2: str = "UPDATE RF SET nome=?, categoria=?, resgate=?, vencimento=?, rentabilidade=?, " \
+                              "indexador=?, multiplicador=?, spread=?, base=? WHERE id=?"
+                with self._gravando('RF', id, evento=AtivoAlterado):
+                    self._cursor.execute(acao_2, (n_nome, n_categoria, n_data_resgate, n_vencimento, n_rent,
+                                                  *colunas_taxa(n_rent), id))
+                    self._commit()
     
     def acao_sql_acertar_valor_aplicado(self, id: str, valor: float, quantidade: int) -> None:
-        self.__sub_acao_sql_select_all_com_id(id)      
-        for at in self._cursor.fetchall():
-            novo_valor: float = valor
-            nova_qtde: int = quantidade
-
-            acao_2: str = "UPDATE RF SET quantidade=?, valor_aplicado=? WHERE id=?"
-            self._cursor.execute(acao_2, (nova_qtde, novo_valor, at[0]))
-            self._conn.commit()
+        self._acao_sql_movimentar('RF', id, 'ajuste', quantidade, valor)
             
     def acao_sql_deletar_ativo(self, ativo: RendaFixa | TesouroDireto | ReservaEmergencia) -> None:
         ident: int = self._get_id(ativo)
             
         acao = "DELETE FROM RF WHERE id=?"
-        self._cursor.execute(acao, (ident,))
-        self._conn.commit()
+        with self._gravando('RF', ident, evento=AtivoExcluido):
+            self._cursor.execute(acao, (ident,))
+            self._commit()
         
     def __sub_acao_sql_select_all_com_id(self, id: str) -> None:
         acao: str = "SELECT * FROM RF WHERE id=?"
         self._cursor.execute(acao, (id,))
-        
-    def sair(self) -> None:
-        self._conn.close()
@@ -0,0 +1,281 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+from datetime import datetime
+
+from calculos.custo_medio import AJUSTE, atualizar_custo_medio, posicoes_finais
+
+from .centavos import CENTAVOS, usa_centavos
+
+TIPOS: tuple = ('compra', 'venda', 'resgate', 'ajuste')
+
+# colunas do retrato (snapshot) mantido em cada tabela
+COLUNAS_POSICAO: dict = {'RV': ('quantidade', 'PU', 'PM', 'PT'),
+                         'RF': ('quantidade', 'valor_aplicado')}
+
+
+def aplicar_movimentacao_rv(estado: tuple, tipo: str, quantidade: int, valor: float) -> tuple:
+    """
+    Calcula a nova posição de renda variável após uma movimentação,
+    com o preço médio ponderado pelas quantidades.
+
+    Param: estado: tuple -> (quantidade, PU, PM, PT)
+    Param: tipo: str -> compra | venda | ajuste
+    Param: quantidade: int
+    Param: valor: float -> preço unitário
+
+    return tuple -> (quantidade, PU, PM, PT)
+    """
+    qtde_atual, _, pm_atual, _ = estado
+    nova_qtde, novo_pm, _ = atualizar_custo_medio(qtde_atual, pm_atual, tipo, quantidade, valor)
+    return (nova_qtde, valor, novo_pm, novo_pm * nova_qtde)
+
+
+def aplicar_movimentacao_rf(estado: tuple, tipo: str, quantidade: int, valor: float) -> tuple:
+    """
+    Calcula a nova posição de renda fixa após uma movimentação.
+
+    Param: estado: tuple -> (quantidade, valor_aplicado)
+    Param: tipo: str -> compra | resgate | ajuste
+    Param: quantidade: int
+    Param: valor: float -> valor movimentado
+
+    return tuple -> (quantidade, valor_aplicado)
+    """
+    qtde_atual, saldo_atual = estado
+    if tipo == 'ajuste':
+        return (quantidade, valor)
+    if tipo == 'compra':
+        return (qtde_atual + quantidade, saldo_atual + valor)
+    nova_qtde: int = 1 if (qtde_atual - quantidade) <= 0 else qtde_atual - quantidade
+    return (nova_qtde, saldo_atual - valor)
+
+
+def _dividir(dividendo: int, divisor: int) -> int:
+    # divisão inteira arredondada (meio para cima) para valores >= 0,
+    # igual à expressão (2 * a + b) / (2 * b) usada em ATUALIZACOES_CENTAVOS
+    return (2 * dividendo + divisor) // (2 * divisor)
+
+
+def aplicar_movimentacao_rv_centavos(estado: tuple, tipo: str, quantidade: int, valor: int) -> tuple:
+    """
+    Mesma regra de aplicar_movimentacao_rv com dinheiro em centavos.
+    O custo total (PT) é a referência: soma exata nas compras e rateio
+    proporcional, arredondado ao centavo, nas vendas; o preço médio é
+    PT / quantidade arredondado.
+
+    Param: estado: tuple -> (quantidade, PU, PM, PT) em centavos
+    Param: tipo: str -> compra | venda | ajuste
+    Param: quantidade: int
+    Param: valor: int -> preço unitário em centavos
+
+    return tuple -> (quantidade, PU, PM, PT)
+    """
+    qtde_atual, _, pm_atual, pt_atual = estado
+    if tipo == 'compra':
+        nova_qtde: int = qtde_atual + quantidade
+        if nova_qtde <= 0:
+            return (nova_qtde, valor, 0, 0)
+        novo_pt: int = pt_atual + quantidade * valor
+        return (nova_qtde, valor, _dividir(novo_pt, nova_qtde), novo_pt)
+    if tipo == 'venda':
+        nova_qtde = qtde_atual - quantidade
+        if nova_qtde <= 0:
+            return (nova_qtde, valor, 0, 0)
+        return (nova_qtde, valor, pm_atual, _dividir(pt_atual * nova_qtde, qtde_atual))
+    # ajuste: a posição passa a valer a quantidade ao preço informado
+    if quantidade <= 0:
+        return (quantidade, valor, 0, 0)
+    return (quantidade, valor, valor, valor * quantidade)
+
+
+APLICAR: dict = {'RV': aplicar_movimentacao_rv, 'RF': aplicar_movimentacao_rf}
+# renda fixa só soma e subtrai, então a mesma regra vale para centavos
+APLICAR_CENTAVOS: dict = {'RV': aplicar_movimentacao_rv_centavos, 'RF': aplicar_movimentacao_rf}
+
+# As mesmas regras de aplicar_movimentacao_* escritas em SQL, para que a
+# posição seja atualizada em um único UPDATE, sem ler a linha antes.
+# (tabela, tipo) -> (atribuições, condição extra do WHERE)
+_PM_COMPRA: str = "(quantidade * PM + :qtde * :valor) / (quantidade + :qtde)"
+ATUALIZACOES: dict = {
+    ('RV', 'compra'): ("quantidade = quantidade + :qtde, PU = :valor, "
+                       f"PM = CASE WHEN quantidade + :qtde > 0 THEN {_PM_COMPRA} ELSE 0.0 END, "
+                       f"PT = CASE WHEN quantidade + :qtde > 0 THEN {_PM_COMPRA} * (quantidade + :qtde) ELSE 0.0 END",
+                       ''),
+    ('RV', 'venda'): ("quantidade = quantidade - :qtde, PU = :valor, "
+                      "PM = CASE WHEN quantidade - :qtde > 0 THEN PM ELSE 0.0 END, "
+                      "PT = CASE WHEN quantidade - :qtde > 0 THEN PM * (quantidade - :qtde) ELSE 0.0 END",
+                      'quantidade >= :qtde'),
+    ('RV', 'ajuste'): ("quantidade = :qtde, PU = :valor, "
+                       "PM = CASE WHEN :qtde > 0 THEN :valor ELSE 0.0 END, "
+                       "PT = CASE WHEN :qtde > 0 THEN :qtde * :valor ELSE 0.0 END",
+                       ''),
+    ('RF', 'compra'): ("quantidade = quantidade + :qtde, valor_aplicado = valor_aplicado + :valor", ''),
+    ('RF', 'resgate'): ("quantidade = CASE WHEN quantidade - :qtde <= 0 THEN 1 ELSE quantidade - :qtde END, "
+                        "valor_aplicado = valor_aplicado - :valor",
+                        'valor_aplicado >= :valor'),
+    ('RF', 'ajuste'): ("quantidade = :qtde, valor_aplicado = :valor", ''),
+}
+
+# As regras de aplicar_movimentacao_rv_centavos, só com aritmética inteira.
+_PT_COMPRA: str = "PT + :qtde * :valor"
+_RATEIO: str = "(2 * PT * {qtde} + quantidade) / (2 * quantidade)"
+ATUALIZACOES_CENTAVOS: dict = ATUALIZACOES | {
+    ('RV', 'compra'): ("quantidade = quantidade + :qtde, PU = :valor, "
+                       f"PM = CASE WHEN quantidade + :qtde > 0 "
+                       f"THEN (2 * ({_PT_COMPRA}) + quantidade + :qtde) / (2 * (quantidade + :qtde)) ELSE 0 END, "
+                       f"PT = CASE WHEN quantidade + :qtde > 0 THEN {_PT_COMPRA} ELSE 0 END",
+                       ''),
+    ('RV', 'venda'): ("quantidade = quantidade - :qtde, PU = :valor, "
+                      "PM = CASE WHEN quantidade - :qtde > 0 THEN PM ELSE 0 END, "
+                      "PT = CASE WHEN quantidade - :qtde > 0 "
+                      f"THEN {_RATEIO.format(qtde='(quantidade - :qtde)')} ELSE 0 END",
+                      'quantidade >= :qtde'),
+    ('RV', 'ajuste'): ("quantidade = :qtde, PU = :valor, "
+                       "PM = CASE WHEN :qtde > 0 THEN :valor ELSE 0 END, "
+                       "PT = CASE WHEN :qtde > 0 THEN :qtde * :valor ELSE 0 END",
+                       ''),
+}
+
+
+def agora() -> str:
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
+def registrar_movimentacao(conn: sq.Connection,
+                           tabela: str,
+                           ativo_id: int,
+                           tipo: str,
+                           quantidade: int,
+                           valor: float,
+                           data: str | None = None) -> int:
+    """
+    Acrescenta uma movimentação ao livro. Quem chama é responsável
+    pelo commit, junto com a atualização da posição.
+
+    Param: conn: sqlite3.Connection
+    Param: tabela: str -> RV | RF
+    Param: ativo_id: int
+    Param: tipo: str
+    Param: quantidade: int
+    Param: valor: float
+    Param: data: str -> ISO 8601; agora, se omitida
+
+    return int -> id da movimentação
+    """
+    acao: str = "INSERT INTO movimentacoes (tabela, ativo_id, tipo, quantidade, valor, data) " \
+                "VALUES (?, ?, ?, ?, ?, ?)"
+    cursor: sq.Cursor = conn.execute(acao, (tabela, int(ativo_id), tipo, quantidade, valor, data or agora()))
+    return cursor.lastrowid
+
+
+def historico(conn: sq.Connection, tabela: str, ativo_id: int) -> list:
+    """
+    Param: conn: sqlite3.Connection
+    Param: tabela: str
+    Param: ativo_id: int
+
+    return list -> [(id, tipo, quantidade, valor, data), ...] em ordem cronológica
+    """
+    acao: str = "SELECT id, tipo, quantidade, valor, data FROM movimentacoes " \
+                "WHERE tabela=? AND ativo_id=? ORDER BY id"
+    return conn.execute(acao, (tabela, int(ativo_id))).fetchall()
+
+
+def criar_checkpoint(conn: sq.Connection) -> int:
+    """
+    Guarda a posição atual de todos os ativos junto com a última
+    movimentação já refletida nela. Quem chama é responsável pelo commit.
+
+    Param: conn: sqlite3.Connection
+
+    return int -> id da última movimentação incluída
+    """
+    ultima: int = conn.execute("SELECT COALESCE(MAX(id), 0) FROM movimentacoes").fetchone()[0]
+    conn.execute("DELETE FROM checkpoints_posicoes")
+    conn.execute("INSERT INTO checkpoints_posicoes (tabela, ativo_id, movimentacao_id, quantidade, PU, PM, valor) "
+                 "SELECT 'RV', id, ?, quantidade, PU, PM, PT FROM RV", (ultima,))
+    conn.execute("INSERT INTO checkpoints_posicoes (tabela, ativo_id, movimentacao_id, quantidade, PU, PM, valor) "
+                 "SELECT 'RF', id, ?, quantidade, 0, 0, valor_aplicado FROM RF", (ultima,))
+    return ultima
+
+
+def reconstruir_posicoes(conn: sq.Connection) -> int:
+    """
+    Refaz a posição de RV e RF partindo do checkpoint de cada ativo
+    (ou de zero) e reaplicando as movimentações posteriores a ele.
+    Quem chama é responsável pelo commit.
+
+    Param: conn: sqlite3.Connection
+
+    return int -> quantidade de ativos reconstruídos
+    """
+    total: int = 0
+    regras: dict = APLICAR_CENTAVOS if usa_centavos(conn) else APLICAR
+    for tabela, colunas in COLUNAS_POSICAO.items():
+        aplicar = regras[tabela]
+        estados: dict = {}
+        inicio: dict = {}
+
+        acao: str = "SELECT ativo_id, movimentacao_id, quantidade, PU, PM, valor " \
+                    "FROM checkpoints_posicoes WHERE tabela=?"
+        for ativo_id, movimentacao_id, quantidade, pu, pm, valor in conn.execute(acao, (tabela,)):
+            estados[ativo_id] = (quantidade, pu, pm, valor) if tabela == 'RV' else (quantidade, valor)
+            inicio[ativo_id] = movimentacao_id
+
+        vazio: tuple = (0, 0, 0, 0) if tabela == 'RV' else (0, 0)
+        acao = "SELECT id, ativo_id, tipo, quantidade, valor FROM movimentacoes " \
+               "WHERE tabela=? ORDER BY ativo_id, id"
+        for ident, ativo_id, tipo, quantidade, valor in conn.execute(acao, (tabela,)):
+            if ident <= inicio.get(ativo_id, 0):
+                continue
+            estados[ativo_id] = aplicar(estados.get(ativo_id, vazio), tipo, quantidade, valor)
+
+        atribuicoes: str = ', '.join(f'{coluna}=?' for coluna in colunas)
+        conn.executemany(f"UPDATE {tabela} SET {atribuicoes} WHERE id=?",
+                         [(*estado, ativo_id) for ativo_id, estado in estados.items()])
+        total += len(estados)
+    return total
+
+
+def apurar_custo_medio(conn: sq.Connection) -> dict:
+    """
+    Recalcula, em uma passada vetorizada sobre o livro, quantidade,
+    preço médio, custo total e lucro realizado de cada ativo de renda
+    variável. O checkpoint de cada ativo entra como posição inicial.
+    Em bancos com dinheiro em centavos o cálculo é feito em centavos e
+    devolvido em reais como Decimal, arredondado ao centavo, como nas
+    demais leituras desse modo (ver data.centavos).
+
+    Param: conn: sqlite3.Connection
+
+    return dict -> {id: (quantidade, PM, PT, lucro realizado)}
+    """
+    acao: str = "SELECT ativo_id, ?, quantidade, PM FROM checkpoints_posicoes " \
+                "WHERE tabela='RV' AND quantidade > 0"
+    linhas: list = conn.execute(acao, (AJUSTE,)).fetchall()
+    acao = "SELECT m.ativo_id, m.tipo, m.quantidade, m.valor FROM movimentacoes m " \
+           "LEFT JOIN checkpoints_posicoes c ON c.tabela = m.tabela AND c.ativo_id = m.ativo_id " \
+           "WHERE m.tabela='RV' AND m.id > COALESCE(c.movimentacao_id, 0) ORDER BY m.ativo_id, m.id"
+    linhas += conn.execute(acao).fetchall()
+    if not linhas:
+        return {}
+    posicoes: dict = posicoes_finais(*zip(*linhas))
+    if usa_centavos(conn):
+        reais = CENTAVOS.do_banco
+        posicoes = {ativo: (quantidade, reais(round(pm)), reais(round(pt)), reais(round(lucro)))
+                    for ativo, (quantidade, pm, pt, lucro) in posicoes.items()}
+    return posicoes
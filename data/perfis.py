@@ -0,0 +1,73 @@
+import sqlite3 as sq
+from typing import NamedTuple
+
+
+class PerfilDesempenho(NamedTuple):
+    """
+    Ajustes do SQLite aplicados a cada conexão aberta pelo gerenciador.
+
+    journal_mode: DELETE (padrão do SQLite) ou WAL
+    synchronous: OFF | NORMAL | FULL
+    cache_size: páginas; negativo para KiB
+    mmap_size: bytes lidos via mmap (0 desliga)
+    temp_store: DEFAULT | FILE | MEMORY
+    busy_timeout: ms de espera quando outra conexão está gravando
+    """
+    nome: str
+    journal_mode: str
+    synchronous: str
+    cache_size: int
+    mmap_size: int
+    temp_store: str
+    busy_timeout: int
+
+
+PERFIS: dict = {
+    # comportamento anterior: o que o SQLite faz sem nenhum ajuste
+    'compativel': PerfilDesempenho('compativel', 'DELETE', 'FULL', -2000, 0, 'DEFAULT', 5000),
+    # WAL sem abrir mão de sincronizar cada commit
+    'seguro': PerfilDesempenho('seguro', 'WAL', 'FULL', -16000, 64 * 2 ** 20, 'MEMORY', 5000),
+    # WAL + NORMAL: uma queda de energia pode perder os últimos commits,
+    # mas nunca deixa o banco inconsistente
+    'equilibrado': PerfilDesempenho('equilibrado', 'WAL', 'NORMAL', -32000, 256 * 2 ** 20, 'MEMORY', 5000),
+}
+
+PERFIL_PADRAO: str = 'equilibrado'
+
+# usado por GerenciadorConexao.modo_lote durante importações
+PERFIL_LOTE: PerfilDesempenho = PerfilDesempenho('lote', 'WAL', 'OFF', -128000, 256 * 2 ** 20, 'MEMORY', 5000)
+
+
+def obter_perfil(perfil: str | PerfilDesempenho) -> PerfilDesempenho:
+    """
+    Param: perfil: str -> nome em PERFIS | PerfilDesempenho
+
+    return PerfilDesempenho
+    """
+    if isinstance(perfil, PerfilDesempenho):
+        return perfil
+    try:
+        return PERFIS[perfil]
+    except KeyError:
+        raise ValueError(f'Perfil desconhecido: {perfil}. Opções: {", ".join(PERFIS)}') from None
+
+
+def aplicar_perfil(conn: sq.Connection, perfil: PerfilDesempenho, sessao: bool = False) -> None:
+    """
+    Aplica o perfil à conexão. Com sessao=True aplica apenas os ajustes
+    que valem para a conexão e podem mudar a qualquer momento, sem
+    trocar o journal_mode.
+
+    Param: conn: sqlite3.Connection
+    Param: perfil: PerfilDesempenho
+    Param: sessao: bool
+
+    return None
+    """
+    if not sessao:
+        conn.execute(f'PRAGMA busy_timeout = {int(perfil.busy_timeout)}')
+        conn.execute(f'PRAGMA journal_mode = {perfil.journal_mode}')
+        conn.execute(f'PRAGMA mmap_size = {int(perfil.mmap_size)}')
+        conn.execute(f'PRAGMA temp_store = {perfil.temp_store}')
+    conn.execute(f'PRAGMA synchronous = {perfil.synchronous}')
+    conn.execute(f'PRAGMA cache_size = {int(perfil.cache_size)}')
@@ -0,0 +1,188 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import datetime
+import sqlite3 as sq
+from itertools import chain
+from typing import Iterable
+
+import numpy as np
+
+from calculos.rendimento import DIAS_UTEIS_ANO, PRE, TaxaRentabilidade, interpretar_rentabilidade, valor_bruto
+
+from .centavos import usa_centavos
+from .datas import data_iso
+
+# taxa usada quando a rentabilidade cadastrada não é reconhecida: o
+# ativo fica pelo valor aplicado
+SEM_RENDIMENTO: TaxaRentabilidade = TaxaRentabilidade(PRE, 0.0, 0.0)
+
+# taxa estruturada de um ativo de RF, como lida por _taxas_rf
+_TAXA_RF: np.dtype = np.dtype([('id', np.int64), ('indexador', 'U8'), ('multiplicador', np.float64),
+                               ('spread', np.float64), ('base', np.int64)])
+
+
+def colunas_taxa(rentabilidade: str) -> tuple:
+    """
+    Param: rentabilidade: str -> texto cadastrado
+
+    return tuple -> (indexador, multiplicador, spread, base) para as
+                    colunas de RF; só None se o texto não for reconhecido
+    """
+    try:
+        return tuple(interpretar_rentabilidade(rentabilidade))
+    except ValueError:
+        return (None, None, None, None)
+
+
+def preencher_taxas_rf(conn: sq.Connection, todas: bool = False) -> int:
+    """
+    Interpreta a rentabilidade dos ativos de RF ainda sem taxa
+    estruturada e grava o resultado nas colunas indexador,
+    multiplicador, spread e base. Os repositórios já gravam essas
+    colunas; isto cobre bancos antigos e gravações feitas por fora.
+    Quem chama é responsável pelo commit.
+
+    Param: conn: sqlite3.Connection
+    Param: todas: bool -> reinterpretar também as que já têm taxa
+
+    return int -> ativos atualizados
+    """
+    condicao: str = '' if todas else 'WHERE indexador IS NULL'
+    linhas: list = conn.execute(f"SELECT id, rentabilidade FROM RF {condicao}").fetchall()
+    atualizacoes: list = []
+    for id, texto in linhas:
+        colunas: tuple = colunas_taxa(texto)
+        # textos não reconhecidos ficam sem taxa e não são regravados
+        if todas or colunas[0] is not None:
+            atualizacoes.append((*colunas, id))
+    conn.executemany("UPDATE RF SET indexador=?, multiplicador=?, spread=?, base=? WHERE id=?", atualizacoes)
+    return len(atualizacoes)
+
+
+def gravar_indices(conn: sq.Connection, indice: str, linhas: Iterable[tuple]) -> int:
+    """
+    Grava (ou substitui) a série diária de um indexador. Quem chama é
+    responsável pelo commit.
+
+    Param: conn: sqlite3.Connection
+    Param: indice: str -> CDI | SELIC | IPCA
+    Param: linhas: Iterable -> (data, taxa do dia) ; data como date,
+                   'dd/mm/aaaa' ou 'aaaa-mm-dd' e taxa como fração
+                   (ver calculos.rendimento.taxa_diaria)
+
+    return int -> linhas gravadas
+    """
+    acao: str = "INSERT INTO indices_diarios (indice, data, taxa) VALUES (?, ?, ?) " \
+                "ON CONFLICT (indice, data) DO UPDATE SET taxa = excluded.taxa"
+    linhas = [(indice.upper(), data_iso(data), float(taxa)) for data, taxa in linhas]
+    conn.executemany(acao, linhas)
+    return len(linhas)
+
+
+def carregar_series(conn: sq.Connection) -> dict:
+    """
+    Param: conn: sqlite3.Connection
+
+    return dict -> {indexador: (datas datetime64[D], taxas diárias)} em ordem de data
+    """
+    series: dict = {}
+    indices: list = [indice for indice, in conn.execute("SELECT DISTINCT indice FROM indices_diarios")]
+    for indice in indices:
+        acao: str = "SELECT data, taxa FROM indices_diarios WHERE indice=? ORDER BY data"
+        datas, taxas = zip(*conn.execute(acao, (indice,)))
+        series[indice] = (np.array(datas, dtype='datetime64[D]'), np.array(taxas, dtype=np.float64))
+    return series
+
+
+def _taxa(texto: str) -> TaxaRentabilidade:
+    try:
+        return interpretar_rentabilidade(texto)
+    except ValueError:
+        return SEM_RENDIMENTO
+
+
+def marcar_renda_fixa(conn: sq.Connection, ate: datetime.date | str | None = None) -> dict:
+    """
+    Valor bruto atual de cada ativo de renda fixa, calculado a partir do
+    livro de movimentações e das séries de indexadores. Cada compra
+    rende desde a sua data; resgates deixam de render na data do
+    resgate; um ajuste substitui tudo o que veio antes dele. O valor
+    do checkpoint (posições anteriores ao livro) não tem data e entra
+    sem rendimento. Movimentações posteriores a `ate` não entram e
+    rentabilidades não reconhecidas não rendem. A taxa vem das colunas
+    estruturadas de RF; o texto só é interpretado (com memorização)
+    nos ativos ainda sem elas.
+
+    Param: conn: sqlite3.Connection
+    Param: ate: datetime.date | str -> hoje, se omitida
+
+    return dict -> {id: valor bruto em reais}
+    """
+    data_final: str = data_iso(ate or datetime.date.today())
+    # o ajuste mais recente de cada ativo até a data, calculado uma vez
+    # para todos em vez de uma subconsulta por linha
+    ajustes: str = "WITH ajustes AS (SELECT ativo_id, MAX(id) AS id FROM movimentacoes " \
+                   "WHERE tabela = 'RF' AND tipo = 'ajuste' AND substr(data, 1, 10) <= :ate GROUP BY ativo_id) "
+    # só números: o dia vai como dias desde 1970-01-01
+    dia: str = "CAST(julianday(substr(m.data, 1, 10)) - 2440587.5 AS INTEGER)"
+    acao: str = f"{ajustes}SELECT m.ativo_id, CASE m.tipo WHEN 'resgate' THEN -m.valor ELSE m.valor END, {dia} " \
+                "FROM movimentacoes m " \
+                "LEFT JOIN checkpoints_posicoes c ON c.tabela = 'RF' AND c.ativo_id = m.ativo_id " \
+                "LEFT JOIN ajustes j ON j.ativo_id = m.ativo_id " \
+                "WHERE m.tabela = 'RF' AND m.id > COALESCE(c.movimentacao_id, 0) " \
+                "AND m.id >= COALESCE(j.id, 0) AND substr(m.data, 1, 10) <= :ate " \
+                "AND m.ativo_id IN (SELECT id FROM RF) " \
+                "UNION ALL " \
+                "SELECT c.ativo_id, c.valor, julianday(:ate) - 2440587.5 " \
+                "FROM checkpoints_posicoes c JOIN RF ON RF.id = c.ativo_id " \
+                "LEFT JOIN ajustes j ON j.ativo_id = c.ativo_id " \
+                "WHERE c.tabela = 'RF' AND c.valor <> 0 AND c.movimentacao_id >= COALESCE(j.id, 0)"
+    cursor = conn.execute(acao, {'ate': data_final})
+    # as linhas vão direto para o array, sem a lista intermediária de tuplas
+    linhas: np.ndarray = np.fromiter(chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 3)
+    if len(linhas) == 0:
+        return {}
+    ativos: np.ndarray = linhas[:, 0].astype(np.int64)
+    valores: np.ndarray = linhas[:, 1] / 100 if usa_centavos(conn) else linhas[:, 1]
+
+    # a taxa é lida uma vez por ativo e espalhada pelas movimentações
+    ids, indexadores, multiplicadores, spreads, bases = _taxas_rf(conn)
+    posicoes: np.ndarray = np.searchsorted(ids, ativos)
+    return valor_bruto(ativos,
+                       valores,
+                       linhas[:, 2].astype(np.int64).astype('datetime64[D]'),
+                       indexadores[posicoes],
+                       multiplicadores[posicoes],
+                       spreads[posicoes],
+                       np.datetime64(data_final, 'D'),
+                       carregar_series(conn),
+                       bases[posicoes])
+
+
+def _taxas_rf(conn: sq.Connection) -> tuple:
+    # (ids em ordem, indexadores, multiplicadores, spreads, bases) de RF;
+    # ativos sem taxa estruturada têm o texto interpretado aqui
+    acao: str = "SELECT id, COALESCE(indexador, ''), COALESCE(multiplicador, 0), COALESCE(spread, 0), " \
+                f"COALESCE(base, {DIAS_UTEIS_ANO}) FROM RF ORDER BY id"
+    taxas: np.ndarray = np.fromiter(conn.execute(acao), dtype=_TAXA_RF)
+    indexadores: np.ndarray = taxas['indexador'].astype(object)
+    sem_taxa: np.ndarray = np.flatnonzero(indexadores == '')
+    if len(sem_taxa):
+        textos: dict = dict(conn.execute("SELECT id, rentabilidade FROM RF WHERE indexador IS NULL"))
+        for posicao in sem_taxa:
+            indexadores[posicao], taxas['multiplicador'][posicao], taxas['spread'][posicao], taxas['base'][posicao] = \
+                _taxa(textos[taxas['id'][posicao]])
+    return taxas['id'], indexadores, taxas['multiplicador'], taxas['spread'], taxas['base']
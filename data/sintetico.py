@@ -0,0 +1,448 @@
+try:
+    import os
+    import sys
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import argparse
+import datetime
+import string
+from operator import itemgetter
+from typing import NamedTuple
+
+import numpy as np
+
+from ativos.acoes import Acao
+from ativos.fiis import Fiis
+from ativos.renda_fixa import RendaFixa
+from ativos.reserva_emergencia import ReservaEmergencia
+from ativos.tesouro_direto import TesouroDireto
+
+from .conexao import CAMINHO_PADRAO, GerenciadorConexao
+from .data import RepositorioRendaFixa, RepositorioRendaVariavel
+from .perfis import PERFIL_PADRAO, PERFIS
+
+# fração dos ativos gerados em cada categoria
+PROPORCOES: dict = {
+    'Ações': 0.35,
+    'FIIs': 0.15,
+    'Renda Fixa': 0.25,
+    'Tesouro Direto': 0.15,
+    'Reserva de Emergência': 0.10,
+}
+
+# sufixos dos códigos de negociação; ações e FIIs não se repetem
+SUFIXOS_ACOES: tuple = ('3', '4', '5', '6')
+CLASSES_ACOES: dict = {'3': 'ON', '4': 'PN', '5': 'PNA', '6': 'PNB'}
+SUFIXOS_FIIS: tuple = ('11', '12', '13', '14')
+RADICAIS: int = 26 ** 4
+
+SETORES: tuple = ('Energia', 'Banco', 'Siderúrgica', 'Varejo', 'Saneamento', 'Construtora',
+                  'Mineração', 'Telecom', 'Seguradora', 'Papel e Celulose', 'Petroquímica', 'Logística')
+SEGMENTOS_FII: tuple = ('Logística', 'Lajes Corporativas', 'Shoppings', 'Recebíveis', 'Renda Urbana',
+                        'Agências', 'Hotéis', 'Fundo de Fundos')
+EMISSORES: tuple = ('Banco Alfa', 'Banco Horizonte', 'Banco Sul', 'Financeira Norte', 'Banco Cooperativo',
+                    'Banco Digital', 'Corretora Prime', 'Banco Atlântico')
+PRODUTOS_RF: tuple = ('CDB', 'LCI', 'LCA', 'CRI', 'CRA', 'Debênture')
+TITULOS_TESOURO: tuple = ('Tesouro Selic', 'Tesouro IPCA+', 'Tesouro Prefixado',
+                          'Tesouro IPCA+ com Juros Semestrais', 'Tesouro Prefixado com Juros Semestrais')
+
+
+class CarteiraGerada(NamedTuple):
+    """
+    ids_rv: ids de renda variável, na ordem de cadastro
+    ids_rf: ids de renda fixa, na ordem de cadastro
+    movimentacoes: movimentações gravadas, incluindo as iniciais
+    """
+    ids_rv: list
+    ids_rf: list
+    movimentacoes: int
+
+
+def _decimal(valor: float) -> str:
+    return f'{valor:.2f}'.replace('.', ',')
+
+
+class GeradorCarteira:
+    """
+    Ativos e movimentações fictícios, mas plausíveis, para testes de
+    carga. Tudo sai de geradores do NumPy derivados da semente, um por
+    tipo de dado: a mesma semente e os mesmos pedidos produzem sempre
+    os mesmos dados. Códigos e nomes nunca se repetem dentro de um
+    gerador (os códigos são uma permutação de radicais de 4 letras).
+    """
+    def __init__(self, semente: int = 0, inicio: datetime.date | str = '2020-01-02', dias_uteis: int = 750) -> None:
+        """
+        Param: semente: int
+        Param: inicio: datetime.date | str -> data das posições iniciais
+        Param: dias_uteis: int -> período em que as negociações acontecem
+        """
+        self.__semente: int = semente
+        self.inicio: np.datetime64 = np.busday_offset(np.datetime64(str(inicio), 'D'), 0, roll='forward')
+        self.dias: np.ndarray = np.busday_offset(self.inicio, np.arange(1, dias_uteis + 1))
+        self.__codigos: dict = {}
+        self.__usados: dict = {}
+        self.__serie_rf: int = 0
+        self.__streams: dict = {}
+
+    def __rng(self, nome: str) -> np.random.Generator:
+        if nome not in self.__streams:
+            self.__streams[nome] = np.random.default_rng([self.__semente, len(self.__streams) + 1, sum(map(ord, nome))])
+        return self.__streams[nome]
+
+    def __proximos_codigos(self, sufixos: tuple, quantidade: int) -> tuple:
+        # radical e sufixo de cada código, tirados de uma permutação fixa
+        if sufixos not in self.__codigos:
+            self.__codigos[sufixos] = self.__rng(f'codigos{sufixos}').permutation(RADICAIS * len(sufixos))
+            self.__usados[sufixos] = 0
+        inicio: int = self.__usados[sufixos]
+        if inicio + quantidade > len(self.__codigos[sufixos]):
+            raise ValueError(f'O gerador só tem {len(self.__codigos[sufixos]) - inicio} códigos livres')
+        self.__usados[sufixos] = inicio + quantidade
+        posicoes: np.ndarray = self.__codigos[sufixos][inicio:inicio + quantidade]
+        radicais: list = [_radical(int(p) % RADICAIS) for p in posicoes]
+        return radicais, [sufixos[int(p) // RADICAIS] for p in posicoes]
+
+    def acoes(self, quantidade: int) -> list:
+        """
+        Param: quantidade: int
+
+        return list[Acao]
+        """
+        radicais, sufixos = self.__proximos_codigos(SUFIXOS_ACOES, quantidade)
+        setores: np.ndarray = self.__rng('acoes').integers(0, len(SETORES), quantidade)
+        return [Acao(f'{SETORES[setor]} {radical.title()} {CLASSES_ACOES[sufixo]}', radical + sufixo)
+                for radical, sufixo, setor in zip(radicais, sufixos, setores)]
+
+    def fiis(self, quantidade: int) -> list:
+        """
+        Param: quantidade: int
+
+        return list[Fiis]
+        """
+        radicais, sufixos = self.__proximos_codigos(SUFIXOS_FIIS, quantidade)
+        segmentos: np.ndarray = self.__rng('fiis').integers(0, len(SEGMENTOS_FII), quantidade)
+        return [Fiis(f'FII {SEGMENTOS_FII[segmento]} {radical.title()}' + ('' if sufixo == '11' else f' {sufixo}'),
+                     radical + sufixo)
+                for radical, sufixo, segmento in zip(radicais, sufixos, segmentos)]
+
+    def rendas_fixas(self, quantidade: int) -> list:
+        """
+        CDBs, LCIs, LCAs, CRIs, CRAs e debêntures pós-fixados (CDI),
+        híbridos (IPCA +) ou prefixados, que vencem depois do período das
+        negociações.
+
+        Param: quantidade: int
+
+        return list[RendaFixa]
+        """
+        rng: np.random.Generator = self.__rng('renda_fixa')
+        produtos: np.ndarray = rng.integers(0, len(PRODUTOS_RF), quantidade)
+        emissores: np.ndarray = rng.integers(0, len(EMISSORES), quantidade)
+        tipos: np.ndarray = rng.choice(4, quantidade, p=(0.45, 0.15, 0.25, 0.15))
+        percentuais: np.ndarray = rng.integers(90, 131, quantidade)
+        spreads: np.ndarray = np.round(rng.uniform(0.3, 7.5, quantidade), 2)
+        prefixados: np.ndarray = np.round(rng.uniform(9.0, 14.5, quantidade), 2)
+        vencimentos: np.ndarray = self.dias[-1] + rng.integers(180, 8 * 365, quantidade)
+        liquidez: np.ndarray = rng.random(quantidade) < 0.3
+
+        ativos: list = []
+        for i in range(quantidade):
+            rentabilidade: str = (f'{percentuais[i]}% CDI',
+                                  f'CDI + {_decimal(spreads[i] / 3)}%',
+                                  f'IPCA + {_decimal(spreads[i])}%',
+                                  f'{_decimal(prefixados[i])}% a.a.')[tipos[i]]
+            vencimento: datetime.date = vencimentos[i].item()
+            ativos.append(RendaFixa(f'{PRODUTOS_RF[produtos[i]]} {EMISSORES[emissores[i]]} '
+                                    f'{vencimento.year} #{self.__proxima_serie()}',
+                                    'Imediato' if liquidez[i] else 'No vencimento',
+                                    vencimento.strftime('%d/%m/%Y'),
+                                    rentabilidade))
+        return ativos
+
+    def tesouros_diretos(self, quantidade: int) -> list:
+        """
+        Param: quantidade: int
+
+        return list[TesouroDireto]
+        """
+        rng: np.random.Generator = self.__rng('tesouro')
+        titulos: np.ndarray = rng.integers(0, len(TITULOS_TESOURO), quantidade)
+        anos: np.ndarray = self.dias[-1].astype(object).year + rng.integers(1, 26, quantidade)
+        taxas: np.ndarray = np.round(rng.uniform(4.0, 13.5, quantidade), 2)
+
+        ativos: list = []
+        for i in range(quantidade):
+            titulo: str = TITULOS_TESOURO[titulos[i]]
+            if titulo == 'Tesouro Selic':
+                rentabilidade: str = 'SELIC + 0,1%'
+            elif titulo.startswith('Tesouro IPCA+'):
+                rentabilidade = f'IPCA + {_decimal(taxas[i] / 2)}%'
+            else:
+                rentabilidade = f'{_decimal(taxas[i])}% a.a.'
+            ativos.append(TesouroDireto(f'{titulo} {anos[i]} #{self.__proxima_serie()}',
+                                        'D+1',
+                                        f'{"01/01" if "Prefixado" in titulo else "15/05"}/{anos[i]}',
+                                        rentabilidade,
+                                        'Semestral' if 'Semestrais' in titulo else 'No vencimento'))
+        return ativos
+
+    def reservas_emergencia(self, quantidade: int) -> list:
+        """
+        Param: quantidade: int
+
+        return list[ReservaEmergencia]
+        """
+        rng: np.random.Generator = self.__rng('reserva')
+        emissores: np.ndarray = rng.integers(0, len(EMISSORES), quantidade)
+        percentuais: np.ndarray = rng.choice((100, 100, 102, 105), quantidade)
+        return [ReservaEmergencia(f'Reserva {EMISSORES[emissor]} #{self.__proxima_serie()}',
+                                  'Imediato',
+                                  'Sem vencimento',
+                                  f'{percentual}% CDI')
+                for emissor, percentual in zip(emissores, percentuais)]
+
+    def __proxima_serie(self) -> int:
+        self.__serie_rf += 1
+        return self.__serie_rf
+
+    def posicoes_rv(self, ids: list, fiis: bool = False) -> tuple:
+        """
+        Posição inicial de cada ativo: lotes de 100 ações (FIIs em
+        cotas avulsas) a preços lognormais.
+
+        Param: ids: list
+        Param: fiis: bool
+
+        return tuple -> (linhas (id, qtde, pu) para posicoes_iniciais_em_lote,
+                         array de preços iniciais)
+        """
+        rng: np.random.Generator = self.__rng('posicoes_fiis' if fiis else 'posicoes_acoes')
+        if fiis:
+            quantidades: np.ndarray = rng.integers(1, 301, len(ids))
+            precos: np.ndarray = np.round(rng.lognormal(np.log(95.0), 0.35, len(ids)), 2)
+        else:
+            quantidades = rng.integers(1, 21, len(ids)) * 100
+            precos = np.round(rng.lognormal(np.log(25.0), 0.7, len(ids)), 2)
+        precos = np.maximum(precos, 0.5)
+        return [(id, int(qtde), float(pu)) for id, qtde, pu in zip(ids, quantidades, precos)], precos
+
+    def negociacoes_rv(self, ids: list, posicoes: list, precos: np.ndarray, por_ativo: int) -> list:
+        """
+        Compras e vendas posteriores às posições iniciais. O preço segue
+        um passeio aleatório geométrico por ativo (30% de volatilidade
+        ao ano) e uma venda nunca passa da quantidade em carteira.
+
+        Param: ids: list
+        Param: posicoes: list -> as linhas de posicoes_rv
+        Param: precos: np.ndarray -> preços iniciais de posicoes_rv
+        Param: por_ativo: int -> negociações de cada ativo
+
+        return list -> (data, id, tipo, qtde, pu), sem ordem entre ativos
+        """
+        total: int = len(ids)
+        if total == 0 or por_ativo <= 0:
+            return []
+        rng: np.random.Generator = self.__rng('negociacoes_rv')
+        instantes, dias = self.__instantes(rng, (total, por_ativo))
+        intervalos: np.ndarray = np.diff(dias, axis=1, prepend=-1)
+        choques: np.ndarray = rng.normal(0, 0.3 * np.sqrt(intervalos / 252))
+        preco: np.ndarray = np.maximum(np.round(precos[:, None] * np.exp(np.cumsum(choques, axis=1)), 2), 0.01)
+        carteira: np.ndarray = np.array([qtde for _, qtde, _ in posicoes], dtype=np.int64)
+        # ações negociadas em lotes de 100, FIIs cota a cota
+        lote: np.ndarray = np.where(carteira >= 100, 100, 1)
+
+        tipos: np.ndarray = np.empty((total, por_ativo), dtype=object)
+        quantidades: np.ndarray = np.empty((total, por_ativo), dtype=np.int64)
+        # uma coluna por vez (todas as ações juntas), pois a venda depende da carteira
+        for n in range(por_ativo):
+            pedido: np.ndarray = rng.integers(1, 11, total) * lote
+            venda: np.ndarray = (rng.random(total) < 0.4) & (carteira > 0)
+            quantidade: np.ndarray = np.where(venda, np.minimum(pedido, carteira), pedido)
+            carteira += np.where(venda, -quantidade, quantidade)
+            tipos[:, n] = np.where(venda, 'venda', 'compra')
+            quantidades[:, n] = quantidade
+
+        return [(instante, id, tipo, int(qtde), float(pu))
+                for instante, id, tipo, qtde, pu in zip(instantes, np.repeat(ids, por_ativo).tolist(),
+                                                        tipos.ravel(), quantidades.ravel(), preco.ravel())]
+
+    def posicoes_rf(self, ids: list, reserva: bool = False) -> list:
+        """
+        Param: ids: list
+        Param: reserva: bool -> valores menores, de reserva de emergência
+
+        return list -> (id, valor, quantidade) para posicoes_iniciais_em_lote
+        """
+        rng: np.random.Generator = self.__rng('posicoes_reserva' if reserva else 'posicoes_rf')
+        media: float = np.log(5000.0) if reserva else np.log(12000.0)
+        valores: np.ndarray = np.round(np.maximum(rng.lognormal(media, 0.8, len(ids)), 100.0), 2)
+        return [(id, float(valor), 1) for id, valor in zip(ids, valores)]
+
+    def negociacoes_rf(self, posicoes: list, por_ativo: int) -> list:
+        """
+        Aplicações e resgates posteriores às posições iniciais. Um
+        resgate leva até metade do saldo aplicado.
+
+        Param: posicoes: list -> as linhas de posicoes_rf
+        Param: por_ativo: int
+
+        return list -> (data, id, tipo, qtde, valor), sem ordem entre ativos
+        """
+        total: int = len(posicoes)
+        if total == 0 or por_ativo <= 0:
+            return []
+        rng: np.random.Generator = self.__rng('negociacoes_rf')
+        instantes, _ = self.__instantes(rng, (total, por_ativo))
+        saldo: np.ndarray = np.array([valor for _, valor, _ in posicoes])
+        tipos: np.ndarray = np.empty((total, por_ativo), dtype=object)
+        valores: np.ndarray = np.empty((total, por_ativo))
+        for n in range(por_ativo):
+            resgate: np.ndarray = rng.random(total) < 0.3
+            valor: np.ndarray = np.where(resgate,
+                                         np.floor(saldo * rng.uniform(0.05, 0.5, total) * 100) / 100,
+                                         np.round(rng.lognormal(np.log(2000.0), 0.7, total), 2))
+            saldo = np.round(saldo + np.where(resgate, -valor, valor), 2)
+            tipos[:, n] = np.where(resgate, 'resgate', 'compra')
+            valores[:, n] = valor
+
+        ids: list = np.repeat([id for id, _, _ in posicoes], por_ativo).tolist()
+        return [(instante, id, tipo, 1, float(valor))
+                for instante, id, tipo, valor in zip(instantes, ids, tipos.ravel(), valores.ravel())]
+
+    def __instantes(self, rng: np.random.Generator, forma: tuple) -> tuple:
+        # um pregão sorteado por negociação, das 10h às 17h, em ordem
+        # dentro de cada ativo (linha); devolve os textos ISO e os dias
+        dias: np.ndarray = rng.integers(0, len(self.dias), forma)
+        segundos: np.ndarray = np.sort(dias * 86_400 + rng.integers(10 * 3600, 17 * 3600, forma), axis=1)
+        instantes: np.ndarray = self.dias[segundos // 86_400] + (segundos % 86_400).astype('timedelta64[s]')
+        textos: list = np.datetime_as_string(instantes.ravel(), unit='s').tolist()
+        return [texto.replace('T', ' ') for texto in textos], segundos // 86_400
+
+
+def _radical(numero: int) -> str:
+    letras: list = []
+    for _ in range(4):
+        numero, resto = divmod(numero, 26)
+        letras.append(string.ascii_uppercase[resto])
+    return ''.join(reversed(letras))
+
+
+def gerar_carteira(gerenciador: GerenciadorConexao,
+                   tamanho: int,
+                   semente: int = 0,
+                   negociacoes_por_ativo: int = 0,
+                   proporcoes: dict | None = None,
+                   tamanho_lote: int = 50_000) -> CarteiraGerada:
+    """
+    Grava no banco uma carteira sintética de `tamanho` ativos,
+    divididos entre as categorias segundo `proporcoes`. Cada ativo é
+    cadastrado com cadastrar_ativos_em_lote e recebe uma posição
+    inicial com posicoes_iniciais_em_lote, na data de início do
+    gerador. As negociações seguintes são gravadas em ordem
+    cronológica com movimentar_em_lote. Tudo é feito em lotes de
+    `tamanho_lote`.
+
+    Param: gerenciador: GerenciadorConexao
+    Param: tamanho: int
+    Param: semente: int
+    Param: negociacoes_por_ativo: int -> além da posição inicial
+    Param: proporcoes: dict -> {categoria: fração}; PROPORCOES se omitido
+    Param: tamanho_lote: int
+
+    return CarteiraGerada
+    """
+    proporcoes = proporcoes or PROPORCOES
+    gerador: GeradorCarteira = GeradorCarteira(semente)
+    rep_rv: RepositorioRendaVariavel = RepositorioRendaVariavel(gerenciador)
+    rep_rf: RepositorioRendaFixa = RepositorioRendaFixa(gerenciador)
+    abertura: str = f'{gerador.inicio} 10:00:00'
+
+    # a última categoria fica com o resto do arredondamento
+    quantidades: dict = {categoria: int(tamanho * fracao) for categoria, fracao in proporcoes.items()}
+    quantidades[list(quantidades)[-1]] += tamanho - sum(quantidades.values())
+
+    ids_rv: list = []
+    ids_rf: list = []
+    negociacoes_rv: list = []
+    negociacoes_rf: list = []
+    movimentacoes: int = 0
+    for categoria, quantidade in quantidades.items():
+        for inicio in range(0, quantidade, tamanho_lote):
+            lote: int = min(tamanho_lote, quantidade - inicio)
+            if categoria in ('Ações', 'FIIs'):
+                fiis: bool = categoria == 'FIIs'
+                ids: list = rep_rv.cadastrar_ativos_em_lote(gerador.fiis(lote) if fiis else gerador.acoes(lote)).ids
+                posicoes, precos = gerador.posicoes_rv(ids, fiis)
+                rep_rv.acao_sql_posicoes_iniciais_em_lote(posicoes, abertura)
+                negociacoes_rv += gerador.negociacoes_rv(ids, posicoes, precos, negociacoes_por_ativo)
+                ids_rv += ids
+            else:
+                ativos: list = {'Renda Fixa': gerador.rendas_fixas,
+                                'Tesouro Direto': gerador.tesouros_diretos,
+                                'Reserva de Emergência': gerador.reservas_emergencia}[categoria](lote)
+                ids = rep_rf.cadastrar_ativos_em_lote(ativos).ids
+                posicoes = gerador.posicoes_rf(ids, categoria == 'Reserva de Emergência')
+                rep_rf.acao_sql_posicoes_iniciais_em_lote(posicoes, abertura)
+                negociacoes_rf += gerador.negociacoes_rf(posicoes, negociacoes_por_ativo)
+                ids_rf += ids
+            movimentacoes += lote
+
+    for repositorio, negociacoes in ((rep_rv, negociacoes_rv), (rep_rf, negociacoes_rf)):
+        # ordem cronológica entre os ativos; a de cada ativo já vem certa
+        negociacoes.sort(key=itemgetter(0))
+        for inicio in range(0, len(negociacoes), tamanho_lote):
+            movimentacoes += repositorio.movimentar_em_lote(
+                (id, tipo, qtde, valor, data) for data, id, tipo, qtde, valor in negociacoes[inicio:inicio + tamanho_lote])
+    return CarteiraGerada(ids_rv, ids_rf, movimentacoes)
+
+
+def tem_ativos(gerenciador: GerenciadorConexao) -> bool:
+    """
+    Param: gerenciador: GerenciadorConexao
+
+    return bool -> True se RV ou RF já tiverem alguma linha
+    """
+    acao: str = "SELECT EXISTS (SELECT 1 FROM RV) OR EXISTS (SELECT 1 FROM RF)"
+    return bool(gerenciador.obter().execute(acao).fetchone()[0])
+
+
+def main(argv: list | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m data.sintetico',
+                                     description='Grava uma carteira sintética para testes de carga.')
+    parser.add_argument('--banco', required=True,
+                        help=f'arquivo do banco; de propósito sem padrão, para não gravar em {CAMINHO_PADRAO}')
+    parser.add_argument('--perfil', choices=list(PERFIS), default=PERFIL_PADRAO)
+    parser.add_argument('--tamanho', type=int, default=10_000, help='ativos a gerar')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--negociacoes', type=int, default=3, help='negociações por ativo além da inicial')
+    parser.add_argument('--centavos', action='store_true', help='banco novo com dinheiro em centavos')
+    parser.add_argument('--acrescentar', action='store_true',
+                        help='grava mesmo que o banco já tenha ativos (não há como desfazer)')
+    args = parser.parse_args(argv)
+
+    gerenciador: GerenciadorConexao = GerenciadorConexao(args.banco, args.perfil, centavos=args.centavos)
+    try:
+        if not args.acrescentar and tem_ativos(gerenciador):
+            print(f'{args.banco} já tem ativos cadastrados; use um banco novo ou passe --acrescentar.',
+                  file=sys.stderr)
+            return 1
+        carteira: CarteiraGerada = gerar_carteira(gerenciador, args.tamanho, args.semente, args.negociacoes)
+    finally:
+        gerenciador.fechar_todas()
+    print(f'{len(carteira.ids_rv)} ativo(s) de renda variável, {len(carteira.ids_rf)} de renda fixa e '
+          f'{carteira.movimentacoes} movimentação(ões) gravados em {args.banco}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import sqlite3 as sq
+
+# tabela -> coluna somada por categoria
+COLUNAS_TOTAIS: dict = {'RV': 'PT', 'RF': 'valor_aplicado'}
+
+TOLERANCIA: float = 0.005
+
+
+def _totais_reais(conn: sq.Connection) -> dict:
+    totais: dict = {}
+    for tabela, coluna in COLUNAS_TOTAIS.items():
+        # SUM (e não TOTAL) para que, em centavos, a soma seja inteira
+        acao: str = f"SELECT categoria, SUM({coluna}) FROM {tabela} GROUP BY categoria"
+        for categoria, total in conn.execute(acao):
+            totais[(tabela, categoria)] = total
+    return totais
+
+
+def reconstruir_totais(conn: sq.Connection) -> None:
+    """
+    Recalcula totais_categoria do zero a partir de RV e RF.
+    Quem chama é responsável pelo commit.
+
+    Param: conn: sqlite3.Connection
+
+    return None
+    """
+    conn.execute("DELETE FROM totais_categoria")
+    acao: str = "INSERT INTO totais_categoria (tabela, categoria, total) VALUES (?, ?, ?)"
+    conn.executemany(acao, [(tabela, categoria, total)
+                            for (tabela, categoria), total in _totais_reais(conn).items()])
+
+
+def verificar_totais(conn: sq.Connection) -> list:
+    """
+    Compara totais_categoria com a soma real de RV e RF.
+
+    Param: conn: sqlite3.Connection
+
+    return list -> [(tabela, categoria, total_armazenado, total_real), ...]
+    """
+    armazenados: dict = {(tabela, categoria): total for tabela, categoria, total
+                         in conn.execute("SELECT tabela, categoria, total FROM totais_categoria")}
+    reais: dict = _totais_reais(conn)
+
+    divergencias: list = []
+    for chave in sorted(armazenados.keys() | reais.keys()):
+        armazenado: float = armazenados.get(chave, 0.0)
+        real: float = reais.get(chave, 0.0)
+        if abs(armazenado - real) > TOLERANCIA:
+            divergencias.append((chave[0], chave[1], armazenado, real))
+    return divergencias
+
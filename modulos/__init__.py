@@ -4,3 +4,7 @@ from .ativos.renda_fixa import RendaFixa
 from .ativos.reserva_emergencia import ReservaEmergencia
 from .ativos.tesouro_direto import TesouroDireto
 from .ativos.ativo import AtivoAcoesFiis, AtivoRendaFixa
+from .calculos.custo_medio import ResultadoCustoMedio, atualizar_custo_medio, calcular_custo_medio, posicoes_finais
+from .ativos.dinheiro import de_centavos, para_centavos, para_decimal
+from .calculos.rendimento import TaxaRentabilidade, interpretar_rentabilidade, taxa_diaria, valor_bruto
+from .calculos.carteira import HistoricoCarteira
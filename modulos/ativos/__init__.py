@@ -4,3 +4,4 @@ from .fiis import Fiis
 from .tesouro_direto import TesouroDireto
 from .renda_fixa import RendaFixa
 from .reserva_emergencia import ReservaEmergencia
+from .dinheiro import de_centavos, para_centavos, para_decimal
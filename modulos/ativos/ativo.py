@@ -1,4 +1,7 @@
 from abc import ABC
+from decimal import Decimal
+
+from .dinheiro import para_decimal
 
 
 class AtivoAcoesFiis(ABC):
@@ -7,9 +10,11 @@ class AtivoAcoesFiis(ABC):
         self.__codigo: str = codigo
         self.__categoria: str = categoria
         self.__quantidade: int = 0
-        self.__preco_unitario: float = 0.0
-        self.__preco_medio: float = 0.0
-        self.__preco_total: float = 0.0
+        # dinheiro guardado em Decimal, arredondado ao centavo; as
+        # propriedades float continuam para quem já as usa
+        self.__preco_unitario: Decimal = para_decimal(0)
+        self.__preco_medio: Decimal = para_decimal(0)
+        self.__preco_total: Decimal = para_decimal(0)
 
     @property
     def nome(self) -> str:
@@ -25,14 +30,26 @@ class AtivoAcoesFiis(ABC):
 
     @property
     def preco_unitario(self) -> float:
-        return self.__preco_unitario
+        return float(self.__preco_unitario)
 
     @property
     def preco_medio(self) -> float:
-        return self.__preco_medio
+        return float(self.__preco_medio)
     
     @property
     def preco_total(self) -> float:
+        return float(self.__preco_total)
+
+    @property
+    def preco_unitario_exato(self) -> Decimal:
+        return self.__preco_unitario
+
+    @property
+    def preco_medio_exato(self) -> Decimal:
+        return self.__preco_medio
+
+    @property
+    def preco_total_exato(self) -> Decimal:
         return self.__preco_total
 
     @property
@@ -59,7 +76,7 @@ class AtivoRendaFixa(ABC):
         self.__quantidade: float = 0.0
         self.__categoria: str = categoria
         self.__resgate: str = resgate
-        self.__valor_aplicado: float = 0.0
+        self.__valor_aplicado: Decimal = para_decimal(0)
         self.__vencimento: str = vencimento
         self.__rentabilidade: str = rentabilidade
 
@@ -81,6 +98,10 @@ class AtivoRendaFixa(ABC):
 
     @property
     def valor_aplicado(self) -> float:
+        return float(self.__valor_aplicado)
+
+    @property
+    def valor_aplicado_exato(self) -> Decimal:
         return self.__valor_aplicado
 
     @property
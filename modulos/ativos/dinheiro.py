@@ -0,0 +1,36 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTAVO: Decimal = Decimal('0.01')
+
+
+def para_decimal(valor: int | float | str | Decimal) -> Decimal:
+    """
+    Valor em reais arredondado ao centavo (meio centavo para cima).
+    Floats são lidos pela representação curta (0.1 vira 0.10, e não
+    0.1000000000000000055...).
+
+    Param: valor: int | float | str | Decimal
+
+    return Decimal
+    """
+    if isinstance(valor, float):
+        valor = repr(valor)
+    return Decimal(valor).quantize(CENTAVO, ROUND_HALF_UP)
+
+
+def para_centavos(valor: int | float | str | Decimal) -> int:
+    """
+    Param: valor: int | float | str | Decimal -> em reais
+
+    return int
+    """
+    return int(para_decimal(valor).scaleb(2))
+
+
+def de_centavos(centavos: int) -> Decimal:
+    """
+    Param: centavos: int
+
+    return Decimal -> em reais, com duas casas
+    """
+    return Decimal(int(centavos)).scaleb(-2).quantize(CENTAVO)
@@ -0,0 +1,4 @@
+from .custo_medio import ResultadoCustoMedio, atualizar_custo_medio, calcular_custo_medio, posicoes_finais
+from .rendimento import TaxaRentabilidade, fatores_de_correcao, interpretar_rentabilidade
+from .rendimento import taxa_diaria, valor_bruto
+from .carteira import HistoricoCarteira, estados_diarios, valor_renda_fixa_diario, valor_renda_variavel_diario
@@ -0,0 +1,202 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from .custo_medio import AJUSTE, _inicio_de_segmento, _somar_por_segmento, calcular_custo_medio
+from .rendimento import fatores_de_correcao
+
+RESGATE: str = 'resgate'
+# posição anterior ao livro (checkpoint): não tem data e não rende;
+# vale o mesmo em todos os dias até o próximo ajuste do ativo
+POSICAO_INICIAL: str = 'posicao_inicial'
+
+
+class HistoricoCarteira(NamedTuple):
+    """
+    Um valor por dia corrido de datas.
+
+    datas: array de datetime64[D]
+    renda_variavel: quantidade em carteira vezes o último preço conhecido
+    renda_fixa: valor bruto, com o rendimento acumulado até o dia
+    """
+    datas: np.ndarray
+    renda_variavel: np.ndarray
+    renda_fixa: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.renda_variavel + self.renda_fixa
+
+
+def estados_diarios(linhas: np.ndarray, colunas: np.ndarray, valores: np.ndarray, forma: tuple) -> np.ndarray:
+    """
+    Matriz com o último valor conhecido de cada linha ao fim de cada
+    dia. Os eventos de uma mesma linha devem estar em ordem
+    cronológica; linhas diferentes podem vir intercaladas. Eventos
+    anteriores ao primeiro dia entram na coluna 0. Onde nenhum evento
+    aconteceu ainda o valor é NaN.
+
+    Param: linhas: array -> linha de cada evento (0 a forma[0] - 1)
+    Param: colunas: array -> dia de cada evento na grade (0 é o primeiro);
+                    negativos valem 0
+    Param: valores: array
+    Param: forma: tuple -> (linhas, dias)
+
+    return np.ndarray
+    """
+    total_linhas, dias = forma
+    matriz: np.ndarray = np.full((total_linhas, dias), np.nan)
+    if len(linhas) == 0:
+        return matriz
+    ordem: np.ndarray = np.argsort(linhas, kind='stable')
+    linha: np.ndarray = np.asarray(linhas, dtype=np.int64)[ordem]
+    coluna: np.ndarray = np.maximum(np.asarray(colunas, dtype=np.int64)[ordem], 0)
+    # só o último evento de cada dia fica
+    chave: np.ndarray = linha * dias + coluna
+    ultimo: np.ndarray = np.append(chave[1:] != chave[:-1], True)
+    matriz[linha[ultimo], coluna[ultimo]] = np.asarray(valores, dtype=np.float64)[ordem][ultimo]
+
+    # cada dia aponta para o último dia com evento e copia o seu valor
+    indices: np.ndarray = np.where(np.isnan(matriz), 0, np.arange(dias))
+    np.maximum.accumulate(indices, axis=1, out=indices)
+    return np.take_along_axis(matriz, indices, axis=1)
+
+
+def valor_renda_variavel_diario(ativos: np.ndarray,
+                                colunas: np.ndarray,
+                                tipos: np.ndarray,
+                                quantidades: np.ndarray,
+                                precos: np.ndarray,
+                                cotacoes: tuple,
+                                dias: int) -> np.ndarray:
+    """
+    Valor de mercado diário da renda variável. A quantidade de cada
+    ativo em cada dia sai do livro (as mesmas regras de
+    calcular_custo_medio) e o preço é o último fechamento conhecido;
+    antes da primeira cotação vale o preço da última movimentação.
+
+    Param: ativos: array -> linha do ativo (0 a n - 1) de cada movimentação,
+                   em ordem cronológica dentro do ativo
+    Param: colunas: array -> dia de cada movimentação na grade
+    Param: tipos: array -> compra | venda | ajuste
+    Param: quantidades: array
+    Param: precos: array -> preço unitário da movimentação
+    Param: cotacoes: tuple -> (linhas, colunas, fechamentos) no mesmo formato
+    Param: dias: int -> tamanho da grade
+
+    return np.ndarray -> um valor por dia
+    """
+    ativos = np.asarray(ativos, dtype=np.int64)
+    if len(ativos) == 0:
+        return np.zeros(dias)
+    forma: tuple = (int(ativos.max()) + 1, dias)
+    depois: np.ndarray = calcular_custo_medio(ativos, tipos, quantidades, precos).quantidade
+    quantidade: np.ndarray = estados_diarios(ativos, colunas, depois, forma)
+    preco: np.ndarray = estados_diarios(*cotacoes, forma)
+    preco = np.where(np.isnan(preco), estados_diarios(ativos, colunas, precos, forma), preco)
+    return np.nansum(np.nan_to_num(quantidade) * preco, axis=0)
+
+
+def valor_renda_fixa_diario(ativos: np.ndarray,
+                            tipos: np.ndarray,
+                            valores: np.ndarray,
+                            datas: np.ndarray,
+                            indexadores: np.ndarray,
+                            multiplicadores: np.ndarray,
+                            spreads: np.ndarray,
+                            bases: np.ndarray,
+                            grade: np.ndarray,
+                            series: dict,
+                            tamanho_bloco: int = 256) -> np.ndarray:
+    """
+    Valor bruto diário da renda fixa, com as regras de valor_bruto
+    aplicadas a cada dia da grade (sem o piso em zero por ativo).
+
+    O fator de uma aplicação feita em d até o dia t é F(t) / F(d), com
+    F o fator desde uma data de referência fixa. Cada movimentação vira
+    o peso valor / F(d), e o valor de todas as aplicações de uma mesma
+    taxa no dia t é F(t) vezes a soma acumulada dos pesos até t. Um
+    ajuste troca o peso acumulado do ativo pelo seu próprio. Assim o
+    histórico inteiro sai de uma matriz taxa x dia, calculada em blocos
+    de `tamanho_bloco` taxas, sem percorrer os dias em Python.
+
+    Param: ativos: array -> identificador do ativo de cada movimentação,
+                   em ordem cronológica dentro do ativo
+    Param: tipos: array -> compra | resgate | ajuste | POSICAO_INICIAL
+    Param: valores: array -> valor movimentado, sem sinal
+    Param: datas: array de datetime64[D] -> NaT nas posições iniciais
+    Param: indexadores, multiplicadores, spreads, bases: arrays com a
+                       taxa do ativo de cada movimentação
+    Param: grade: array de datetime64[D] -> dias consecutivos
+    Param: series: dict -> o mesmo de fatores_de_correcao
+    Param: tamanho_bloco: int
+
+    return np.ndarray -> um valor por dia da grade
+    """
+    grade = np.asarray(grade, dtype='datetime64[D]')
+    dias: int = len(grade)
+    resultado: np.ndarray = np.zeros(dias)
+    tipos = np.asarray(tipos)
+    datas = np.asarray(datas, dtype='datetime64[D]')
+    inicial: np.ndarray = tipos == POSICAO_INICIAL
+    # as movimentações posteriores à grade são as últimas de cada ativo
+    dentro: np.ndarray = inicial | (datas <= grade[-1])
+    if not dentro.any():
+        return resultado
+
+    ordem: np.ndarray = np.argsort(np.asarray(ativos)[dentro], kind='stable')
+    ativos = np.asarray(ativos)[dentro][ordem]
+    tipos = tipos[dentro][ordem]
+    inicial = inicial[dentro][ordem]
+    datas = datas[dentro][ordem]
+    valores = np.asarray(valores, dtype=np.float64)[dentro][ordem]
+    indexadores = np.asarray(indexadores)[dentro][ordem]
+    multiplicadores = np.asarray(multiplicadores, dtype=np.float64)[dentro][ordem]
+    spreads = np.asarray(spreads, dtype=np.float64)[dentro][ordem]
+    bases = np.asarray(bases, dtype=np.int64)[dentro][ordem]
+
+    rende: np.ndarray = ~inicial
+    referencia: np.datetime64 = min(grade[0], datas[rende].min()) if rende.any() else grade[0]
+    fator_na_data: np.ndarray = np.ones(len(ativos))
+    fator_na_data[rende] = fatores_de_correcao(np.full(rende.sum(), referencia), datas[rende], indexadores[rende],
+                                               multiplicadores[rende], spreads[rende], series, bases[rende])
+    pesos: np.ndarray = np.where(tipos == RESGATE, -valores, valores) / fator_na_data
+    pesos[inicial] = 0.0
+    fixos: np.ndarray = np.where(inicial, valores, 0.0)
+
+    # estado de cada ativo após cada movimentação e a variação que ela causou
+    inicio_ativo: np.ndarray = _inicio_de_segmento(ativos)
+    reinicio: np.ndarray = inicio_ativo | inicial | (tipos == AJUSTE)
+    variacoes: list = []
+    for parcela in (pesos, fixos):
+        depois: np.ndarray = _somar_por_segmento(parcela, reinicio)
+        variacoes.append(depois - np.where(inicio_ativo, 0.0, np.roll(depois, 1)))
+    variacao_pesos, variacao_fixos = variacoes
+
+    coluna: np.ndarray = np.zeros(len(ativos), dtype=np.int64)
+    coluna[rende] = np.maximum((datas[rende] - grade[0]).astype(np.int64), 0)
+    resultado += np.cumsum(np.bincount(coluna, weights=variacao_fixos, minlength=dias))
+
+    taxas: np.recarray = np.rec.fromarrays([indexadores, multiplicadores, spreads, bases])
+    distintas, taxa = np.unique(taxas, return_inverse=True)
+    por_taxa: np.ndarray = np.argsort(taxa, kind='stable')
+    limites: np.ndarray = np.searchsorted(taxa[por_taxa], np.arange(0, len(distintas) + tamanho_bloco, tamanho_bloco))
+    for bloco, (de, ate) in enumerate(zip(limites[:-1], limites[1:])):
+        if de == ate:
+            continue
+        primeira: int = bloco * tamanho_bloco
+        bloco_taxas: np.recarray = distintas[primeira:primeira + tamanho_bloco]
+        quantas: int = len(bloco_taxas)
+        selecao: np.ndarray = por_taxa[de:ate]
+        aportes: np.ndarray = np.bincount((taxa[selecao] - primeira) * dias + coluna[selecao],
+                                          weights=variacao_pesos[selecao], minlength=quantas * dias)
+        acumulado: np.ndarray = np.cumsum(aportes.reshape(quantas, dias), axis=1)
+        fatores: np.ndarray = fatores_de_correcao(np.full(quantas * dias, referencia),
+                                                  np.tile(grade, quantas),
+                                                  np.repeat(bloco_taxas.f0, dias),
+                                                  np.repeat(bloco_taxas.f1, dias),
+                                                  np.repeat(bloco_taxas.f2, dias),
+                                                  series,
+                                                  np.repeat(bloco_taxas.f3, dias))
+        resultado += np.einsum('td,td->d', acumulado, fatores.reshape(quantas, dias))
+    return resultado
@@ -0,0 +1,183 @@
+from typing import NamedTuple
+
+import numpy as np
+
+COMPRA: str = 'compra'
+VENDA: str = 'venda'
+AJUSTE: str = 'ajuste'
+
+
+class ResultadoCustoMedio(NamedTuple):
+    """
+    Um valor por movimentação, na mesma ordem da entrada.
+
+    quantidade: quantidade após a movimentação
+    preco_medio: preço médio após a movimentação
+    custo: custo total da posição (quantidade * preço médio)
+    lucro: lucro realizado (somente nas vendas; zero nas demais)
+    """
+    quantidade: np.ndarray
+    preco_medio: np.ndarray
+    custo: np.ndarray
+    lucro: np.ndarray
+
+
+def atualizar_custo_medio(quantidade: int,
+                          preco_medio: float,
+                          tipo: str,
+                          qtde: int,
+                          preco: float) -> tuple:
+    """
+    Forma incremental (O(1)) do custo médio ponderado. Usa as mesmas
+    regras de calcular_custo_medio:
+        compra -> preço médio ponderado pelas quantidades
+        venda  -> preço médio mantido; lucro = qtde * (preco - preço médio)
+        ajuste -> nova quantidade ao preço informado, que passa a ser
+                  o preço médio (custo total = quantidade * preço)
+    Ao zerar a posição o preço médio volta a zero.
+
+    Param: quantidade: int -> quantidade atual
+    Param: preco_medio: float -> preço médio atual
+    Param: tipo: str -> compra | venda | ajuste
+    Param: qtde: int
+    Param: preco: float -> preço unitário da movimentação
+
+    return tuple -> (quantidade, preço médio, lucro realizado)
+    """
+    if tipo == COMPRA:
+        nova_qtde: int = quantidade + qtde
+        if nova_qtde <= 0:
+            return nova_qtde, 0.0, 0.0
+        return nova_qtde, (quantidade * preco_medio + qtde * preco) / nova_qtde, 0.0
+
+    if tipo == VENDA:
+        nova_qtde = quantidade - qtde
+        lucro: float = qtde * (preco - preco_medio) if quantidade > 0 else 0.0
+        return nova_qtde, preco_medio if nova_qtde > 0 else 0.0, lucro
+
+    return qtde, preco if qtde > 0 else 0.0, 0.0
+
+
+def _inicio_de_segmento(grupos: np.ndarray) -> np.ndarray:
+    inicio: np.ndarray = np.ones(len(grupos), dtype=bool)
+    inicio[1:] = grupos[1:] != grupos[:-1]
+    return inicio
+
+
+def _somar_por_segmento(valores: np.ndarray, inicio: np.ndarray) -> np.ndarray:
+    """
+    Soma acumulada que recomeça a cada True em inicio. Exata para
+    inteiros; não use com floats de magnitudes muito diferentes.
+    """
+    acumulado: np.ndarray = np.cumsum(valores)
+    posicoes: np.ndarray = np.maximum.accumulate(np.where(inicio, np.arange(len(valores)), 0))
+    return acumulado - acumulado[posicoes] + valores[posicoes]
+
+
+def _resolver_recorrencia_afim(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Resolve x_t = a_t * x_{t-1} + b_t (com x_{-1} = 0) por varredura de
+    prefixo em log2(n) passos: cada passo compõe cada posição com a
+    que está d posições antes. Onde a = 0 a composição zera tudo que
+    vem antes, o que reinicia a recorrência sem precisar de marcadores.
+    """
+    a = a.copy()
+    b = b.copy()
+    d: int = 1
+    while d < len(a):
+        b[d:] = a[d:] * b[:-d] + b[d:]
+        a[d:] = a[d:] * a[:-d]
+        d *= 2
+    return b
+
+
+def calcular_custo_medio(ativos: np.ndarray,
+                         tipos: np.ndarray,
+                         quantidades: np.ndarray,
+                         precos: np.ndarray) -> ResultadoCustoMedio:
+    """
+    Custo médio ponderado, quantidade e lucro realizado de todas as
+    movimentações de todos os ativos em uma única passada vetorizada.
+    As movimentações de um mesmo ativo devem estar em ordem cronológica;
+    ativos diferentes podem vir intercalados.
+
+    O custo da posição segue a recorrência afim C' = a * C + b:
+        compra -> a = 1,      b = qtde * preco
+        venda  -> a = q' / q, b = 0
+        ajuste -> a = 0,      b = q' * preco
+    Sempre que a = 0 (início do ativo ou posição zerada) começa um novo
+    episódio. A recorrência é resolvida por varredura de prefixo
+    vetorizada, sem laço em Python por movimentação.
+
+    Param: ativos: array -> identificador do ativo de cada movimentação
+    Param: tipos: array -> compra | venda | ajuste
+    Param: quantidades: array
+    Param: precos: array -> preço unitário
+
+    return ResultadoCustoMedio
+    """
+    ativos = np.asarray(ativos)
+    tipos = np.asarray(tipos)
+    total: int = len(ativos)
+    if total == 0:
+        vazio: np.ndarray = np.zeros(0)
+        return ResultadoCustoMedio(np.zeros(0, dtype=np.int64), vazio, vazio, vazio)
+
+    ordem: np.ndarray = np.argsort(ativos, kind='stable')
+    grupos: np.ndarray = ativos[ordem]
+    tipo: np.ndarray = tipos[ordem]
+    qtde: np.ndarray = np.asarray(quantidades, dtype=np.int64)[ordem]
+    preco: np.ndarray = np.asarray(precos, dtype=np.float64)[ordem]
+    compra: np.ndarray = tipo == COMPRA
+    venda: np.ndarray = tipo == VENDA
+    ajuste: np.ndarray = tipo == AJUSTE
+
+    # quantidade: soma acumulada por ativo, recomeçando em cada ajuste
+    inicio_ativo: np.ndarray = _inicio_de_segmento(grupos)
+    delta: np.ndarray = np.where(venda, -qtde, qtde)
+    depois: np.ndarray = _somar_por_segmento(delta, inicio_ativo | ajuste)
+    antes: np.ndarray = np.where(inicio_ativo, 0, np.roll(depois, 1))
+
+    # coeficientes da recorrência do custo
+    com_posicao: np.ndarray = antes > 0
+    razao: np.ndarray = np.divide(np.maximum(depois, 0), antes,
+                                  out=np.zeros(total), where=com_posicao)
+    a: np.ndarray = np.where(compra, 1.0, razao)
+    b: np.ndarray = np.where(compra, qtde * preco, 0.0)
+    b = np.where(ajuste, np.maximum(depois, 0) * preco, b)
+    a = np.where(inicio_ativo | ajuste, 0.0, a)
+
+    custo: np.ndarray = _resolver_recorrencia_afim(a, b)
+    custo = np.where(depois > 0, custo, 0.0)
+
+    preco_medio: np.ndarray = np.divide(custo, depois, out=np.zeros(total), where=depois > 0)
+    medio_anterior: np.ndarray = np.where(inicio_ativo, 0.0, np.roll(preco_medio, 1))
+    lucro: np.ndarray = np.where(venda & com_posicao, qtde * (preco - medio_anterior), 0.0)
+
+    inversa: np.ndarray = np.empty(total, dtype=np.int64)
+    inversa[ordem] = np.arange(total)
+    return ResultadoCustoMedio(depois[inversa], preco_medio[inversa], custo[inversa], lucro[inversa])
+
+
+def posicoes_finais(ativos: np.ndarray,
+                    tipos: np.ndarray,
+                    quantidades: np.ndarray,
+                    precos: np.ndarray) -> dict:
+    """
+    Param: mesmos de calcular_custo_medio
+
+    return dict -> {ativo: (quantidade, preço médio, custo total, lucro realizado)}
+    """
+    ativos = np.asarray(ativos)
+    if len(ativos) == 0:
+        return {}
+    resultado: ResultadoCustoMedio = calcular_custo_medio(ativos, tipos, quantidades, precos)
+    chaves, inverso = np.unique(ativos, return_inverse=True)
+    ultimo: np.ndarray = np.zeros(len(chaves), dtype=np.int64)
+    np.maximum.at(ultimo, inverso, np.arange(len(ativos)))
+    lucro: np.ndarray = np.bincount(inverso, weights=resultado.lucro, minlength=len(chaves))
+    return {chave.item(): (int(resultado.quantidade[i]),
+                           float(resultado.preco_medio[i]),
+                           float(resultado.custo[i]),
+                           float(total))
+            for chave, i, total in zip(chaves, ultimo, lucro)}
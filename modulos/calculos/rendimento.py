@@ -0,0 +1,186 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+PRE: str = 'PRE'
+CDI: str = 'CDI'
+SELIC: str = 'SELIC'
+IPCA: str = 'IPCA'
+
+DIAS_UTEIS_ANO: int = 252
+
+_NUMERO: str = r'(\d+(?:\.\d+)?)'
+_SPREAD: str = rf'(?:\s*\+\s*{_NUMERO}\s*%)?'
+# 'A.A.', 'AO ANO', 'A.A. BASE 360', '(365)'
+_ANO: str = r'\s*(?:A\.?\s*A\.?|AO ANO)?\s*(?:\(?\s*(?:BASE\s*)?(252|360|365)\s*(?:DIAS)?\s*\)?)?'
+# '110% CDI', '100% DO CDI', '105% DA SELIC + 1%'
+_PERCENTUAL_DO_INDICE = re.compile(rf'^{_NUMERO}\s*%\s*(?:D[OA]\s+)?(CDI|DI|SELIC){_SPREAD}{_ANO}$')
+# 'CDI + 2%', 'IPCA + 5.5% A.A.', 'SELIC'
+_INDICE_MAIS_SPREAD = re.compile(rf'^(CDI|DI|SELIC|IPCA){_SPREAD}{_ANO}$')
+# '12.5% A.A.', 'PRE 12%', 'PREFIXADO 11% BASE 360'
+_PREFIXADO = re.compile(rf'^(?:PRE(?:FIXADO)?\s*)?{_NUMERO}\s*%{_ANO}$')
+
+
+class TaxaRentabilidade(NamedTuple):
+    """
+    indexador: PRE | CDI | SELIC | IPCA
+    multiplicador: fração do indexador (1.1 em '110% CDI')
+    spread: taxa anual somada ao indexador (0.055 em 'IPCA + 5,5%');
+            nos prefixados é a própria taxa
+    base: dias no ano usados para o spread (252 úteis, 360 ou 365 corridos)
+    """
+    indexador: str
+    multiplicador: float
+    spread: float
+    base: int = DIAS_UTEIS_ANO
+
+
+def interpretar_rentabilidade(texto: str) -> TaxaRentabilidade:
+    """
+    Converte a rentabilidade digitada no cadastro em uma taxa
+    estruturada. Aceita vírgula ou ponto decimal, 'a.a.' e a base de
+    dias ('base 360') opcionais. O resultado de cada texto é memorizado.
+
+    Param: texto: str -> '110% CDI', 'IPCA + 5,5%', '12,5% a.a.' ...
+
+    return TaxaRentabilidade
+    """
+    taxa: TaxaRentabilidade | None = _interpretar(texto)
+    if taxa is None:
+        raise ValueError(f'Rentabilidade não reconhecida: {texto}')
+    return taxa
+
+
+@lru_cache(maxsize=4096)
+def _interpretar(texto: str) -> TaxaRentabilidade | None:
+    # textos não reconhecidos também ficam no cache, como None
+    normalizado: str = ' '.join(texto.upper().replace(',', '.').split())
+
+    encontrado = _PERCENTUAL_DO_INDICE.match(normalizado)
+    if encontrado:
+        percentual, indice, spread, base = encontrado.groups()
+        return TaxaRentabilidade(_indexador(indice), float(percentual) / 100, float(spread or 0) / 100,
+                                 int(base or DIAS_UTEIS_ANO))
+
+    encontrado = _INDICE_MAIS_SPREAD.match(normalizado)
+    if encontrado:
+        indice, spread, base = encontrado.groups()
+        return TaxaRentabilidade(_indexador(indice), 1.0, float(spread or 0) / 100, int(base or DIAS_UTEIS_ANO))
+
+    encontrado = _PREFIXADO.match(normalizado)
+    if encontrado:
+        taxa, base = encontrado.groups()
+        return TaxaRentabilidade(PRE, 0.0, float(taxa) / 100, int(base or DIAS_UTEIS_ANO))
+
+    return None
+
+
+def _indexador(indice: str) -> str:
+    return CDI if indice == 'DI' else indice
+
+
+def taxa_diaria(taxa_anual: float, dias_ano: int = DIAS_UTEIS_ANO) -> float:
+    """
+    Taxa de um dia útil equivalente a uma taxa anual (0.1365 para
+    13,65% a.a.), como o CDI e a Selic são divulgados.
+
+    Param: taxa_anual: float
+    Param: dias_ano: int
+
+    return float
+    """
+    return (1 + taxa_anual) ** (1 / dias_ano) - 1
+
+
+def fatores_de_correcao(inicio: np.ndarray,
+                        fim: np.ndarray | np.datetime64,
+                        indexadores: np.ndarray,
+                        multiplicadores: np.ndarray,
+                        spreads: np.ndarray,
+                        series: dict,
+                        bases: np.ndarray | None = None) -> np.ndarray:
+    """
+    Fator pelo qual cada valor aplicado em `inicio` é multiplicado até
+    `fim`, todos de uma vez.
+
+    A parte do indexador é o produto de (1 + multiplicador * taxa do
+    dia) nos dias da série entre as duas datas (o dia inicial entra, o
+    final não). O produto vira soma de logaritmos acumulada uma única
+    vez por multiplicador distinto, e cada aplicação só faz duas
+    buscas binárias na série. O spread rende por dias úteis (segunda a
+    sexta, sem feriados) na base de 252 dias, ou por dias corridos nas
+    bases 360 e 365. Indexador sem série carregada não rende nada além
+    do spread.
+
+    Param: inicio: array de datetime64[D]
+    Param: fim: array de datetime64[D] ou uma única data
+    Param: indexadores: array -> PRE | CDI | SELIC | IPCA
+    Param: multiplicadores: array
+    Param: spreads: array -> taxas anuais
+    Param: series: dict -> {indexador: (datas datetime64[D] ordenadas, taxas diárias)}
+    Param: bases: array -> dias no ano de cada aplicação; 252 se omitido
+
+    return np.ndarray -> um fator por aplicação
+    """
+    inicio = np.asarray(inicio, dtype='datetime64[D]')
+    fim = np.broadcast_to(np.asarray(fim, dtype='datetime64[D]'), inicio.shape)
+    indexadores = np.asarray(indexadores)
+    multiplicadores = np.asarray(multiplicadores, dtype=np.float64)
+    spreads = np.asarray(spreads, dtype=np.float64)
+    bases = np.full(inicio.shape, DIAS_UTEIS_ANO) if bases is None else np.asarray(bases, dtype=np.int64)
+
+    # a base 252 conta dias úteis; 360 e 365 contam dias corridos
+    uteis: np.ndarray = bases == DIAS_UTEIS_ANO
+    dias: np.ndarray = np.where(uteis, np.busday_count(inicio, fim), (fim - inicio).astype(np.int64))
+    logaritmo: np.ndarray = np.maximum(dias, 0) * np.log1p(spreads) / bases
+
+    for indexador in np.unique(indexadores):
+        if indexador == PRE or indexador not in series:
+            continue
+        datas, taxas = series[indexador]
+        selecao: np.ndarray = indexadores == indexador
+        de: np.ndarray = np.searchsorted(datas, inicio[selecao])
+        ate: np.ndarray = np.maximum(np.searchsorted(datas, fim[selecao]), de)
+
+        distintos, posicao = np.unique(multiplicadores[selecao], return_inverse=True)
+        acumulado: np.ndarray = np.zeros((len(distintos), len(datas) + 1))
+        np.cumsum(np.log1p(np.outer(distintos, taxas)), axis=1, out=acumulado[:, 1:])
+        logaritmo[selecao] += acumulado[posicao, ate] - acumulado[posicao, de]
+
+    return np.exp(logaritmo)
+
+
+def valor_bruto(ativos: np.ndarray,
+                valores: np.ndarray,
+                datas: np.ndarray,
+                indexadores: np.ndarray,
+                multiplicadores: np.ndarray,
+                spreads: np.ndarray,
+                ate: np.datetime64,
+                series: dict,
+                bases: np.ndarray | None = None) -> dict:
+    """
+    Valor bruto de cada posição na data `ate`: a soma de cada
+    aplicação (positiva) e resgate (negativo) corrigidos desde a sua
+    data. Uma posição não fica negativa.
+
+    Param: ativos: array -> identificador do ativo de cada movimentação
+    Param: valores: array -> valor movimentado, com sinal
+    Param: datas: array de datetime64[D]
+    Param: indexadores, multiplicadores, spreads, bases: arrays com a
+                       taxa do ativo de cada movimentação
+    Param: ate: np.datetime64
+    Param: series: dict -> o mesmo de fatores_de_correcao
+
+    return dict -> {ativo: valor bruto}
+    """
+    ativos = np.asarray(ativos)
+    if len(ativos) == 0:
+        return {}
+    fatores: np.ndarray = fatores_de_correcao(datas, ate, indexadores, multiplicadores, spreads, series, bases)
+    chaves, inverso = np.unique(ativos, return_inverse=True)
+    totais: np.ndarray = np.bincount(inverso, weights=np.asarray(valores, dtype=np.float64) * fatores,
+                                     minlength=len(chaves))
+    return {chave.item(): float(total) for chave, total in zip(chaves, np.maximum(totais, 0.0))}
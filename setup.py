@@ -7,6 +7,7 @@ build_exe_options: dict = {'packages': ['sqlite3',
                                         'time',
                                         'tkinter',
                                         'ttkthemes',
+                                        'numpy',
                                         ]
                            }
 
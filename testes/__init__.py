@@ -6,3 +6,24 @@ from .test_categoria_reserva_emergencia import TesteReservaEmergencia
 from .test_categoria_tesouro_direto import TesteCategoriaTesoutoDireto
 from .test_data_rf import TestBancoDadosRF
 from .test_data_rv import TestBancoDadosRv
+from .test_conexao import TestGerenciadorConexao
+from .test_resumo_carteira import TestResumoCarteira
+from .test_totais import TestTotaisCategoria
+from .test_cadastro_em_lote import TestCadastroEmLote
+from .test_importador import TestImportadorCSV
+from .test_movimentacoes import TestMovimentacoes
+from .test_custo_medio import TestCustoMedio
+from .test_assincrono import TestRepositorioAssincrono
+from .test_relatorio import TestRelatorioPaginado
+from .test_busca import TestBusca
+from .test_transacao import TestTransacao
+from .test_cache import TestCachePosicoes
+from .test_eventos import TestEventos
+from .test_centavos import TestCentavos
+from .test_datas import TestDatas
+from .test_rendimento import TestRendimento
+from .test_taxas import TestTaxas
+from .test_cotacoes import TestCotacoes
+from .test_historico import TestHistorico
+from .test_benchmark import TestBenchmark
+from .test_sintetico import TestSintetico
@@ -0,0 +1,40 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+from data.conexao import GerenciadorConexao
+
+
+class TestBancoTemporario(unittest.TestCase):
+    """
+    Base dos testes que abrem um ou mais bancos em uma pasta temporária.
+    Os gerenciadores criados por gerenciador() são fechados no tearDown,
+    antes de a pasta ser apagada.
+    """
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'teste.db')
+        self.gerenciadores: list = []
+
+    def tearDown(self):
+        for gerenciador in self.gerenciadores:
+            gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def gerenciador(self, nome: str = 'teste.db', centavos: bool = False) -> GerenciadorConexao:
+        gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, nome), centavos=centavos)
+        self.gerenciadores.append(gerenciador)
+        return gerenciador
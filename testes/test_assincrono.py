@@ -0,0 +1,64 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from ativo_factory import AtivoFactory
+from data.assincrono import RepositorioAssincrono
+from data.conexao import GerenciadorConexao
+from data.exceptions import QuantidadeInsuficienteError
+
+
+class TestRepositorioAssincrono(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.rep = RepositorioAssincrono(self.factory.conectar_bd_rv())
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_metodos_devem_retornar_futures_executados_fora_da_thread_atual(self):
+        threads: list = []
+        original = self.rep.repositorio.relatorio_for_tkinter
+
+        def relatorio() -> list:
+            threads.append(threading.current_thread())
+            return original()
+        self.rep.repositorio.relatorio_for_tkinter = relatorio
+
+        futuro = self.rep.relatorio_for_tkinter()
+        self.assertIsInstance(futuro, Future)
+        self.assertEqual(futuro.result(timeout=5)[0][2], 'BBAS3')
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_operacoes_devem_terminar_na_ordem_em_que_foram_pedidas(self):
+        self.rep.comprar('1', 10, 20.0)
+        self.rep.vender('1', 4, 25.0)
+        resumo: dict = self.rep.resumo_carteira().result(timeout=5)
+        self.assertEqual(resumo['Ações'], 120.0)
+
+    def test_excecoes_do_repositorio_devem_ficar_no_future(self):
+        futuro = self.rep.vender('1', 1, 10.0)
+        self.assertIsInstance(futuro.exception(timeout=5), QuantidadeInsuficienteError)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,82 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import json
+import tempfile
+import unittest
+
+from data import benchmark
+from data.conexao import GerenciadorConexao
+from data.data import RepositorioRendaFixa, RepositorioRendaVariavel
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_resumo_deve_trazer_vazao_e_percentis(self):
+        resumo: dict = benchmark.resumir([float(i) for i in range(1, 101)])
+        self.assertEqual(resumo['repeticoes'], 100)
+        self.assertAlmostEqual(resumo['por_segundo'], 100 / 5.05)
+        self.assertEqual(resumo['p50_ms'], 51.0)
+        self.assertEqual(resumo['p99_ms'], 100.0)
+        self.assertEqual(resumo['max_ms'], 100.0)
+
+    def test_banco_sintetico_deve_ter_metade_de_cada_renda_com_posicao(self):
+        gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        try:
+            ids_rv, ids_rf = benchmark.preparar_banco(gerenciador, 40)
+            self.assertEqual((len(ids_rv), len(ids_rf)), (20, 20))
+            resumo_rv: dict = RepositorioRendaVariavel(gerenciador).resumo_carteira()
+            resumo_rf: dict = RepositorioRendaFixa(gerenciador).resumo_carteira()
+            self.assertGreater(resumo_rv['Ações'], 0)
+            self.assertGreater(resumo_rv['FIIs'], 0)
+            for categoria in ('Renda Fixa', 'Tesouro Direto', 'Reserva de Emergência'):
+                self.assertGreater(resumo_rf[categoria], 0, categoria)
+        finally:
+            gerenciador.fechar_todas()
+
+    def test_suite_deve_gravar_json_e_apontar_regressoes(self):
+        resultados: dict = {'1k': benchmark.medir_suite(40, self.pasta.name, 3, 1)}
+        for operacao in ('rv.cadastrar_ativo', 'rv.comprar', 'rv.vender', 'rf.resgatar',
+                         'rv.relatorio_acoes', 'rf.relatorio_res_emerg', 'rv.relatorio_for_tkinter'):
+            self.assertIn(operacao, resultados['1k'])
+
+        caminho: str = os.path.join(self.pasta.name, 'resultado.json')
+        atual: dict = benchmark.salvar_resultados(caminho, resultados, 'teste')
+        with open(caminho, encoding='utf-8') as arquivo:
+            self.assertEqual(json.load(arquivo)['rotulo'], 'teste')
+
+        self.assertEqual(benchmark.comparar(atual, atual), [])
+        anterior: dict = json.loads(json.dumps(atual))
+        anterior['resultados']['1k']['rv.comprar']['p50_ms'] = atual['resultados']['1k']['rv.comprar']['p50_ms'] / 2
+        regressoes: list = benchmark.comparar(atual, anterior)
+        self.assertEqual([(tamanho, operacao, medida) for tamanho, operacao, medida, _, _ in regressoes],
+                         [('1k', 'rv.comprar', 'p50_ms')])
+
+
+if __name__ == '__main__':
+    unittest.main()
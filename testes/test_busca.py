@@ -0,0 +1,78 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+
+
+class TestBusca(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'teste.db')
+        self.gerenciador = GerenciadorConexao(self.caminho)
+        self.factory = AtivoFactory(self.gerenciador)
+        self.factory.criar_acoes_em_lote([('Banco do Brasil', 'BBAS3'),
+                                          ('Banco Bradesco', 'BBDC4'),
+                                          ('Gerdau', 'GGBR4')])
+        self.factory.criar_renda_fixa('CDB 100% CDI', 'Imediato', '10/02/2030', '100% CDI')
+        self.factory.criar_renda_fixa('CDB_PRE', 'Imediato', '10/02/2030', '12% a.a')
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def codigos(self, termo: str) -> list:
+        return sorted(linha[2] for linha in self.rep_rv.buscar(termo))
+
+    def test_busca_deve_encontrar_trechos_de_nome_e_codigo(self):
+        self.assertEqual(self.codigos('banco'), ['BBAS3', 'BBDC4'])
+        self.assertEqual(self.codigos('dc4'), ['BBDC4'])
+        self.assertEqual(self.codigos('R4'), ['GGBR4'])
+        self.assertEqual(self.codigos('  '), [])
+
+    def test_busca_deve_acompanhar_alteracoes_e_exclusoes(self):
+        self.rep_rv.alterar_dados('3', 'Metalurgica Gerdau', 'GOAU4', 'Ações')
+        self.rep_rv.deletar('1')
+        self.assertEqual(self.codigos('gerdau'), ['GOAU4'])
+        self.assertEqual(self.codigos('GGBR'), [])
+        self.assertEqual(self.codigos('brasil'), [])
+
+    def test_busca_curta_deve_tratar_curingas_como_texto(self):
+        self.assertEqual([linha[1] for linha in self.rep_rf.buscar('%')], ['CDB 100% CDI'])
+        self.assertEqual([linha[1] for linha in self.rep_rf.buscar('_')], ['CDB_PRE'])
+        self.assertEqual([linha[1] for linha in self.rep_rf.buscar('"pre')], [])
+
+    def test_banco_existente_deve_ser_indexado(self):
+        self.gerenciador.fechar_todas()
+        conn: sq.Connection = sq.connect(self.caminho)
+        conn.execute("DROP TABLE busca_RV")
+        conn.commit()
+        conn.close()
+
+        gerenciador = GerenciadorConexao(self.caminho)
+        try:
+            rep = AtivoFactory(gerenciador).conectar_bd_rv()
+            self.assertEqual([linha[2] for linha in rep.buscar('gerdau')], ['GGBR4'])
+        finally:
+            gerenciador.fechar_todas()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
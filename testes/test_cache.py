@@ -0,0 +1,135 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import tempfile
+import threading
+import unittest
+from ativo_factory import AtivoFactory
+from data.cache import CachePosicoes
+from data.conexao import GerenciadorConexao
+
+
+class TestCachePosicoes(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.consultas: list = []
+        self.gerenciador.obter().set_trace_callback(self.consultas.append)
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def leituras(self, tabela: str) -> int:
+        return sum(1 for consulta in self.consultas if consulta.startswith(f'SELECT * FROM {tabela}'))
+
+    def test_cache_deve_descartar_a_linha_usada_ha_mais_tempo(self):
+        cache: CachePosicoes = CachePosicoes({'codigo': 2}, capacidade=2)
+        for ident in (1, 2, 3):
+            cache.guardar(('v',), (ident, f'Empresa {ident}', f'EMP{ident}'))
+            if ident == 2:
+                cache.obter(('v',), 'id', 1)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.obter(('v',), 'codigo', 'EMP2'))
+        self.assertEqual(cache.obter(('v',), 'id', '1')[2], 'EMP1')
+        self.assertIsNone(cache.obter(('outra',), 'id', 1))
+
+    def test_consultas_repetidas_devem_ser_servidas_da_memoria(self):
+        for _ in range(10):
+            self.assertTrue(self.rep_rv._existe_ativo('BBAS3'))
+            self.assertEqual(self.rep_rv._get_id_rv('BBAS3'), 1)
+        self.assertEqual(self.leituras('RV'), 1)
+        self.assertEqual(self.rep_rv._get_id_rv('XXXX3'), -1)
+
+    def test_compra_deve_atualizar_a_posicao_em_cache(self):
+        self.assertFalse(self.rep_rv._quantidade_suficiente('BBAS3'))
+        self.rep_rv.comprar('1', 10, 20.0)
+        self.assertTrue(self.rep_rv._quantidade_suficiente('BBAS3'))
+        self.rep_rv.vender('1', 10, 20.0)
+        self.assertFalse(self.rep_rv._quantidade_suficiente('BBAS3'))
+
+    def test_gravacao_deve_descartar_so_a_linha_alterada(self):
+        self.factory.criar_acao('Vale', 'VALE3')
+        self.rep_rv._existe_ativo('BBAS3')
+        self.rep_rv._existe_ativo('VALE3')
+        self.rep_rv.comprar('2', 1, 60.0)
+        self.rep_rv._existe_ativo('BBAS3')
+        self.assertEqual(self.leituras('RV'), 2)
+
+    def test_alterar_dados_deve_trocar_as_chaves_do_cache(self):
+        self.rep_rv._existe_ativo('BBAS3')
+        self.rep_rv.alterar_dados('1', 'Banco do Brasil', 'BBAS4', 'Ações')
+        self.assertFalse(self.rep_rv._existe_ativo('BBAS3'))
+        self.assertEqual(self.rep_rv._get_id_rv('BBAS4'), 1)
+
+    def test_rollback_deve_descartar_posicoes_nao_confirmadas(self):
+        with self.assertRaises(RuntimeError):
+            with self.rep_rv.transacao():
+                self.rep_rv.comprar('1', 10, 20.0)
+                self.assertTrue(self.rep_rv._quantidade_suficiente('BBAS3'))
+                raise RuntimeError
+        self.assertFalse(self.rep_rv._quantidade_suficiente('BBAS3'))
+
+    def test_rollback_deve_descartar_o_resumo_guardado(self):
+        self.rep_rv.comprar('1', 10, 20.0)
+        with self.assertRaises(RuntimeError):
+            with self.rep_rv.transacao():
+                self.rep_rv.comprar('1', 10, 20.0)
+                self.assertEqual(self.rep_rv.resumo_carteira()['Ações'], 400)
+                raise RuntimeError
+        self.assertEqual(self.rep_rv.resumo_carteira()['Ações'], 200)
+
+    def test_gravacao_fora_dos_repositorios_deve_esvaziar_o_cache(self):
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.assertEqual(self.rep_rf.acao_sql_get_saldo('1'), 0)
+        conn: sq.Connection = self.gerenciador.obter()
+        conn.execute("UPDATE RF SET valor_aplicado = 500 WHERE id = 1")
+        conn.commit()
+        self.assertEqual(self.rep_rf.acao_sql_get_saldo('1'), 500)
+
+        outra: sq.Connection = sq.connect(self.gerenciador.caminho)
+        outra.execute("DELETE FROM RF")
+        outra.commit()
+        outra.close()
+        # gravações de outro processo aparecem na próxima transação
+        with self.gerenciador.transacao():
+            pass
+        self.assertEqual(self.rep_rf._get_id('CDB BTG'), -1)
+
+    def test_posicao_em_cache_nao_deve_consultar_o_banco(self):
+        self.rep_rv._existe_ativo('BBAS3')
+        self.consultas.clear()
+        for _ in range(10):
+            self.assertTrue(self.rep_rv._existe_ativo('BBAS3'))
+            self.assertEqual(self.rep_rv._get_id_rv('BBAS3'), 1)
+        self.assertEqual(self.consultas, [])
+
+    def test_gravacao_em_outra_thread_deve_invalidar_o_cache(self):
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.assertEqual(self.rep_rf.acao_sql_get_saldo('1'), 0)
+        resumo: dict = self.rep_rv.resumo_carteira()
+        thread = threading.Thread(target=lambda: self.factory.conectar_bd_rv().comprar('1', 2, 50.0))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.rep_rv.resumo_carteira()['Ações'], resumo['Ações'] + 100)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
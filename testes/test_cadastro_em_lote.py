@@ -0,0 +1,62 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.metodos_sql import ResultadoLote
+
+
+class TestCadastroEmLote(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_lote_deve_retornar_os_ids_na_ordem_de_entrada(self):
+        resultado: ResultadoLote = self.factory.criar_acoes_em_lote([('Gerdau', 'GGBR4'), ('Vale', 'VALE3')])
+        self.assertEqual(resultado, ResultadoLote([2, 3], []))
+
+    def test_lote_deve_informar_conflitos_sem_abortar(self):
+        resultado: ResultadoLote = self.factory.criar_fiis_em_lote([('Maxima', 'MXRF11'),
+                                                                    ('Outro', 'BBAS3'),
+                                                                    ('Maxima', 'XPTO11'),
+                                                                    ('Kinea', 'KNRI11')])
+        self.assertEqual(resultado.conflitos, [1, 2])
+        self.assertEqual(resultado.ids[1:3], [None, None])
+        ids: dict = {linha[2]: linha[0] for linha in self.factory.conectar_bd_rv().relatorio_for_tkinter()}
+        self.assertEqual(resultado.ids[0], ids['MXRF11'])
+        self.assertEqual(resultado.ids[3], ids['KNRI11'])
+
+    def test_lote_deve_gravar_milhares_de_ativos(self):
+        ativos = ((f'CDB {i}', 'Imediato', '10/02/2030', '102% CDI') for i in range(5000))
+        resultado: ResultadoLote = self.factory.criar_rendas_fixas_em_lote(ativos)
+        self.assertEqual(len(resultado.ids), 5000)
+        self.assertEqual(resultado.conflitos, [])
+        self.assertEqual(len(self.factory.conectar_bd_rf().relatorio_for_tkinter()), 5000)
+
+    def test_lote_de_tesouro_direto_deve_usar_a_categoria_correta(self):
+        self.factory.criar_tesouros_diretos_em_lote([('IPCA 2035', 'Imediato', '15/05/2035', 'IPCA + 5%', 'Semestral')])
+        self.assertEqual(self.factory.conectar_bd_rf().relatorio_for_tkinter()[0][3], 'Tesouro Direto')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
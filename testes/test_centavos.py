@@ -0,0 +1,141 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import io
+import random
+import sqlite3 as sq
+import unittest
+from contextlib import redirect_stdout
+from decimal import Decimal
+from ativo_factory import AtivoFactory
+from ativos.acoes import Acao
+from ativos.renda_fixa import RendaFixa
+from data.centavos import usa_centavos
+from data.exceptions import QuantidadeInsuficienteError
+from data.manutencao import comando_totais
+from data.movimentacoes import reconstruir_posicoes
+from data.totais import verificar_totais
+from modulos.ativos.dinheiro import de_centavos, para_centavos, para_decimal
+from testes.banco_temporario import TestBancoTemporario
+
+
+class TestCentavos(TestBancoTemporario):
+    def abrir(self, centavos: bool) -> AtivoFactory:
+        return AtivoFactory(self.gerenciador(centavos=centavos))
+
+    def test_conversoes_devem_arredondar_ao_centavo(self):
+        self.assertEqual(para_centavos(0.1), 10)
+        self.assertEqual(para_centavos('19.99'), 1999)
+        self.assertEqual(para_decimal(2.675), Decimal('2.68'))
+        self.assertEqual(de_centavos(-5), Decimal('-0.05'))
+        self.assertEqual(str(de_centavos(123450)), '1234.50')
+
+    def test_ativos_devem_guardar_dinheiro_em_decimal(self):
+        acao = Acao('Banco do Brasil', 'BBAS3')
+        self.assertEqual(acao.preco_total_exato, Decimal('0.00'))
+        self.assertIsInstance(acao.preco_total, float)
+        self.assertEqual(RendaFixa('CDB', 'Imediato', '10/02/2030', '102% CDI').valor_aplicado_exato,
+                         Decimal('0.00'))
+
+    def test_divergencia_de_totais_deve_ser_mostrada_em_reais(self):
+        factory: AtivoFactory = self.abrir(centavos=True)
+        factory.criar_acao('Banco do Brasil', 'BBAS3')
+        factory.conectar_bd_rv().comprar('1', 3, 12.5)
+        conn = factory.conectar_bd_rv()._conn
+        conn.execute("UPDATE totais_categoria SET total = total + 150 WHERE categoria = 'Ações'")
+        conn.commit()
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            self.assertEqual(comando_totais(conn, reconstruir=False), 1)
+        self.assertIn('armazenado 39.00, real 37.50, diferença 1.50', saida.getvalue())
+
+    def test_banco_novo_em_centavos_deve_somar_sem_erro_de_arredondamento(self):
+        factory: AtivoFactory = self.abrir(centavos=True)
+        rep_rv = factory.conectar_bd_rv()
+        factory.criar_acao('Banco do Brasil', 'BBAS3')
+        with rep_rv.transacao():
+            for _ in range(1000):
+                rep_rv.comprar('1', 1, 0.1)
+
+        conn: sq.Connection = rep_rv._conn
+        self.assertTrue(usa_centavos(conn))
+        self.assertEqual(conn.execute("SELECT PT, typeof(PT) FROM RV").fetchone(), (10000, 'integer'))
+        self.assertEqual(conn.execute("SELECT typeof(total) FROM totais_categoria").fetchone()[0], 'integer')
+        self.assertEqual(rep_rv.resumo_carteira()['Total'], Decimal('100.00'))
+        self.assertEqual(next(rep_rv.relatorio())[5:], (Decimal('0.10'), Decimal('0.10'), Decimal('100.00')))
+        self.assertEqual(rep_rv.historico('1')[0][3], Decimal('0.10'))
+        rep_rv.vender('1', 300, 0.15)
+        quantidade, pm, pt, lucro = rep_rv.custo_medio()[1]
+        self.assertEqual((quantidade, pm, pt, lucro), (700, Decimal('0.10'), Decimal('70.00'), Decimal('15.00')))
+        self.assertTrue(all(isinstance(valor, Decimal) for valor in (pm, pt, lucro)))
+        self.assertIsInstance(rep_rv.resumo_carteira()['Total'], Decimal)
+
+    def test_atualizacao_em_sql_deve_coincidir_com_a_reconstrucao_em_centavos(self):
+        factory: AtivoFactory = self.abrir(centavos=True)
+        rep_rv = factory.conectar_bd_rv()
+        factory.criar_acoes_em_lote([(f'Empresa {i}', f'EMPR{i}') for i in range(1, 6)])
+        sorteio = random.Random(5)
+        for _ in range(300):
+            id: str = str(sorteio.randint(1, 5))
+            operacao: float = sorteio.random()
+            preco: float = round(sorteio.uniform(1, 100), 2)
+            if operacao < 0.5:
+                rep_rv.comprar(id, sorteio.randint(1, 50), preco)
+            elif operacao < 0.95:
+                try:
+                    rep_rv.vender(id, sorteio.randint(1, 50), preco)
+                except QuantidadeInsuficienteError:
+                    pass
+            else:
+                rep_rv.acertar_valor_quantidade(id, sorteio.randint(0, 50), preco)
+
+        conn: sq.Connection = rep_rv._conn
+        esperado: list = conn.execute("SELECT * FROM RV ORDER BY id").fetchall()
+        conn.execute("UPDATE RV SET quantidade=0, PU=0, PM=0, PT=0")
+        reconstruir_posicoes(conn)
+        conn.commit()
+        self.assertEqual(conn.execute("SELECT * FROM RV ORDER BY id").fetchall(), esperado)
+        self.assertEqual(verificar_totais(conn), [])
+
+    def test_migracao_deve_converter_e_preservar_ids_busca_e_gatilhos(self):
+        factory: AtivoFactory = self.abrir(centavos=False)
+        rep_rv, rep_rf = factory.conectar_bd_rv(), factory.conectar_bd_rf()
+        factory.criar_acao('Banco do Brasil', 'BBAS3')
+        factory.criar_acao('Vale', 'VALE3')
+        factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        rep_rv.comprar('1', 3, 10.1)
+        rep_rf.comprar('1', 1, 1000.35)
+        rep_rv.deletar('2')
+        self.gerenciadores.pop().fechar_todas()
+
+        factory = self.abrir(centavos=True)
+        rep_rv, rep_rf = factory.conectar_bd_rv(), factory.conectar_bd_rf()
+        conn: sq.Connection = rep_rv._conn
+        self.assertEqual(conn.execute("SELECT id, PU, PM, PT FROM RV").fetchall(), [(1, 1010, 1010, 3030)])
+        self.assertEqual(rep_rf.acao_sql_get_saldo('1'), Decimal('1000.35'))
+        self.assertEqual(rep_rv.historico('1')[0][3], Decimal('10.10'))
+        self.assertEqual([linha[0] for linha in rep_rv.buscar('Brasil')], [1])
+        self.assertEqual(verificar_totais(conn), [])
+
+        rep_rv.comprar('1', 1, 9.9)
+        factory.criar_acao('Itaú', 'ITUB4')
+        self.assertEqual(rep_rv._get_id_rv('ITUB4'), 3)
+        self.assertEqual(rep_rv.resumo_carteira()['Ações'], Decimal('40.20'))
+        self.assertEqual(rep_rf.resumo_carteira()['Total'], Decimal('1000.35'))
+        self.assertEqual(verificar_totais(conn), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import tempfile
+import threading
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao, obter_gerenciador
+from data.data import RepositorioRendaFixa, RepositorioRendaVariavel
+from data.perfis import PERFIS
+
+
+class TestGerenciadorConexao(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_gerenciador_deve_reutilizar_a_conexao_na_mesma_thread(self):
+        self.assertIs(self.gerenciador.obter(), self.gerenciador.obter())
+
+    def test_gerenciador_deve_abrir_uma_conexao_por_thread(self):
+        conexoes: list = []
+        thread = threading.Thread(target=lambda: conexoes.append(self.gerenciador.obter()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conexoes[0], self.gerenciador.obter())
+
+    def test_gerenciador_deve_criar_as_tabelas_em_banco_novo(self):
+        rep: RepositorioRendaVariavel = RepositorioRendaVariavel(self.gerenciador)
+        self.assertEqual(rep.relatorio_for_tkinter(), [])
+
+    def test_repositorios_da_factory_devem_compartilhar_a_conexao(self):
+        factory: AtivoFactory = AtivoFactory(self.gerenciador)
+        self.assertIs(factory.conectar_bd_rv()._conn, factory.conectar_bd_rf()._conn)
+
+    def test_fechar_deve_abrir_nova_conexao_no_proximo_uso(self):
+        rep: RepositorioRendaFixa = RepositorioRendaFixa(self.gerenciador)
+        conn = rep._conn
+        self.gerenciador.fechar()
+        self.assertIsNot(conn, rep._conn)
+        self.assertEqual(rep.relatorio_for_tkinter(), [])
+
+    def test_obter_gerenciador_deve_retornar_o_mesmo_gerenciador_por_caminho(self):
+        caminho: str = os.path.join(self.pasta.name, 'outro.db')
+        self.assertIs(obter_gerenciador(caminho), obter_gerenciador(caminho))
+        obter_gerenciador(caminho).fechar_todas()
+
+    def pragmas(self, conn: sq.Connection) -> tuple:
+        return (conn.execute('PRAGMA journal_mode').fetchone()[0],
+                conn.execute('PRAGMA synchronous').fetchone()[0],
+                conn.execute('PRAGMA cache_size').fetchone()[0])
+
+    def test_conexao_deve_receber_o_perfil_padrao(self):
+        self.assertEqual(self.pragmas(self.gerenciador.obter()), ('wal', 1, -32000))
+
+    def test_perfil_compativel_deve_manter_o_journal_tradicional(self):
+        gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'outro.db'), 'compativel')
+        try:
+            self.assertEqual(self.pragmas(gerenciador.obter()), ('delete', 2, -2000))
+            self.assertIs(gerenciador.perfil, PERFIS['compativel'])
+        finally:
+            gerenciador.fechar_todas()
+
+    def test_perfil_desconhecido_deve_gerar_erro(self):
+        with self.assertRaises(ValueError):
+            GerenciadorConexao(os.path.join(self.pasta.name, 'outro.db'), 'turbo')
+
+    def test_modo_lote_deve_relaxar_e_restaurar_o_perfil(self):
+        conn: sq.Connection = self.gerenciador.obter()
+        with self.gerenciador.modo_lote():
+            self.assertEqual(self.pragmas(conn)[1], 0)
+            with self.gerenciador.modo_lote():
+                pass
+            self.assertEqual(self.pragmas(conn)[1], 0)
+            conn.execute("INSERT INTO RV VALUES (NULL, 'Vale', 'VALE3', 'Ações', 0, 0, 0, 0)")
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(self.pragmas(conn), ('wal', 1, -32000))
+        self.assertEqual(conn.execute('SELECT count(*) FROM RV').fetchone()[0], 1)
+
+    def test_modo_lote_deve_desfazer_a_transacao_em_caso_de_erro(self):
+        conn: sq.Connection = self.gerenciador.obter()
+        with self.assertRaises(RuntimeError):
+            with self.gerenciador.modo_lote():
+                conn.execute("INSERT INTO RV VALUES (NULL, 'Vale', 'VALE3', 'Ações', 0, 0, 0, 0)")
+                raise RuntimeError
+        self.assertEqual(conn.execute('SELECT count(*) FROM RV').fetchone()[0], 0)
+        self.assertEqual(self.pragmas(conn)[1], 1)
+
+    def test_modo_lote_nao_deve_comecar_dentro_de_transacao(self):
+        conn: sq.Connection = self.gerenciador.obter()
+        conn.execute('BEGIN')
+        with self.assertRaises(sq.ProgrammingError):
+            with self.gerenciador.modo_lote():
+                pass
+        conn.rollback()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
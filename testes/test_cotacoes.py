@@ -0,0 +1,115 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import datetime
+import unittest
+
+import numpy as np
+
+from data.cotacoes import RepositorioCotacoes, numero_do_dia
+from testes.banco_temporario import TestBancoTemporario
+
+
+class TestCotacoes(TestBancoTemporario):
+    def abrir(self, centavos: bool = False) -> RepositorioCotacoes:
+        return RepositorioCotacoes(self.gerenciador(centavos=centavos))
+
+    def escrever_csv(self, texto: str) -> str:
+        arquivo: str = os.path.join(self.pasta.name, 'cotacoes.csv')
+        with open(arquivo, 'w', encoding='utf-8') as saida:
+            saida.write(texto)
+        return arquivo
+
+    def test_numero_do_dia_deve_aceitar_os_formatos_de_data(self):
+        self.assertEqual(numero_do_dia('1970-01-02'), 1)
+        self.assertEqual(numero_do_dia('02/01/2024'), numero_do_dia(datetime.date(2024, 1, 2)))
+        self.assertEqual(numero_do_dia(19724), 19724)
+        with self.assertRaises(ValueError):
+            numero_do_dia('31/02/2024')
+
+    def test_tabela_deve_ser_without_rowid(self):
+        repositorio: RepositorioCotacoes = self.abrir()
+        sql: str = repositorio._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'cotacoes'").fetchone()[0]
+        self.assertIn('WITHOUT ROWID', sql)
+
+    def test_carga_do_csv_deve_gravar_as_validas_e_apontar_as_invalidas(self):
+        repositorio: RepositorioCotacoes = self.abrir()
+        arquivo: str = self.escrever_csv('Ticker;Data;Fechamento\n'
+                                         'petr4;02/01/2024;37,50\n'
+                                         'PETR4;03/01/2024;38,10\n'
+                                         '\n'
+                                         'VALE3;2024-01-02;1.234,56\n'
+                                         'VALE3;31/02/2024;70,00\n'
+                                         ';04/01/2024;10,00\n'
+                                         'ITUB4;04/01/2024;abc\n')
+        progresso: list = []
+        resultado = repositorio.carregar_csv(arquivo, tamanho_lote=2,
+                                             progresso=lambda lidas, fracao: progresso.append((lidas, fracao)))
+
+        self.assertEqual(resultado.lidas, 6)
+        self.assertEqual(resultado.gravadas, 3)
+        self.assertEqual(resultado.invalidas, [6, 7, 8])
+        self.assertEqual(progresso[-1], (6, 1.0))
+        self.assertEqual(repositorio.codigos(), ['PETR4', 'VALE3'])
+        self.assertFalse(repositorio._conn.in_transaction)
+
+    def test_carga_sem_uma_das_colunas_deve_levantar_erro(self):
+        repositorio: RepositorioCotacoes = self.abrir()
+        with self.assertRaises(ValueError):
+            repositorio.carregar_csv(self.escrever_csv('codigo,fechamento\nPETR4,10\n'))
+
+    def test_gravar_o_mesmo_dia_deve_substituir_a_cotacao(self):
+        repositorio: RepositorioCotacoes = self.abrir()
+        repositorio.gravar([('PETR4', '02/01/2024', 37.5), ('PETR4', '03/01/2024', 38.0)])
+        repositorio.gravar([('petr4', datetime.date(2024, 1, 3), 39.0)])
+
+        datas, fechamentos = repositorio.serie('PETR4')
+        np.testing.assert_array_equal(datas, np.array(['2024-01-02', '2024-01-03'], dtype='datetime64[D]'))
+        np.testing.assert_allclose(fechamentos, [37.5, 39.0])
+
+    def test_serie_deve_devolver_o_intervalo_em_ordem_como_arrays(self):
+        repositorio: RepositorioCotacoes = self.abrir()
+        dias = np.arange('2024-01-01', '2024-02-01', dtype='datetime64[D]')
+        repositorio.gravar((('BOVA11', int(dia.astype(np.int64)), 100.0 + numero)
+                            for numero, dia in enumerate(dias[::-1])))
+
+        datas, fechamentos = repositorio.serie('BOVA11', '10/01/2024', '2024-01-12')
+        self.assertEqual(datas.dtype, np.dtype('datetime64[D]'))
+        self.assertEqual(fechamentos.dtype, np.float64)
+        np.testing.assert_array_equal(datas, dias[9:12])
+        np.testing.assert_allclose(fechamentos, [121.0, 120.0, 119.0])
+
+        series: dict = repositorio.series(['BOVA11', 'XXXX11'], fim='2024-01-02')
+        self.assertEqual(len(series['BOVA11'][0]), 2)
+        self.assertEqual(len(series['XXXX11'][0]), 0)
+
+    def test_no_modo_centavos_deve_gravar_inteiros_e_ler_reais(self):
+        repositorio: RepositorioCotacoes = self.abrir(centavos=True)
+        repositorio.gravar([('PETR4', '02/01/2024', 37.57)])
+
+        self.assertEqual(repositorio._conn.execute("SELECT fechamento FROM cotacoes").fetchone()[0], 3757)
+        np.testing.assert_allclose(repositorio.serie('PETR4')[1], [37.57])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from ativo_factory import AtivoFactory
+from calculos.custo_medio import atualizar_custo_medio, calcular_custo_medio, posicoes_finais
+from data.conexao import GerenciadorConexao
+
+
+class TestCustoMedio(unittest.TestCase):
+    def test_compra_deve_ponderar_o_preco_medio_pelas_quantidades(self):
+        self.assertEqual(atualizar_custo_medio(10, 20.0, 'compra', 30, 40.0), (40, 35.0, 0.0))
+
+    def test_venda_deve_manter_o_preco_medio_e_apurar_o_lucro(self):
+        self.assertEqual(atualizar_custo_medio(40, 35.0, 'venda', 10, 50.0), (30, 35.0, 150.0))
+        self.assertEqual(atualizar_custo_medio(10, 35.0, 'venda', 10, 30.0), (0, 0.0, -50.0))
+
+    def test_calculo_vetorizado_deve_separar_ativos_intercalados(self):
+        resultado = calcular_custo_medio(['A', 'B', 'A', 'B', 'A', 'A'],
+                                         ['compra', 'compra', 'compra', 'venda', 'venda', 'compra'],
+                                         [10, 5, 30, 5, 40, 2],
+                                         [20.0, 7.0, 40.0, 9.0, 30.0, 11.0])
+        self.assertEqual(resultado.quantidade.tolist(), [10, 5, 40, 0, 0, 2])
+        np.testing.assert_allclose(resultado.preco_medio, [20.0, 7.0, 35.0, 0.0, 0.0, 11.0])
+        np.testing.assert_allclose(resultado.lucro, [0.0, 0.0, 0.0, 10.0, -200.0, 0.0])
+
+    def test_calculo_vetorizado_deve_coincidir_com_o_incremental(self):
+        gerador = np.random.default_rng(7)
+        ativos: np.ndarray = gerador.integers(0, 50, 5000)
+        tipos: list = []
+        quantidades: list = []
+        precos: np.ndarray = np.round(gerador.uniform(5, 100, 5000), 2)
+        esperado: list = []
+        estado: dict = {}
+        for ativo, preco in zip(ativos, precos):
+            quantidade, pm = estado.get(ativo, (0, 0.0))
+            sorteio: float = gerador.random()
+            if sorteio < 0.05:
+                tipo, qtde = 'ajuste', int(gerador.integers(0, 100))
+            elif sorteio < 0.5 and quantidade > 0:
+                tipo, qtde = 'venda', int(gerador.integers(1, quantidade + 1))
+            else:
+                tipo, qtde = 'compra', int(gerador.integers(1, 100))
+            quantidade, pm, lucro = atualizar_custo_medio(quantidade, pm, tipo, qtde, preco)
+            estado[ativo] = (quantidade, pm)
+            tipos.append(tipo)
+            quantidades.append(qtde)
+            esperado.append((quantidade, pm, lucro))
+
+        resultado = calcular_custo_medio(ativos, tipos, quantidades, precos)
+        q, pm, lucro = map(np.array, zip(*esperado))
+        np.testing.assert_array_equal(resultado.quantidade, q)
+        np.testing.assert_allclose(resultado.preco_medio, pm, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(resultado.lucro, lucro, rtol=1e-9, atol=1e-6)
+
+        finais: dict = posicoes_finais(ativos, tipos, quantidades, precos)
+        self.assertEqual({ativo: valores[0] for ativo, valores in finais.items()},
+                         {ativo.item(): valores[0] for ativo, valores in estado.items()})
+
+    def test_repositorio_deve_usar_o_preco_medio_ponderado(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            gerenciador = GerenciadorConexao(os.path.join(pasta, 'teste.db'))
+            try:
+                factory = AtivoFactory(gerenciador)
+                rep = factory.conectar_bd_rv()
+                factory.criar_acao('Banco do Brasil', 'BBAS3')
+                rep.comprar('1', 10, 20.0)
+                rep.comprar('1', 30, 40.0)
+                rep.vender('1', 10, 50.0)
+
+                quantidade, pm, pt, lucro = rep.custo_medio()[1]
+                self.assertEqual((quantidade, pm, pt, lucro), (30, 35.0, 1050.0, 150.0))
+                self.assertEqual(rep.resumo_carteira()['Ações'], 1050.0)
+            finally:
+                gerenciador.fechar_todas()
+
+    def test_ajuste_deve_aplicar_o_preco_informado(self):
+        self.assertEqual(atualizar_custo_medio(40, 35.0, 'ajuste', 10, 12.0), (10, 12.0, 0.0))
+        for centavos in (False, True):
+            with tempfile.TemporaryDirectory() as pasta:
+                gerenciador = GerenciadorConexao(os.path.join(pasta, 'teste.db'), centavos=centavos)
+                try:
+                    factory = AtivoFactory(gerenciador)
+                    rep = factory.conectar_bd_rv()
+                    factory.criar_acao('Banco do Brasil', 'BBAS3')
+                    rep.comprar('1', 40, 35.0)
+                    rep.acertar_valor_quantidade('1', 10, 12.0)
+                    self.assertEqual(rep.resumo_carteira()['Ações'], 120.0)
+                    rep.comprar('1', 10, 20.0)
+                    rep.vender('1', 5, 30.0)
+
+                    quantidade, pm, pt, lucro = rep.custo_medio()[1]
+                    self.assertEqual((quantidade, pm, pt, lucro), (15, 16.0, 240.0, 70.0))
+                    self.assertEqual(rep.resumo_carteira()['Ações'], 240.0)
+                finally:
+                    gerenciador.fechar_todas()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
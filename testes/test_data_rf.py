@@ -17,6 +17,7 @@ import unittest
 from data.exceptions import AtivoJaCadastradoError, AtivoNaoCadastradoError, SaldoInsuficienteError
 from modulos.ativos.renda_fixa import RendaFixa
 from modulos.ativos.reserva_emergencia import ReservaEmergencia
+from data.conexao import GerenciadorConexao
 from data.data import RepositorioRendaFixa
 import unittest
 import random as rd
@@ -27,7 +28,8 @@ class TestBancoDadosRF(unittest.TestCase):
         self.rep = RepositorioRendaFixa()
         
     def test_bd_conexao_com_banco_de_dados_deve_retornar_0_se_conectado(self):
-        self.assertEqual(self.rep._conn.total_changes, 0)
+        rep: RepositorioRendaFixa = RepositorioRendaFixa(GerenciadorConexao())
+        self.assertEqual(rep._conn.total_changes, 0)
         
     def test_bd_func_get_id_deve_retornar_int(self):
         ativo: RendaFixa = RendaFixa('CDB', '21/02/2023', '21/02/2023', '103% CDI')
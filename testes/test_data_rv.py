@@ -16,6 +16,7 @@ except Exception as error:
 import unittest
 from modulos.ativos.acoes import Acao
 from modulos.ativos.fiis import Fiis
+from data.conexao import GerenciadorConexao
 from data.data import RepositorioRendaVariavel
 from data.exceptions import AtivoJaCadastradoError, AtivoNaoCadastradoError, QuantidadeInsuficienteError
 import random as rd
@@ -26,7 +27,8 @@ class TestBancoDadosRv(unittest.TestCase):
         self.rep: RepositorioRendaVariavel = RepositorioRendaVariavel()
         
     def test_bd_connection_ok_deve_retorna_0(self):
-        self.assertEqual(self.rep._conn.total_changes, 0)
+        rep: RepositorioRendaVariavel = RepositorioRendaVariavel(GerenciadorConexao())
+        self.assertEqual(rep._conn.total_changes, 0)
         
     def test_bd_func_cadastrar_ativo_retorna_ativojacadastradoerror_se_ativo_ja_existir(self):
         ativo = Fiis('Teste', 'TTSE3')
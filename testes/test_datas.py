@@ -0,0 +1,89 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import datetime
+import sqlite3 as sq
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.datas import converter_data, expressao_data
+
+
+class TestDatas(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'teste.db')
+        self.gerenciador = GerenciadorConexao(self.caminho)
+        self.factory = AtivoFactory(self.gerenciador)
+        self.factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '100% CDI')
+        self.factory.criar_renda_fixa('CDB B', '10/01/2029', '31/12/2029', '12% a.a')
+        self.factory.criar_renda_fixa('CDB C', 'Imediato', 'No vencimento', '110% CDI')
+        self.factory.criar_renda_fixa('CDB D', 'Imediato', '2030-01-15', 'IPCA + 5%')
+        self.rep_rf = self.factory.conectar_bd_rf()
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def nomes(self, inicio, fim) -> list:
+        return [linha[1] for linha in self.rep_rf.vencimentos_entre(inicio, fim)]
+
+    def test_conversao_em_python_e_em_sql_deve_coincidir(self):
+        conn = sq.connect(':memory:')
+        textos: tuple = ('10/02/2030', ' 2030-01-05 ', '29/02/2024', '29/02/2023', '31/04/2030',
+                         '2030-02-31', '1/2/2030', '10/13/2030', 'Imediato', '')
+        for texto in textos:
+            em_sql = conn.execute(f"SELECT {expressao_data('x')} FROM (SELECT ? AS x)", (texto,)).fetchone()[0]
+            self.assertEqual(converter_data(texto), em_sql, texto)
+        conn.close()
+        self.assertEqual(converter_data('29/02/2024'), '2024-02-29')
+        self.assertIsNone(converter_data('31/04/2030'))
+
+    def test_vencimentos_entre_deve_ordenar_por_data_e_incluir_os_extremos(self):
+        self.assertEqual(self.nomes('31/12/2029', '10/02/2030'), ['CDB B', 'CDB D', 'CDB A'])
+        self.assertEqual(self.nomes(datetime.date(2030, 1, 1), datetime.date(2030, 1, 31)), ['CDB D'])
+        self.assertEqual(self.nomes('2031-01-01', '2031-12-31'), [])
+        with self.assertRaises(ValueError):
+            self.rep_rf.vencimentos_entre('No vencimento', '2030-01-01')
+
+    def test_datas_devem_acompanhar_alteracoes_e_exclusoes(self):
+        self.rep_rf.alterar_dados_ativo('4', 'CDB D', 'Renda Fixa', 'Imediato', '20/03/2031', 'IPCA + 5%')
+        self.rep_rf.deletar_ativo('CDB A')
+        self.assertEqual(self.nomes('2029-01-01', '2031-12-31'), ['CDB B', 'CDB D'])
+        conn: sq.Connection = self.gerenciador.obter()
+        self.assertEqual(conn.execute("SELECT * FROM datas_rf ORDER BY ativo_id").fetchall(),
+                         [(2, '2029-12-31', '2029-01-10'), (3, None, None), (4, '2031-03-20', None)])
+
+    def test_banco_existente_deve_ter_as_datas_preenchidas(self):
+        conn: sq.Connection = self.gerenciador.obter()
+        conn.execute("DROP TABLE datas_rf")
+        conn.commit()
+        self.gerenciador.fechar_todas()
+
+        self.gerenciador = GerenciadorConexao(self.caminho)
+        self.rep_rf = AtivoFactory(self.gerenciador).conectar_bd_rf()
+        self.assertEqual(self.nomes('2029-01-01', '2030-12-31'), ['CDB B', 'CDB D', 'CDB A'])
+
+    def test_consulta_por_intervalo_deve_usar_o_indice(self):
+        conn: sq.Connection = self.gerenciador.obter()
+        plano: str = ' '.join(linha[3] for linha in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT ativo_id FROM datas_rf WHERE vencimento BETWEEN ? AND ?",
+            ('2029-01-01', '2030-12-31')))
+        self.assertIn('idx_datas_rf_vencimento', plano)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
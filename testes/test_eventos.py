@@ -0,0 +1,108 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.eventos import (AtivoAlterado, AtivoCadastrado, AtivoComprado, AtivoExcluido,
+                          AtivoResgatado, AtivoVendido, BarramentoEventos, LoteGravado)
+
+
+class TestEventos(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+        self.eventos: list = []
+        self.cancelar = self.rep_rv.eventos.assinar(self.eventos.append)
+
+    def tearDown(self):
+        self.cancelar()
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def totais(self) -> dict:
+        totais: dict = {}
+        for evento in self.eventos:
+            totais[evento.categoria] = totais.get(evento.categoria, 0.0) + evento.delta
+        return totais
+
+    def test_operacoes_devem_publicar_eventos_com_a_variacao_do_total(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.rep_rv.comprar('1', 10, 20.0)
+        self.rep_rv.vender('1', 4, 25.0)
+        self.rep_rv.deletar('1')
+
+        self.assertEqual([type(evento) for evento in self.eventos],
+                         [AtivoCadastrado, AtivoComprado, AtivoVendido, AtivoExcluido])
+        self.assertEqual([evento.delta for evento in self.eventos], [0.0, 200.0, -80.0, -120.0])
+        self.assertEqual(self.eventos[1], AtivoComprado('RV', 1, 'Ações', 200.0))
+
+    def test_deltas_devem_acompanhar_os_totais_da_carteira(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.factory.criar_fii('Kinea', 'KNRI11')
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.rep_rv.comprar('1', 10, 20.0)
+        self.rep_rv.comprar('2', 3, 150.0)
+        self.rep_rf.comprar('1', 1, 1000.0)
+        self.rep_rf.resgatar('1', 1, 250.0)
+        self.rep_rv.alterar_dados('1', 'Banco do Brasil', 'BBAS3', 'FIIs')
+
+        esperado: dict = self.rep_rv.resumo_carteira() | self.rep_rf.resumo_carteira()
+        for categoria, total in self.totais().items():
+            self.assertAlmostEqual(total, esperado[categoria])
+        self.assertIsInstance(self.eventos[6], AtivoResgatado)
+        self.assertEqual([(type(e), e.categoria) for e in self.eventos[-2:]],
+                         [(AtivoAlterado, 'Ações'), (AtivoAlterado, 'FIIs')])
+
+    def test_eventos_de_transacao_desfeita_nao_devem_ser_publicados(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        with self.rep_rv.transacao():
+            self.rep_rv.comprar('1', 10, 20.0)
+            with self.assertRaises(RuntimeError):
+                with self.rep_rv.transacao():
+                    self.rep_rv.comprar('1', 5, 20.0)
+                    raise RuntimeError
+            self.assertEqual(len(self.eventos), 1)
+        self.assertEqual([evento.delta for evento in self.eventos], [0.0, 200.0])
+
+    def test_cadastro_em_lote_deve_publicar_um_unico_evento(self):
+        self.factory.criar_acoes_em_lote([(f'Empresa {i}', f'EMPR{i}') for i in range(1, 6)])
+        self.assertEqual(self.eventos, [LoteGravado('RV', 5)])
+
+    def test_barramento_deve_filtrar_por_tipo_e_isolar_erros(self):
+        barramento: BarramentoEventos = BarramentoEventos()
+        recebidos: list = []
+
+        def falhar(evento):
+            raise ValueError
+
+        barramento.assinar(falhar)
+        cancelar = barramento.assinar(recebidos.append, AtivoVendido)
+        with redirect_stderr(io.StringIO()):
+            barramento.publicar(AtivoComprado('RV', 1, 'Ações', 1.0))
+            barramento.publicar(AtivoVendido('RV', 1, 'Ações', -1.0))
+            cancelar()
+            barramento.publicar(AtivoVendido('RV', 1, 'Ações', -1.0))
+        self.assertEqual(recebidos, [AtivoVendido('RV', 1, 'Ações', -1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,133 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import unittest
+
+import numpy as np
+
+from ativo_factory import AtivoFactory
+from calculos.carteira import estados_diarios
+from data.cotacoes import RepositorioCotacoes
+from data.movimentacoes import criar_checkpoint
+from testes.banco_temporario import TestBancoTemporario
+
+
+class TestHistorico(TestBancoTemporario):
+    def abrir(self, centavos: bool = False) -> AtivoFactory:
+        factory: AtivoFactory = AtivoFactory(self.gerenciador(f'teste{len(self.gerenciadores)}.db', centavos))
+        # janeiro e fevereiro de 2024, CDI de 0,05% por dia útil
+        dias: np.ndarray = np.arange('2024-01-01', '2024-03-01', dtype='datetime64[D]')
+        factory.conectar_bd_rf().atualizar_indice('CDI', ((str(dia), 0.0005) for dia in dias[np.is_busday(dias)]))
+        return factory
+
+    def dia(self, historico, data: str) -> int:
+        return int((np.datetime64(data) - historico.datas[0]).astype(np.int64))
+
+    def test_estados_diarios_devem_repetir_o_ultimo_valor_conhecido(self):
+        matriz = estados_diarios(np.array([1, 0, 0, 1, 0]),
+                                 np.array([-3, 1, 1, 2, 4]),
+                                 np.array([5.0, 1.0, 2.0, 7.0, 3.0]),
+                                 (2, 5))
+        np.testing.assert_array_equal(matriz[0], [np.nan, 2.0, 2.0, 2.0, 3.0])
+        np.testing.assert_array_equal(matriz[1], [5.0, 5.0, 7.0, 7.0, 7.0])
+
+    def test_renda_variavel_deve_usar_a_quantidade_do_dia_e_o_ultimo_fechamento(self):
+        factory: AtivoFactory = self.abrir()
+        factory.criar_acao('Petrobras', 'PETR4')
+        factory.criar_fii('Logística', 'HGLG11')
+        rep_rv = factory.conectar_bd_rv()
+        rep_rv.comprar('1', 100, 10.0, '2024-01-03 10:00:00')
+        rep_rv.vender('1', 40, 12.0, '2024-01-10 10:00:00')
+        rep_rv.comprar('2', 10, 150.0, '2024-01-05 10:00:00')
+        RepositorioCotacoes(self.gerenciadores[-1]).gravar([
+            ('PETR4', '2023-12-29', 9.0), ('PETR4', '2024-01-08', 11.0), ('PETR4', '2024-01-12', 13.0)])
+
+        historico = factory.valor_carteira_historico('2024-01-01', '2024-01-15')
+        self.assertEqual(len(historico.datas), 15)
+        esperado: dict = {
+            '2024-01-01': 0.0,
+            '2024-01-03': 100 * 9.0,
+            '2024-01-05': 100 * 9.0 + 10 * 150.0,
+            '2024-01-08': 100 * 11.0 + 10 * 150.0,
+            '2024-01-10': 60 * 11.0 + 10 * 150.0,
+            '2024-01-15': 60 * 13.0 + 10 * 150.0,
+        }
+        for data, valor in esperado.items():
+            self.assertAlmostEqual(historico.renda_variavel[self.dia(historico, data)], valor, msg=data)
+        np.testing.assert_array_equal(historico.renda_fixa, np.zeros(15))
+
+    def test_renda_fixa_deve_coincidir_com_o_valor_atual_em_cada_dia(self):
+        factory: AtivoFactory = self.abrir()
+        factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '110% CDI')
+        factory.criar_renda_fixa('CDB B', 'Imediato', '10/02/2030', '12% a.a.')
+        rep_rf = factory.conectar_bd_rf()
+        rep_rf.comprar('1', 1, 1000.0, '2024-01-02 10:00:00')
+        rep_rf.comprar('2', 1, 500.0, '2024-01-08 10:00:00')
+        rep_rf.resgatar('1', 1, 200.0, '2024-01-20 10:00:00')
+        rep_rf.comprar('1', 1, 300.0, '2024-02-05 10:00:00')
+
+        historico = factory.valor_carteira_historico('2024-01-01', '2024-02-20')
+        for dia, valor in zip(historico.datas, historico.renda_fixa):
+            self.assertAlmostEqual(valor, sum(rep_rf.valor_atual(str(dia)).values()), msg=str(dia))
+        np.testing.assert_allclose(historico.total, historico.renda_fixa)
+
+    def test_checkpoint_deve_valer_ate_o_primeiro_ajuste(self):
+        factory: AtivoFactory = self.abrir()
+        factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '100% CDI')
+        rep_rf = factory.conectar_bd_rf()
+        rep_rf.comprar('1', 1, 1000.0, '2024-01-02 10:00:00')
+        conn = rep_rf._conn
+        criar_checkpoint(conn)
+        conn.commit()
+        rep_rf.comprar('1', 1, 500.0, '2024-01-15 10:00:00')
+        conn.execute("INSERT INTO movimentacoes (tabela, ativo_id, tipo, quantidade, valor, data) "
+                     "VALUES ('RF', 1, 'ajuste', 1, 800.0, '2024-02-01 10:00:00')")
+        conn.commit()
+
+        historico = factory.valor_carteira_historico('2024-01-01', '2024-02-05')
+        self.assertAlmostEqual(historico.renda_fixa[self.dia(historico, '2024-01-01')], 1000.0)
+        self.assertAlmostEqual(historico.renda_fixa[self.dia(historico, '2024-01-22')], 1000.0 + 500 * 1.0005 ** 5)
+        self.assertAlmostEqual(historico.renda_fixa[self.dia(historico, '2024-02-05')], 800 * 1.0005 ** 2)
+        # um ajuste posterior à data não altera o valor de antes dele
+        self.assertAlmostEqual(rep_rf.valor_atual('2024-01-22')[1], 1000.0 + 500 * 1.0005 ** 5)
+
+    def test_modo_centavos_deve_devolver_os_mesmos_valores_em_reais(self):
+        historicos: list = []
+        for centavos in (False, True):
+            factory: AtivoFactory = self.abrir(centavos)
+            factory.criar_acao('Petrobras', 'PETR4')
+            factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', 'CDI + 1%')
+            factory.conectar_bd_rv().comprar('1', 3, 10.33, '2024-01-03 10:00:00')
+            factory.conectar_bd_rf().comprar('1', 1, 1234.56, '2024-01-03 10:00:00')
+            historicos.append(factory.valor_carteira_historico('2024-01-01', '2024-01-31'))
+        np.testing.assert_allclose(historicos[0].renda_variavel, historicos[1].renda_variavel)
+        np.testing.assert_allclose(historicos[0].renda_fixa, historicos[1].renda_fixa)
+
+    def test_intervalo_invertido_deve_levantar_erro(self):
+        factory: AtivoFactory = self.abrir()
+        with self.assertRaises(ValueError):
+            factory.valor_carteira_historico('2024-02-01', '2024-01-01')
+
+
+if __name__ == '__main__':
+    unittest.main()
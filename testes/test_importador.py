@@ -0,0 +1,82 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.importador import ImportadorCSV, ResultadoImportacao, converter_numero
+
+
+class TestImportadorCSV(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def criar_csv(self, conteudo: str) -> str:
+        caminho: str = os.path.join(self.pasta.name, 'extrato.csv')
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def test_converter_numero_deve_aceitar_formato_brasileiro(self):
+        self.assertEqual(converter_numero('R$ 1.234,56'), 1234.56)
+        self.assertEqual(converter_numero('10.5'), 10.5)
+
+    def test_importar_deve_cadastrar_renda_variavel_e_fixa(self):
+        caminho: str = self.criar_csv('Produto;Tipo;Quantidade;Preço;Valor aplicado;Vencimento;Rentabilidade\n'
+                                      'BBAS3 - Banco do Brasil;Ações;10;20,00;;;\n'
+                                      'MXRF11 - Maxima Renda;FII;5;10,00;;;\n'
+                                      'CDB BTG;CDB;;;1.000,00;10/02/2030;102% CDI\n'
+                                      'IPCA 2035;Tesouro Direto;;;500,00;15/05/2035;IPCA + 5%\n')
+        resultado: ResultadoImportacao = ImportadorCSV(self.gerenciador).importar(caminho)
+
+        self.assertEqual(resultado, ResultadoImportacao(4, 4, [], []))
+        resumo_rv: dict = self.factory.conectar_bd_rv().resumo_carteira()
+        resumo_rf: dict = self.factory.conectar_bd_rf().resumo_carteira()
+        self.assertEqual((resumo_rv['Ações'], resumo_rv['FIIs']), (200.0, 50.0))
+        self.assertEqual((resumo_rf['Renda Fixa'], resumo_rf['Tesouro Direto']), (1000.0, 500.0))
+
+    def test_importar_deve_informar_conflitos_e_linhas_invalidas(self):
+        self.factory.criar_acao('Banco Do Brasil', 'BBAS3')
+        caminho: str = self.criar_csv('codigo,nome,categoria\n'
+                                      'BBAS3,Banco do Brasil,Ações\n'
+                                      'XPTO,Sem Categoria,Cripto\n'
+                                      '\n'
+                                      'GGBR4,Gerdau,Ações\n')
+        resultado: ResultadoImportacao = ImportadorCSV(self.gerenciador).importar(caminho)
+        self.assertEqual(resultado, ResultadoImportacao(3, 1, [2], [3]))
+
+    def test_importar_deve_gravar_em_lotes_e_informar_o_progresso(self):
+        linhas: str = ''.join(f'T{i:05d},Empresa {i},FIIs,1,10\n' for i in range(10000))
+        caminho: str = self.criar_csv('ticker,nome,tipo,qtde,pm\n' + linhas)
+        chamadas: list = []
+
+        resultado: ResultadoImportacao = ImportadorCSV(self.gerenciador, tamanho_lote=3000).importar(
+            caminho, lambda lidas, fracao: chamadas.append((lidas, fracao)))
+
+        self.assertEqual(resultado.cadastradas, 10000)
+        self.assertEqual([lidas for lidas, _ in chamadas], [3000, 6000, 9000, 10000])
+        self.assertEqual(chamadas[-1][1], 1.0)
+        self.assertEqual(self.factory.conectar_bd_rv().relatorio_fiis(), 100000.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
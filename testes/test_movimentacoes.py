@@ -0,0 +1,164 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import random
+import sqlite3 as sq
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.exceptions import AtivoNaoCadastradoError, QuantidadeInsuficienteError, SaldoInsuficienteError
+from data.movimentacoes import criar_checkpoint, reconstruir_posicoes
+
+
+class TestMovimentacoes(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'teste.db')
+        self.gerenciador = GerenciadorConexao(self.caminho)
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def posicoes(self) -> tuple:
+        conn: sq.Connection = self.gerenciador.obter()
+        return (conn.execute("SELECT id, quantidade, PU, PM, PT FROM RV ORDER BY id").fetchall(),
+                conn.execute("SELECT id, quantidade, valor_aplicado FROM RF ORDER BY id").fetchall())
+
+    def test_compra_e_venda_devem_ser_registradas_no_historico(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.rep_rv.comprar('1', 10, 20.0, '2024-01-02')
+        self.rep_rv.vender('1', 4, 25.0, '2024-03-05')
+
+        historico: list = self.rep_rv.historico('1')
+        self.assertEqual([linha[1:] for linha in historico],
+                         [('compra', 10, 20.0, '2024-01-02'), ('venda', 4, 25.0, '2024-03-05')])
+
+    def test_resgate_de_renda_fixa_deve_ser_registrado(self):
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.rep_rf.comprar('1', 1, 1000.0, '2024-01-02')
+        self.rep_rf.resgatar('1', 1, 300.0, '2024-06-01')
+
+        self.assertEqual([linha[1] for linha in self.rep_rf.historico('1')], ['compra', 'resgate'])
+        self.assertEqual(self.posicoes()[1], [(1, 1, 700.0)])
+
+    def test_reconstruir_deve_refazer_posicoes_adulteradas(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.rep_rv.comprar('1', 10, 20.0)
+        self.rep_rv.comprar('1', 10, 30.0)
+        self.rep_rf.comprar('1', 2, 1500.0)
+        esperado: tuple = self.posicoes()
+
+        conn: sq.Connection = self.gerenciador.obter()
+        conn.execute("UPDATE RV SET quantidade=0, PU=0, PM=0, PT=0")
+        conn.execute("UPDATE RF SET quantidade=9, valor_aplicado=1")
+        reconstruir_posicoes(conn)
+        conn.commit()
+
+        self.assertEqual(self.posicoes(), esperado)
+        self.assertEqual(self.rep_rv.resumo_carteira()['Ações'], esperado[0][0][4])
+
+    def test_reconstruir_deve_partir_do_checkpoint(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.rep_rv.comprar('1', 10, 20.0)
+        conn: sq.Connection = self.gerenciador.obter()
+        criar_checkpoint(conn)
+        conn.execute("DELETE FROM movimentacoes")
+        conn.commit()
+        self.rep_rv.vender('1', 5, 20.0)
+        esperado: tuple = self.posicoes()
+
+        conn.execute("UPDATE RV SET quantidade=0")
+        reconstruir_posicoes(conn)
+        conn.commit()
+        self.assertEqual(self.posicoes(), esperado)
+
+    def test_venda_acima_da_posicao_deve_ser_recusada_sem_alterar_nada(self):
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.rep_rv.comprar('1', 10, 20.0)
+        esperado: tuple = self.posicoes()
+
+        with self.assertRaises(QuantidadeInsuficienteError):
+            self.rep_rv.vender('1', 11, 20.0)
+        self.assertEqual(self.posicoes(), esperado)
+        self.assertEqual(len(self.rep_rv.historico('1')), 1)
+        self.assertFalse(self.gerenciador.obter().in_transaction)
+
+    def test_resgate_acima_do_saldo_deve_ser_recusado(self):
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        self.rep_rf.comprar('1', 1, 100.0)
+        with self.assertRaises(SaldoInsuficienteError):
+            self.rep_rf.resgatar('1', 1, 100.01)
+        self.assertEqual(self.posicoes()[1], [(1, 1, 100.0)])
+
+    def test_movimentar_ativo_inexistente_deve_gerar_erro(self):
+        with self.assertRaises(AtivoNaoCadastradoError):
+            self.rep_rv.comprar('99', 1, 10.0)
+        with self.assertRaises(AtivoNaoCadastradoError):
+            self.rep_rf.resgatar('99', 1, 10.0)
+        self.assertEqual(self.rep_rv.historico('99'), [])
+
+    def test_atualizacao_em_sql_deve_coincidir_com_a_reconstrucao(self):
+        self.factory.criar_acoes_em_lote([(f'Empresa {i}', f'EMPR{i}') for i in range(1, 6)])
+        sorteio = random.Random(3)
+        for _ in range(300):
+            id: str = str(sorteio.randint(1, 5))
+            operacao: float = sorteio.random()
+            preco: float = round(sorteio.uniform(1, 100), 2)
+            if operacao < 0.5:
+                self.rep_rv.comprar(id, sorteio.randint(1, 50), preco)
+            elif operacao < 0.95:
+                try:
+                    self.rep_rv.vender(id, sorteio.randint(1, 50), preco)
+                except QuantidadeInsuficienteError:
+                    pass
+            else:
+                self.rep_rv.acertar_valor_quantidade(id, sorteio.randint(0, 50), preco)
+        esperado: tuple = self.posicoes()
+
+        conn: sq.Connection = self.gerenciador.obter()
+        conn.execute("UPDATE RV SET quantidade=0, PU=0, PM=0, PT=0")
+        reconstruir_posicoes(conn)
+        conn.commit()
+        self.assertEqual(self.posicoes(), esperado)
+
+    def test_banco_anterior_ao_livro_deve_preservar_as_posicoes(self):
+        self.gerenciador.obter()
+        self.gerenciador.fechar_todas()
+        conn: sq.Connection = sq.connect(self.caminho)
+        conn.execute("DROP TABLE movimentacoes")
+        conn.execute("DROP TABLE checkpoints_posicoes")
+        conn.execute("INSERT INTO RV (nome, codigo, categoria, quantidade, PU, PM, PT) "
+                     "VALUES ('Vale', 'VALE3', 'Ações', 7, 60.0, 55.0, 385.0)")
+        conn.commit()
+        conn.close()
+
+        gerenciador = GerenciadorConexao(self.caminho)
+        try:
+            conn = gerenciador.obter()
+            reconstruir_posicoes(conn)
+            self.assertEqual(conn.execute("SELECT quantidade, PU, PM, PT FROM RV").fetchall(),
+                             [(7, 60.0, 55.0, 385.0)])
+        finally:
+            gerenciador.fechar_todas()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+from itertools import islice
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.exceptions import AtivoNaoCadastradoError
+
+
+class TestRelatorioPaginado(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.factory.criar_acoes_em_lote([(f'Empresa {i}', f'EMPR{i}') for i in range(1, 501)])
+        self.factory.criar_rendas_fixas_em_lote([(f'CDB {i}', 'Imediato', '10/02/2030', '102% CDI')
+                                                 for i in range(1, 6)])
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_paginas_devem_cobrir_o_relatorio_completo_sem_repetir(self):
+        rep = self.factory.conectar_bd_rv()
+        linhas: list = []
+        pagina: list = rep.relatorio_pagina(0, 200)
+        while pagina:
+            linhas += pagina
+            pagina = rep.relatorio_pagina(pagina[-1][0], 200)
+        self.assertEqual(linhas, rep.relatorio_for_tkinter())
+
+    def test_pagina_deve_comecar_depois_do_id_informado(self):
+        rep = self.factory.conectar_bd_rf()
+        self.assertEqual([linha[0] for linha in rep.relatorio_pagina(2, 2)], [3, 4])
+        self.assertEqual(rep.relatorio_pagina(5), [])
+
+    def test_relatorio_por_ids_deve_trazer_so_as_linhas_pedidas(self):
+        rep = self.factory.conectar_bd_rv()
+        rep.comprar('7', 3, 10.0)
+        rep.deletar('8')
+        linhas: list = rep.relatorio_por_ids(['9', 7, 8])
+        self.assertEqual([linha[0] for linha in linhas], [7, 9])
+        self.assertEqual(linhas[0], rep.relatorio_pagina(6, 1)[0])
+        self.assertEqual(linhas[0][4], 3)
+
+    def test_relatorio_deve_ser_um_gerador_lido_em_blocos(self):
+        rep = self.factory.conectar_bd_rv()
+        consultas: list = []
+        rep._conn.set_trace_callback(consultas.append)
+        try:
+            primeiras: list = list(islice(rep.relatorio(tamanho_bloco=50), 120))
+        finally:
+            rep._conn.set_trace_callback(None)
+        self.assertEqual([linha[0] for linha in primeiras], list(range(1, 121)))
+        self.assertEqual(len([c for c in consultas if c.startswith('SELECT * FROM RV')]), 3)
+
+    def test_relatorio_deve_continuar_depois_do_id_em_qualquer_ordem(self):
+        rep = self.factory.conectar_bd_rv()
+        for id, pu in ((10, 5.0), (20, 5.0), (30, 1.0)):
+            rep.comprar(str(id), 2, pu)
+        completo: list = list(rep.relatorio(ordem='-PT', tamanho_bloco=7))
+        self.assertEqual([linha[0] for linha in completo[:3]], [20, 10, 30])
+        self.assertEqual(list(rep.relatorio(apos_id=10, ordem='-PT', tamanho_bloco=7)), completo[2:])
+        self.assertEqual(list(rep.relatorio(limite=3, ordem='nome')),
+                         sorted(completo, key=lambda linha: linha[1])[:3])
+
+    def test_relatorio_deve_continuar_se_a_ultima_linha_lida_for_apagada(self):
+        rep = self.factory.conectar_bd_rv()
+        completo: list = [linha[0] for linha in rep.relatorio(ordem='-nome')]
+        lidas: list = []
+        for linha in rep.relatorio(ordem='-nome', tamanho_bloco=50):
+            lidas.append(linha[0])
+            if len(lidas) == 50:
+                rep.deletar(str(linha[0]))
+        self.assertEqual(lidas, completo)
+
+        cursor: tuple = rep.cursor_relatorio(next(rep.relatorio(limite=1, ordem='nome')), 'nome')
+        rep.deletar(str(cursor[1]))
+        self.assertEqual(list(rep.relatorio(cursor, ordem='nome')), list(rep.relatorio(ordem='nome')))
+        with self.assertRaises(AtivoNaoCadastradoError):
+            list(rep.relatorio(cursor[1], ordem='nome'))
+
+    def test_pagina_deve_continuar_se_a_ultima_linha_da_anterior_for_apagada(self):
+        rep = self.factory.conectar_bd_rv()
+        pagina: list = rep.relatorio_pagina(0, 2)
+        self.assertEqual([linha[0] for linha in pagina], [1, 2])
+        rep.deletar('2')
+        self.assertEqual([linha[0] for linha in rep.relatorio_pagina(2, 2)], [3, 4])
+        self.assertEqual([linha[0] for linha in rep.relatorio_pagina(rep.cursor_relatorio(pagina[-1]), 2)], [3, 4])
+
+    def test_relatorio_deve_recusar_ordem_desconhecida(self):
+        with self.assertRaises(ValueError):
+            self.factory.conectar_bd_rf().relatorio(ordem='1; DROP TABLE RF')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,142 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from ativo_factory import AtivoFactory
+from calculos.rendimento import TaxaRentabilidade, fatores_de_correcao, interpretar_rentabilidade, taxa_diaria
+from data.conexao import GerenciadorConexao
+
+
+class TestRendimento(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rf = self.factory.conectar_bd_rf()
+        # janeiro de 2024: 23 dias úteis, CDI de 0,05% ao dia
+        self.dias: np.ndarray = np.arange('2024-01-01', '2024-02-01', dtype='datetime64[D]')
+        self.dias = self.dias[np.is_busday(self.dias)]
+        self.rep_rf.atualizar_indice('CDI', ((str(dia), 0.0005) for dia in self.dias))
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_interpretacao_deve_aceitar_os_formatos_do_cadastro(self):
+        casos: dict = {
+            '110% CDI': TaxaRentabilidade('CDI', 1.1, 0.0),
+            '100% do CDI': TaxaRentabilidade('CDI', 1.0, 0.0),
+            'CDI + 2%': TaxaRentabilidade('CDI', 1.0, 0.02),
+            'IPCA + 5,5%': TaxaRentabilidade('IPCA', 1.0, 0.055),
+            'ipca+6% a.a.': TaxaRentabilidade('IPCA', 1.0, 0.06),
+            '12,5% a.a.': TaxaRentabilidade('PRE', 0.0, 0.125),
+            'SELIC': TaxaRentabilidade('SELIC', 1.0, 0.0),
+        }
+        for texto, esperado in casos.items():
+            taxa: TaxaRentabilidade = interpretar_rentabilidade(texto)
+            self.assertEqual(taxa.indexador, esperado.indexador, texto)
+            self.assertAlmostEqual(taxa.multiplicador, esperado.multiplicador, msg=texto)
+            self.assertAlmostEqual(taxa.spread, esperado.spread, msg=texto)
+        with self.assertRaises(ValueError):
+            interpretar_rentabilidade('Poupança')
+
+    def test_fatores_devem_compor_as_taxas_diarias(self):
+        series: dict = {'CDI': (self.dias, np.full(len(self.dias), 0.0005))}
+        fatores = fatores_de_correcao(np.array(['2024-01-01', '2024-01-01', '2024-01-15', '2024-01-01'],
+                                               dtype='datetime64[D]'),
+                                      np.datetime64('2024-02-01'),
+                                      ['CDI', 'CDI', 'CDI', 'PRE'],
+                                      [1.0, 1.1, 1.0, 0.0],
+                                      [0.0, 0.0, 0.0, 0.12],
+                                      series)
+        np.testing.assert_allclose(fatores, [1.0005 ** 23, 1.00055 ** 23, 1.0005 ** 13, 1.12 ** (23 / 252)])
+        self.assertAlmostEqual(taxa_diaria(0.12) + 1, 1.12 ** (1 / 252))
+
+    def test_valor_atual_deve_render_cada_aplicacao_desde_a_sua_data(self):
+        self.factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '100% CDI')
+        self.factory.criar_renda_fixa('CDB B', 'Imediato', '10/02/2030', '12% a.a.')
+        self.factory.criar_renda_fixa('CDB C', 'Imediato', '10/02/2030', 'Sem taxa')
+        self.rep_rf.comprar('1', 1, 1000.0, '2024-01-01 10:00:00')
+        self.rep_rf.comprar('1', 1, 500.0, '2024-01-15 10:00:00')
+        self.rep_rf.resgatar('1', 1, 200.0, '2024-01-22 10:00:00')
+        self.rep_rf.comprar('2', 1, 1000.0, '2024-01-01 10:00:00')
+        self.rep_rf.comprar('3', 1, 300.0, '2024-01-01 10:00:00')
+        self.rep_rf.comprar('3', 1, 300.0, '2024-03-01 10:00:00')
+
+        valores: dict = self.rep_rf.valor_atual('2024-02-01')
+        self.assertAlmostEqual(valores[1], 1000 * 1.0005 ** 23 + 500 * 1.0005 ** 13 - 200 * 1.0005 ** 8)
+        self.assertAlmostEqual(valores[2], 1000 * 1.12 ** (23 / 252))
+        self.assertAlmostEqual(valores[3], 300.0)
+
+    def test_ajuste_deve_substituir_as_aplicacoes_anteriores(self):
+        self.factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '100% CDI')
+        self.rep_rf.comprar('1', 1, 1000.0, '2024-01-01 10:00:00')
+        self.rep_rf.acertar_valor_aplicado('1', 800.0, 1)
+        self.assertAlmostEqual(self.rep_rf.valor_atual()[1], 800.0)
+
+    def test_marcacao_de_dez_mil_titulos_deve_ser_vetorizada(self):
+        gerador = np.random.default_rng(3)
+        total: int = 10000
+        dias: np.ndarray = np.arange('2015-01-01', '2025-01-01', dtype='datetime64[D]')
+        dias = dias[np.is_busday(dias)]
+        series: dict = {'CDI': (dias, gerador.uniform(0.0002, 0.0006, len(dias))),
+                        'IPCA': (dias, gerador.uniform(0.0, 0.0004, len(dias)))}
+        inicio: np.ndarray = dias[gerador.integers(0, len(dias), total)]
+        indexadores: np.ndarray = gerador.choice(['CDI', 'IPCA', 'PRE'], total)
+        multiplicadores: np.ndarray = gerador.choice([0.9, 1.0, 1.05, 1.1, 1.2], total)
+        spreads: np.ndarray = gerador.uniform(0, 0.08, total)
+
+        comeco: float = time.perf_counter()
+        fatores = fatores_de_correcao(inicio, np.datetime64('2025-01-01'), indexadores, multiplicadores,
+                                      spreads, series)
+        duracao: float = time.perf_counter() - comeco
+
+        self.assertEqual(len(fatores), total)
+        self.assertTrue(np.all(fatores >= 1.0))
+        self.assertLess(duracao, 1.0)
+
+    def test_valor_atual_de_dez_mil_titulos_deve_ler_o_livro_de_uma_vez(self):
+        total: int = 10000
+        self.factory.criar_rendas_fixas_em_lote([(f'CDB {i}', 'Imediato', '10/02/2030', '110% CDI')
+                                                 for i in range(total)])
+        negociacoes: tuple = (('02', 'compra'), ('10', 'compra'), ('15', 'ajuste'), ('22', 'compra'))
+        self.rep_rf.movimentar_em_lote((id, tipo, 1, 100.0, f'2024-01-{dia} 10:00:00')
+                                       for id in range(1, total + 1) for dia, tipo in negociacoes)
+        self.rep_rf.valor_atual('2024-02-01')
+
+        comeco: float = time.perf_counter()
+        valores: dict = self.rep_rf.valor_atual('2024-02-01')
+        duracao: float = time.perf_counter() - comeco
+
+        self.assertEqual(len(valores), total)
+        self.assertAlmostEqual(valores[total], 100 * 1.00055 ** 13 + 100 * 1.00055 ** 8)
+        self.assertLess(duracao, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
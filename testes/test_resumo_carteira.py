@@ -0,0 +1,69 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+
+
+class TestResumoCarteira(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.factory.criar_fii('Maxima Renda', 'MXRF11')
+        self.factory.criar_renda_fixa('CDB', 'Imediato', '10/02/2023', '102% CDI')
+        self.factory.criar_reserva_emergencia('CDB ML', 'Imediato', '10/02/2023', '100% CDI')
+        self.rep_rv.acertar_valor_quantidade(1, 10, 20.0)
+        self.rep_rv.acertar_valor_quantidade(2, 5, 10.0)
+        self.rep_rf.acertar_valor_aplicado(1, 1000.0, 1)
+        self.rep_rf.acertar_valor_aplicado(2, 500.0, 1)
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def test_resumo_rv_deve_trazer_o_total_de_cada_categoria(self):
+        self.assertEqual(self.rep_rv.resumo_carteira(), {'Ações': 200.0, 'FIIs': 50.0, 'Total': 250.0})
+
+    def test_resumo_rf_deve_trazer_categorias_sem_ativos_zeradas(self):
+        resumo: dict = self.rep_rf.resumo_carteira()
+        self.assertEqual(resumo['Tesouro Direto'], 0.0)
+        self.assertEqual(resumo['Total'], 1500.0)
+
+    def test_relatorios_devem_usar_o_resumo(self):
+        self.assertEqual(self.rep_rv.relatorio_acoes(), 200.0)
+        self.assertEqual(self.rep_rf.relatorio_res_emerg(), 500.0)
+
+    def test_resumo_deve_ser_recalculado_apos_gravacao(self):
+        self.rep_rv.resumo_carteira()
+        self.rep_rv.acertar_valor_quantidade(1, 1, 20.0)
+        self.assertEqual(self.rep_rv.resumo_carteira()['Ações'], 20.0)
+
+    def test_resumo_deve_enxergar_gravacao_de_outra_conexao(self):
+        self.rep_rf.resumo_carteira()
+        outro: GerenciadorConexao = GerenciadorConexao(self.gerenciador.caminho)
+        AtivoFactory(outro).conectar_bd_rf().acertar_valor_aplicado(1, 10.0, 1)
+        outro.fechar_todas()
+        self.assertEqual(self.rep_rf.resumo_carteira()['Renda Fixa'], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import io
+import sqlite3 as sq
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from calculos.rendimento import interpretar_rentabilidade
+from data.conexao import GerenciadorConexao
+from data.data import RepositorioRendaFixa, RepositorioRendaVariavel
+from data.exceptions import QuantidadeInsuficienteError, SaldoInsuficienteError
+from data.movimentacoes import apurar_custo_medio
+from data.sintetico import GeradorCarteira, gerar_carteira, main
+from testes.banco_temporario import TestBancoTemporario
+
+
+class TestSintetico(TestBancoTemporario):
+    def conteudo(self, gerenciador: GerenciadorConexao) -> tuple:
+        conn: sq.Connection = gerenciador.obter()
+        return (conn.execute("SELECT * FROM RV ORDER BY id").fetchall(),
+                conn.execute("SELECT * FROM RF ORDER BY id").fetchall(),
+                conn.execute("SELECT * FROM movimentacoes ORDER BY id").fetchall())
+
+    def test_mesma_semente_deve_gerar_o_mesmo_banco(self):
+        bancos: list = []
+        for nome, semente in (('a.db', 3), ('b.db', 3), ('c.db', 4)):
+            gerenciador = self.gerenciador(nome)
+            gerar_carteira(gerenciador, 200, semente, negociacoes_por_ativo=3, tamanho_lote=70)
+            bancos.append(self.conteudo(gerenciador))
+        self.assertEqual(bancos[0], bancos[1])
+        self.assertNotEqual(bancos[0], bancos[2])
+
+    def test_codigos_e_nomes_nao_devem_se_repetir_entre_chamadas(self):
+        gerador = GeradorCarteira(semente=1)
+        ativos: list = gerador.acoes(3000) + gerador.fiis(500) + gerador.acoes(3000)
+        codigos: list = [ativo.codigo for ativo in ativos]
+        self.assertEqual(len(set(codigos)), len(codigos))
+        self.assertTrue(all(codigo[:4].isalpha() and codigo[4:].isdigit() for codigo in codigos))
+
+        renda_fixa: list = gerador.rendas_fixas(300) + gerador.tesouros_diretos(300) + gerador.reservas_emergencia(50)
+        self.assertEqual(len({ativo.nome for ativo in renda_fixa}), len(renda_fixa))
+        for ativo in renda_fixa:
+            interpretar_rentabilidade(ativo.rentabilidade)
+
+    def test_carteira_deve_ter_posicoes_coerentes_com_o_livro(self):
+        gerenciador = self.gerenciador('carteira.db', centavos=True)
+        carteira = gerar_carteira(gerenciador, 300, negociacoes_por_ativo=5, tamanho_lote=100)
+        self.assertEqual(len(carteira.ids_rv) + len(carteira.ids_rf), 300)
+        self.assertEqual(carteira.movimentacoes, 300 * 6)
+
+        conn: sq.Connection = gerenciador.obter()
+        tipos: dict = dict(conn.execute("SELECT tipo, COUNT(*) FROM movimentacoes GROUP BY tipo"))
+        self.assertGreater(tipos['venda'], 0)
+        self.assertGreater(tipos['resgate'], 0)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM RV WHERE quantidade < 0").fetchone()[0], 0)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM RF WHERE valor_aplicado <= 0").fetchone()[0], 0)
+
+        posicoes: dict = {id: quantidade for id, quantidade in conn.execute("SELECT id, quantidade FROM RV")}
+        self.assertEqual({id: apurado[0] for id, apurado in apurar_custo_medio(conn).items()}, posicoes)
+
+    def test_movimentacao_em_lote_deve_desfazer_tudo_se_uma_falhar(self):
+        gerenciador = self.gerenciador('lote.db')
+        ids_rv, ids_rf, _ = gerar_carteira(gerenciador, 20)
+        antes: tuple = self.conteudo(gerenciador)
+
+        rep_rv = RepositorioRendaVariavel(gerenciador)
+        with self.assertRaises(QuantidadeInsuficienteError):
+            rep_rv.movimentar_em_lote([(ids_rv[0], 'compra', 10, 20.0, None),
+                                       (ids_rv[1], 'venda', 10 ** 6, 20.0, None)])
+        rep_rf = RepositorioRendaFixa(gerenciador)
+        with self.assertRaises(SaldoInsuficienteError):
+            rep_rf.movimentar_em_lote([(ids_rf[0], 'compra', 1, 100.0, None),
+                                       (ids_rf[1], 'resgate', 1, 10.0 ** 9, None)])
+        self.assertEqual(self.conteudo(gerenciador), antes)
+
+        self.assertEqual(rep_rv.movimentar_em_lote([(ids_rv[0], 'compra', 10, 20.0, None),
+                                                    (ids_rv[0], 'venda', 5, 30.0, None)]), 2)
+        self.assertEqual(len(self.conteudo(gerenciador)[2]), len(antes[2]) + 2)
+
+    def test_linha_de_comando_deve_recusar_banco_com_ativos(self):
+        caminho: str = os.path.join(self.pasta.name, 'cli.db')
+        saida = io.StringIO()
+        with redirect_stdout(saida), redirect_stderr(saida):
+            with self.assertRaises(SystemExit):
+                main(['--tamanho', '5'])
+            self.assertEqual(main(['--banco', caminho, '--tamanho', '5', '--negociacoes', '1']), 0)
+            self.assertEqual(main(['--banco', caminho, '--tamanho', '5']), 1)
+            gerenciador = self.gerenciador('cli.db')
+            self.assertEqual(len(self.conteudo(gerenciador)[0]) + len(self.conteudo(gerenciador)[1]), 5)
+            self.assertEqual(main(['--banco', caminho, '--tamanho', '5', '--semente', '1', '--acrescentar']), 0)
+        self.assertEqual(len(self.conteudo(gerenciador)[0]) + len(self.conteudo(gerenciador)[1]), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
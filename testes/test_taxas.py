@@ -0,0 +1,133 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../modulos'
+            )
+        )
+    )
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import unittest
+
+import numpy as np
+
+from ativo_factory import AtivoFactory
+from ativos.renda_fixa import RendaFixa
+from calculos import rendimento
+from calculos.rendimento import TaxaRentabilidade, fatores_de_correcao, interpretar_rentabilidade
+from data.esquema import aplicar_esquema
+from testes.banco_temporario import TestBancoTemporario
+
+
+class TestTaxas(TestBancoTemporario):
+    def abrir(self, centavos: bool = False) -> AtivoFactory:
+        return AtivoFactory(self.gerenciador(centavos=centavos))
+
+    def taxas(self, factory: AtivoFactory) -> list:
+        conn: sq.Connection = factory.conectar_bd_rf()._conn
+        return conn.execute("SELECT id, indexador, multiplicador, spread, base FROM RF ORDER BY id").fetchall()
+
+    def test_interpretacao_deve_ler_a_base_e_memorizar_o_resultado(self):
+        self.assertEqual(interpretar_rentabilidade('12% a.a. base 360'), TaxaRentabilidade('PRE', 0.0, 0.12, 360))
+        self.assertEqual(interpretar_rentabilidade('CDI + 1% (365)').base, 365)
+        self.assertEqual(interpretar_rentabilidade('110% CDI').base, 252)
+
+        antes = rendimento._interpretar.cache_info()
+        for _ in range(3):
+            interpretar_rentabilidade('IPCA + 6,1%')
+            with self.assertRaises(ValueError):
+                interpretar_rentabilidade('Poupança')
+        depois = rendimento._interpretar.cache_info()
+        self.assertLessEqual(depois.misses - antes.misses, 2)
+        self.assertGreaterEqual(depois.hits - antes.hits, 4)
+
+    def test_base_em_dias_corridos_deve_contar_todos_os_dias(self):
+        fatores = fatores_de_correcao(np.array(['2024-01-01', '2024-01-01'], dtype='datetime64[D]'),
+                                      np.datetime64('2024-12-31'),
+                                      ['PRE', 'PRE'], [0.0, 0.0], [0.12, 0.12], {}, [360, 365])
+        np.testing.assert_allclose(fatores, [1.12 ** (365 / 360), 1.12])
+
+    def test_cadastro_e_alteracao_devem_gravar_a_taxa_estruturada(self):
+        factory: AtivoFactory = self.abrir()
+        factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', '110% CDI')
+        factory.criar_renda_fixa('CDB B', 'Imediato', '10/02/2030', 'Poupança')
+        factory.conectar_bd_rf().cadastrar_ativos_em_lote([RendaFixa('CDB C', 'Imediato', '10/02/2030', '12% a.a.')])
+        self.assertEqual(self.taxas(factory), [(1, 'CDI', 1.1, 0.0, 252),
+                                               (2, None, None, None, None),
+                                               (3, 'PRE', 0.0, 0.12, 252)])
+
+        factory.conectar_bd_rf().alterar_dados_ativo('1', 'CDB A', 'Renda Fixa', 'Imediato', '10/02/2030',
+                                                     'IPCA + 5,5%')
+        self.assertEqual(self.taxas(factory)[0], (1, 'IPCA', 1.0, 0.055, 252))
+
+    def test_relatorio_deve_ordenar_pela_taxa(self):
+        factory: AtivoFactory = self.abrir()
+        for nome, taxa in (('A', '100% CDI'), ('B', '120% CDI'), ('C', '90% CDI'), ('D', '110% CDI')):
+            factory.criar_renda_fixa(f'CDB {nome}', 'Imediato', '10/02/2030', taxa)
+        rep_rf = factory.conectar_bd_rf()
+        self.assertEqual([linha[1] for linha in rep_rf.relatorio(ordem='-multiplicador', tamanho_bloco=2)],
+                         ['CDB B', 'CDB D', 'CDB A', 'CDB C'])
+
+    def test_relatorio_deve_paginar_por_taxas_nulas(self):
+        factory: AtivoFactory = self.abrir()
+        for nome, taxa in (('A', '120% CDI'), ('B', 'Poupança'), ('C', '100% CDI'),
+                           ('D', 'Poupança'), ('E', '110% CDI'), ('F', 'Poupança')):
+            factory.criar_renda_fixa(f'CDB {nome}', 'Imediato', '10/02/2030', taxa)
+        rep_rf = factory.conectar_bd_rf()
+        self.assertEqual([linha[0] for linha in rep_rf.relatorio(ordem='multiplicador', tamanho_bloco=2)],
+                         [2, 4, 6, 3, 5, 1])
+        self.assertEqual([linha[0] for linha in rep_rf.relatorio(ordem='-multiplicador', tamanho_bloco=2)],
+                         [1, 5, 3, 6, 4, 2])
+        for ordem in ('spread', '-spread'):
+            self.assertEqual(list(rep_rf.relatorio(ordem=ordem, tamanho_bloco=1)),
+                             list(rep_rf.relatorio(ordem=ordem)), ordem)
+
+    def test_banco_antigo_deve_ganhar_as_colunas_preenchidas(self):
+        conn = sq.connect(self.caminho)
+        conn.execute('CREATE TABLE "RV" ("id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, '
+                     '"nome" TEXT NOT NULL UNIQUE, "codigo" TEXT NOT NULL UNIQUE, "categoria" TEXT NOT NULL, '
+                     '"quantidade" INTEGER NOT NULL, "PU" REAL NOT NULL, "PM" REAL NOT NULL, "PT" REAL NOT NULL)')
+        conn.execute('CREATE TABLE "RF" ("id" INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, '
+                     '"nome" TEXT NOT NULL UNIQUE, "quantidade" INTEGER NOT NULL, "categoria" TEXT NOT NULL, '
+                     '"resgate" TEXT NOT NULL, "valor_aplicado" REAL NOT NULL, "vencimento" TEXT NOT NULL, '
+                     '"rentabilidade" TEXT NOT NULL)')
+        conn.execute("INSERT INTO RF VALUES (NULL, 'CDB A', 1, 'Renda Fixa', 'Imediato', 1000.5, '10/02/2030', "
+                     "'CDI + 2%')")
+        conn.commit()
+        conn.close()
+
+        factory: AtivoFactory = self.abrir(centavos=True)
+        self.assertEqual(self.taxas(factory), [(1, 'CDI', 1.0, 0.02, 252)])
+        self.assertEqual(factory.conectar_bd_rf().acao_sql_get_saldo('1'), 1000.5)
+
+    def test_abrir_de_novo_nao_deve_reler_as_rentabilidades(self):
+        factory: AtivoFactory = self.abrir()
+        factory.criar_renda_fixa('CDB A', 'Imediato', '10/02/2030', 'Poupança')
+        conn = sq.connect(self.caminho)
+        consultas: list = []
+        conn.set_trace_callback(consultas.append)
+        try:
+            aplicar_esquema(conn)
+        finally:
+            conn.close()
+        self.assertEqual([consulta for consulta in consultas if 'rentabilidade FROM RF' in consulta], [])
+        self.assertEqual(self.taxas(factory), [(1, None, None, None, None)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
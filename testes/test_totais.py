@@ -0,0 +1,80 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.esquema import TABELA_RV, TABELA_RF
+from data.totais import reconstruir_totais, verificar_totais
+
+
+class TestTotaisCategoria(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.gerenciador = GerenciadorConexao(os.path.join(self.pasta.name, 'teste.db'))
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.conn = self.gerenciador.obter()
+
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+        self.factory.criar_acao('Gerdau', 'GGBR4')
+        self.rep_rv.acertar_valor_quantidade(1, 10, 20.0)
+        self.rep_rv.acertar_valor_quantidade(2, 10, 5.0)
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def total(self, categoria: str) -> float:
+        acao: str = "SELECT total FROM totais_categoria WHERE tabela='RV' AND categoria=?"
+        return self.conn.execute(acao, (categoria,)).fetchone()[0]
+
+    def test_gatilhos_devem_somar_atualizacoes(self):
+        self.assertEqual(self.total('Ações'), 250.0)
+
+    def test_gatilhos_devem_mover_o_total_quando_a_categoria_mudar(self):
+        self.rep_rv.alterar_dados(2, 'Gerdau', 'GGBR4', 'FIIs')
+        self.assertEqual(self.total('Ações'), 200.0)
+        self.assertEqual(self.total('FIIs'), 50.0)
+
+    def test_gatilhos_devem_subtrair_ativos_deletados(self):
+        self.rep_rv.deletar(1)
+        self.assertEqual(self.total('Ações'), 50.0)
+
+    def test_verificar_deve_apontar_divergencia_e_reconstruir_deve_corrigir(self):
+        self.conn.execute("UPDATE totais_categoria SET total = 1 WHERE tabela='RV'")
+        self.assertEqual(verificar_totais(self.conn), [('RV', 'Ações', 1.0, 250.0)])
+        reconstruir_totais(self.conn)
+        self.assertEqual(verificar_totais(self.conn), [])
+
+    def test_banco_antigo_deve_ganhar_totais_ao_conectar(self):
+        caminho: str = os.path.join(self.pasta.name, 'antigo.db')
+        conn: sq.Connection = sq.connect(caminho)
+        conn.execute(TABELA_RV)
+        conn.execute(TABELA_RF)
+        conn.execute("INSERT INTO RF (nome, quantidade, categoria, resgate, valor_aplicado, vencimento, rentabilidade) "
+                     "VALUES ('CDB', 1, 'Renda Fixa', 'Imediato', 100.0, '10/02/2023', '102% CDI')")
+        conn.commit()
+        conn.close()
+
+        gerenciador: GerenciadorConexao = GerenciadorConexao(caminho)
+        self.assertEqual(AtivoFactory(gerenciador).conectar_bd_rf().relatorio_renda_fixa(), 100.0)
+        gerenciador.fechar_todas()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
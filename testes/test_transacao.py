@@ -0,0 +1,97 @@
+try:
+    import sys
+    import os
+
+    sys.path.append(
+        os.path.abspath(
+            os.path.join(
+                os.path.dirname(__file__),
+                '../'
+            )
+        )
+    )
+except Exception as error:
+    print(f'{error}')
+
+import sqlite3 as sq
+import tempfile
+import unittest
+from ativo_factory import AtivoFactory
+from data.conexao import GerenciadorConexao
+from data.exceptions import QuantidadeInsuficienteError
+
+
+class TestTransacao(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, 'teste.db')
+        self.gerenciador = GerenciadorConexao(self.caminho)
+        self.factory = AtivoFactory(self.gerenciador)
+        self.rep_rv = self.factory.conectar_bd_rv()
+        self.rep_rf = self.factory.conectar_bd_rf()
+        self.factory.criar_acao('Banco do Brasil', 'BBAS3')
+
+    def tearDown(self):
+        self.gerenciador.fechar_todas()
+        self.pasta.cleanup()
+
+    def quantidade_vista_de_fora(self) -> int:
+        conn: sq.Connection = sq.connect(self.caminho)
+        try:
+            return conn.execute("SELECT quantidade FROM RV WHERE id=1").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_transacao_deve_confirmar_tudo_so_no_fim(self):
+        with self.rep_rv.transacao():
+            for _ in range(100):
+                self.rep_rv.comprar('1', 1, 10.0)
+            self.factory.criar_acao('Vale', 'VALE3')
+            self.assertEqual(self.quantidade_vista_de_fora(), 0)
+        self.assertEqual(self.quantidade_vista_de_fora(), 100)
+        self.assertEqual(len(self.rep_rv.historico('1')), 100)
+        self.assertFalse(self.gerenciador.obter().in_transaction)
+
+    def test_erro_na_transacao_deve_desfazer_todas_as_operacoes(self):
+        with self.assertRaises(RuntimeError):
+            with self.rep_rv.transacao():
+                self.rep_rv.comprar('1', 10, 10.0)
+                self.factory.criar_acao('Vale', 'VALE3')
+                raise RuntimeError
+        self.assertEqual(self.quantidade_vista_de_fora(), 0)
+        self.assertEqual(self.rep_rv.historico('1'), [])
+        self.assertEqual(len(self.rep_rv.relatorio_for_tkinter()), 1)
+
+    def test_operacao_recusada_nao_deve_desfazer_as_anteriores(self):
+        with self.rep_rv.transacao():
+            self.rep_rv.comprar('1', 10, 10.0)
+            with self.assertRaises(QuantidadeInsuficienteError):
+                self.rep_rv.vender('1', 11, 10.0)
+            self.rep_rv.vender('1', 4, 10.0)
+        self.assertEqual(self.quantidade_vista_de_fora(), 6)
+        self.assertEqual([linha[1] for linha in self.rep_rv.historico('1')], ['compra', 'venda'])
+
+    def test_transacao_aninhada_deve_desfazer_so_o_proprio_bloco(self):
+        with self.rep_rv.transacao():
+            self.rep_rv.comprar('1', 10, 10.0)
+            with self.assertRaises(RuntimeError):
+                with self.rep_rv.transacao():
+                    self.rep_rv.comprar('1', 5, 10.0)
+                    raise RuntimeError
+            with self.rep_rv.transacao():
+                self.rep_rv.comprar('1', 1, 10.0)
+        self.assertEqual(self.quantidade_vista_de_fora(), 11)
+
+    def test_repositorios_devem_compartilhar_a_transacao(self):
+        self.factory.criar_renda_fixa('CDB BTG', 'Imediato', '10/02/2030', '102% CDI')
+        with self.assertRaises(RuntimeError):
+            with self.rep_rv.transacao():
+                self.rep_rv.comprar('1', 10, 10.0)
+                self.rep_rf.comprar('1', 1, 1000.0)
+                raise RuntimeError
+        self.assertEqual(self.rep_rf.historico('1'), [])
+        self.assertEqual(self.rep_rv.historico('1'), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)